@@ -1,41 +1,81 @@
 from flask import Flask
+from sqlalchemy import event
 from flask_sqlalchemy import SQLAlchemy
 from flask_jwt_extended import JWTManager
 from flask_cors import CORS
 from flask_migrate import Migrate
 from app.config import config
+from app.cache import response_cache, register_cache_metrics
+from app.serializers import FastJSONProvider
+from app.metrics import metrics
+from app.identity import identity_cache
+from app.passwords import password_hasher
+from app.events import change_feed
+from app.compression import compression
+
+from app.db_routing import RoutingSession
 
 # Initialize extensions
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 jwt = JWTManager()
 migrate = Migrate()
 
+def enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+    """Engine connect hook: SQLite enforces foreign keys, and so ON DELETE CASCADE, only when asked"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA foreign_keys=ON')
+    cursor.close()
+
 def create_app(config_name='development'):
     """Flask application factory"""
     app = Flask(__name__)
     app.config.from_object(config[config_name])
+    app.json = FastJSONProvider(app)
 
     # Initialize extensions with app
     db.init_app(app)
+    with app.app_context():
+        for engine in db.engines.values():
+            if engine.dialect.name == 'sqlite':
+                event.listen(engine, 'connect', enable_sqlite_foreign_keys)
     jwt.init_app(app)
     migrate.init_app(app, db)
+    response_cache.init_app(app)
+    metrics.init_app(app)
+    register_cache_metrics(metrics)
+    identity_cache.init_app(app, jwt, metrics)
+    password_hasher.init_app(app, metrics)
+    change_feed.init_app(app, metrics)
+    # Registered after metrics so request timings include compression
+    compression.init_app(app, metrics)
 
     # Configure CORS
     CORS(app, resources={
         r"/api/*": {
             "origins": app.config['CORS_ORIGINS'],
-            "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-            "allow_headers": ["Content-Type", "Authorization"]
+            "methods": ["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
+            "allow_headers": ["Content-Type", "Authorization"],
+            "expose_headers": ["X-Next-Cursor", "ETag"]
         }
     })
 
     # Import models (needed for migrations)
-    from app.models import User, Category, Feature
+    from app.models import User, Category, Feature, WorkspaceVersion, IdCounter, Tombstone
 
     # Register blueprints
-    from app.routes import auth_bp, categories_bp, features_bp
+    from app.routes import auth_bp, categories_bp, features_bp, roadmap_bp, export_bp, imports_bp, system_bp, events_bp, sync_bp
     app.register_blueprint(auth_bp, url_prefix='/api/auth')
     app.register_blueprint(categories_bp, url_prefix='/api')
     app.register_blueprint(features_bp, url_prefix='/api')
+    app.register_blueprint(roadmap_bp, url_prefix='/api')
+    app.register_blueprint(export_bp, url_prefix='/api')
+    app.register_blueprint(imports_bp, url_prefix='/api')
+    app.register_blueprint(system_bp, url_prefix='/api')
+    app.register_blueprint(events_bp, url_prefix='/api')
+    app.register_blueprint(sync_bp, url_prefix='/api')
+
+    # Register CLI commands
+    from app.cli import register_commands
+    register_commands(app)
 
     return app
@@ -0,0 +1,313 @@
+"""ASGI application serving the read API on SQLAlchemy's asyncio engine
+
+The GET endpoints of the categories and features blueprints are handled
+by async views that return the same JSON, headers, ETags and errors as
+the Flask views, so a slow query or a large serialization no longer ties
+up a worker thread; the /api/events change feed is served here too, where
+an idle stream costs no thread. Every other request (writes, auth, export, metrics,
+CORS preflight) is passed through to the Flask app in a thread pool.
+
+Serialization, compression and response cache IO of the read endpoints run
+in the thread pool, so a large payload does not stall the event loop and
+every other request and event stream on it.
+
+Serve with ``uvicorn asgi:application`` from backend/.
+"""
+import asyncio
+import contextlib
+import time
+from functools import wraps
+
+from a2wsgi import WSGIMiddleware
+from flask_jwt_extended import decode_token
+from flask_jwt_extended.exceptions import JWTExtendedException
+from jwt import ExpiredSignatureError, InvalidTokenError
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.background import BackgroundTask
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import Mount, Route
+from werkzeug.http import parse_etags
+
+from app import create_app
+from app.async_db import async_db
+from app.cache import response_cache
+from app.compression import compression, weaken_etag
+from app.events import change_feed, opening_frames, verify_stream_ticket, HEARTBEAT_FRAME
+from app.identity import identity_cache
+from app.metrics import metrics
+from app.models import FEATURE_SERIALIZER, CATEGORY_SERIALIZER
+from app.routes.categories import tree_resource
+from app.routes.events import EVENT_STREAM_HEADERS
+from app.routes.features import parse_facet_filters, parse_search_args
+from app.services import AsyncReadService
+from app.utils import DEFAULT_PAGE_SIZE, parse_page_args, parse_fields
+
+
+def json_response(request, payload, status=200, headers=None):
+    """Serialize on the event loop; only for small bodies such as errors"""
+    body = request.app.state.flask_app.json.dumps(payload).encode()
+    return Response(body, status, headers, media_type='application/json')
+
+
+async def render_json(request, payload, status=200, headers=None):
+    """``json_response`` for payloads of any size, serialized in the thread pool"""
+    dumps = request.app.state.flask_app.json.dumps
+    body = await run_in_threadpool(lambda: dumps(payload).encode())
+    return Response(body, status, headers, media_type='application/json')
+
+
+async def authenticate(request, session):
+    """Verify the bearer token like ``@jwt_required()``; returns an error response or None"""
+    flask_app = request.app.state.flask_app
+    authorization = request.headers.get('Authorization', '')
+    if not authorization.startswith('Bearer '):
+        return json_response(request, {'msg': 'Missing Authorization Header'}, 401)
+    encoded = authorization[len('Bearer '):]
+
+    try:
+        with flask_app.app_context():
+            token = decode_token(encoded)
+    except ExpiredSignatureError:
+        return json_response(request, {'msg': 'Token has expired'}, 401)
+    except (InvalidTokenError, JWTExtendedException) as e:
+        return json_response(request, {'msg': str(e)}, 422)
+    if token.get('type') != 'access':
+        return json_response(request, {'msg': 'Only non-refresh tokens are allowed'}, 422)
+
+    return await _load_user(request, session, token[flask_app.config.get('JWT_IDENTITY_CLAIM', 'sub')])
+
+
+async def _load_user(request, session, user_id):
+    """Resolve the user through the identity cache; returns an error response or None"""
+    if identity_cache.cache.get(user_id) is None:
+        user = await AsyncReadService.get_user_by_id(session, user_id)
+        if user is None:
+            return json_response(request, {'error': 'User not found'}, 401)
+        identity_cache.cache.set(user_id, user.to_dict())
+    return None
+
+
+def read_view(endpoint):
+    """Wrap an async view with auth, ETag handling, metrics and error mapping
+
+    The view receives ``(request, session)`` and returns ``(payload, status, headers)``
+    or a Response. Like ``conditional_get``, the workspace version is read
+    before the view runs and answers If-None-Match with 304.
+    """
+    def decorator(view):
+        @wraps(view)
+        async def wrapper(request):
+            start = time.perf_counter()
+            try:
+                async with async_db.session() as session:
+                    response = await authenticate(request, session)
+                    if response is None:
+                        response = await _conditional(request, session, view)
+            except Exception as e:
+                # Same JSON shape as the Flask routes, e.g. when the user lookup fails
+                response = json_response(request, {'error': str(e)}, 500)
+            metrics.request_duration.observe(time.perf_counter() - start, endpoint, 'GET', str(response.status_code))
+            return response
+        return wrapper
+    return decorator
+
+
+async def _conditional(request, session, view):
+    version = await AsyncReadService.get_version(session)
+    # Cached bodies are keyed on the same version the ETag carries
+    request.state.workspace_version = version
+    etag = str(version)
+    # Weak comparison: compressed responses carry W/ ETags
+    if parse_etags(request.headers.get('If-None-Match')).contains_weak(etag):
+        response = Response(status_code=304)
+    else:
+        try:
+            async with async_db.read_session(session, version, request.headers.get('X-Consistency')) as reads:
+                result = await view(request, reads)
+        except ValueError as e:
+            return json_response(request, {'error': str(e)}, 400)
+        except Exception as e:
+            return json_response(request, {'error': str(e)}, 500)
+        response = result if isinstance(result, Response) else await render_json(request, *result)
+        if response.status_code != 200:
+            return response
+        response = await _compress(request, response)
+
+    response.headers['ETag'] = f'"{etag}"'
+    response.headers['Cache-Control'] = 'private, no-cache'
+    if 'Content-Encoding' in response.headers:
+        weaken_etag(response.headers)
+    return response
+
+
+async def _compress(request, response):
+    """Counterpart of the Flask app's after_request compression"""
+    response.headers['Vary'] = 'Accept-Encoding'
+    if 'Content-Encoding' in response.headers:
+        return response
+    body, encoding = await run_in_threadpool(compression.compress, response.body,
+                                             compression.negotiate(request.headers.get('Accept-Encoding')))
+    if encoding is None:
+        return response
+    headers = {k: v for k, v in response.headers.items() if k != 'content-length'}
+    return Response(body, response.status_code, {**headers, 'Content-Encoding': encoding},
+                    media_type='application/json')
+
+
+async def cached(request, resource, build):
+    """Async counterpart of ``response_cache.cached_response``
+
+    Lookups and stores may read files or compress, so both run in the thread pool.
+    """
+    encoding = compression.negotiate(request.headers.get('Accept-Encoding'))
+    key, headers, body = await run_in_threadpool(response_cache.lookup, resource,
+                                                 request.state.workspace_version, encoding)
+    if body is None:
+        response = await build()
+        if response.status_code != 200:
+            return response
+        headers, body = await run_in_threadpool(response_cache.store, key, response.headers, response.body,
+                                                encoding)
+    return Response(body, 200, headers, media_type='application/json')
+
+
+def _cursor_headers(next_cursor):
+    return {'X-Next-Cursor': next_cursor} if next_cursor else {}
+
+
+@read_view('async.get_categories')
+async def get_categories(request, session):
+    limit, cursor = parse_page_args(request.query_params)
+    feature_serializer = parse_fields(request.query_params, FEATURE_SERIALIZER)
+    category_serializer = parse_fields(request.query_params, CATEGORY_SERIALIZER, 'categoryFields')
+
+    async def build():
+        tree, next_cursor = await AsyncReadService.get_category_tree(
+            session, limit, cursor, feature_serializer, category_serializer
+        )
+        return await render_json(request, tree, 200, _cursor_headers(next_cursor))
+
+    resource = tree_resource(limit, cursor, feature_serializer, category_serializer)
+    return await cached(request, resource, build)
+
+
+@read_view('async.get_category')
+async def get_category(request, session):
+    category_id = request.path_params['category_id']
+
+    async def build():
+        category = await AsyncReadService.get_category_by_id(session, category_id)
+        if category is None:
+            return json_response(request, {'error': 'Category not found'}, 404)
+        return await render_json(request, category)
+
+    return await cached(request, f'category:{category_id}', build)
+
+
+@read_view('async.get_features')
+async def get_features(request, session):
+    limit, cursor = parse_page_args(request.query_params, DEFAULT_PAGE_SIZE)
+    serializer = parse_fields(request.query_params, FEATURE_SERIALIZER)
+    features, next_cursor = await AsyncReadService.get_features_page(
+        session, request.path_params['category_id'], limit, cursor, serializer
+    )
+    return [serializer.from_object(feature) for feature in features], 200, _cursor_headers(next_cursor)
+
+
+@read_view('async.search_features')
+async def search_features(request, session):
+    query, limit, offset = parse_search_args(request.query_params)
+    serializer = parse_fields(request.query_params, FEATURE_SERIALIZER)
+    features, has_more = await AsyncReadService.search_features(session, query, limit, offset, serializer)
+    payload = [{**serializer.from_object(feature), 'categoryId': feature.category_id} for feature in features]
+    return payload, 200, {'X-Next-Cursor': str(offset + limit)} if has_more else {}
+
+
+@read_view('async.query_features')
+async def query_features(request, session):
+    limit, cursor = parse_page_args(request.query_params, DEFAULT_PAGE_SIZE)
+    filters = parse_facet_filters(request.query_params)
+    serializer = parse_fields(request.query_params, FEATURE_SERIALIZER)
+    features, next_cursor, facets = await AsyncReadService.query_features(session, filters, limit, cursor, serializer)
+    payload = {
+        'features': [{**serializer.from_object(feature), 'categoryId': feature.category_id} for feature in features],
+        'facets': facets
+    }
+    return payload, 200, _cursor_headers(next_cursor)
+
+
+async def stream_events(request):
+    """Async counterpart of the events blueprint; an idle stream costs no thread"""
+    async with async_db.session() as session:
+        with request.app.state.flask_app.app_context():
+            user_id = verify_stream_ticket(request.query_params.get('ticket', ''))
+        if user_id is None:
+            return json_response(request, {'error': 'Invalid or expired stream ticket'}, 401)
+        response = await _load_user(request, session, user_id)
+        if response is not None:
+            return response
+
+        loop = asyncio.get_running_loop()
+        wakeup = asyncio.Event()
+        subscription = change_feed.subscribe(lambda: loop.call_soon_threadsafe(wakeup.set))
+        if subscription is None:
+            return json_response(request, {'error': 'Too many event stream subscribers'}, 503)
+        # Read after subscribing so no change falls between the two
+        version = await AsyncReadService.get_version(session)
+
+    last_event_id = request.headers.get('Last-Event-ID') or request.query_params.get('lastEventId')
+
+    async def generate():
+        try:
+            yield b''.join(opening_frames(version, last_event_id))
+            while True:
+                try:
+                    await asyncio.wait_for(wakeup.wait(), change_feed.heartbeat)
+                except asyncio.TimeoutError:
+                    yield HEARTBEAT_FRAME
+                    continue
+                wakeup.clear()
+                yield b''.join(subscription.drain())
+        finally:
+            change_feed.unsubscribe(subscription)
+
+    # The background task also covers clients that disconnect before the first frame
+    return StreamingResponse(generate(), media_type='text/event-stream', headers=EVENT_STREAM_HEADERS,
+                             background=BackgroundTask(change_feed.unsubscribe, subscription))
+
+
+@contextlib.asynccontextmanager
+async def lifespan(application):
+    yield
+    await async_db.dispose()
+
+
+def create_asgi_app(config_name='development'):
+    """Build the ASGI app: async read views in front of the Flask app"""
+    flask_app = create_app(config_name)
+    async_db.init_app(flask_app)
+
+    # Preflight requests fall through to Flask-CORS; this covers the GET responses
+    cors = [Middleware(CORSMiddleware, allow_origins=flask_app.config['CORS_ORIGINS'], allow_methods=['GET'],
+                       expose_headers=['X-Next-Cursor', 'ETag'])]
+
+    def route(path, view):
+        return Route(path, view, methods=['GET'], middleware=cors)
+
+    application = Starlette(
+        routes=[
+            route('/api/categories', get_categories),
+            route('/api/categories/{category_id}', get_category),
+            route('/api/categories/{category_id}/features', get_features),
+            route('/api/features/search', search_features),
+            route('/api/features', query_features),
+            route('/api/events', stream_events),
+            Mount('/', WSGIMiddleware(flask_app)),
+        ],
+        lifespan=lifespan,
+    )
+    application.state.flask_app = flask_app
+    return application
@@ -0,0 +1,124 @@
+"""SQLAlchemy asyncio engine used by the ASGI read API
+
+The async engine points at the same database as ``db.engine`` (after
+Flask-SQLAlchemy has resolved relative SQLite paths), swapping in the
+asyncio driver for the dialect: aiosqlite for SQLite, asyncpg for
+PostgreSQL. Pool settings come from SQLALCHEMY_ENGINE_OPTIONS.
+
+Read replicas configured as ``replica_*`` binds (see app.db_routing) get
+async engines too, and ``read_session`` applies the same rules as
+``@read_only``: reads go to a replica, round-robin, unless the client
+sends ``X-Consistency: primary`` or the replica's workspace version is
+behind the one the request saw on the primary.
+"""
+import contextlib
+import itertools
+
+ASYNC_DRIVERS = {
+    'sqlite': 'sqlite+aiosqlite',
+    'postgresql': 'postgresql+asyncpg',
+}
+
+
+def async_url(url):
+    """Return ``url`` with the asyncio driver for its dialect"""
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f'No asyncio driver configured for {backend}')
+    return url.set(drivername=ASYNC_DRIVERS[backend])
+
+
+def async_engine_options(options):
+    """Translate sync engine options to their asyncio driver equivalents"""
+    options = dict(options)
+    connect_args = dict(options.pop('connect_args', {}))
+    # psycopg2 takes "-c statement_timeout=N" in options; asyncpg takes server_settings
+    pg_options = connect_args.pop('options', '')
+    if pg_options.startswith('-c '):
+        name, _, value = pg_options[3:].partition('=')
+        connect_args['server_settings'] = {name: value}
+    if connect_args:
+        options['connect_args'] = connect_args
+    return options
+
+
+class AsyncDatabase:
+    """Flask extension holding the async engine and session factory"""
+
+    def __init__(self):
+        self.engine = None
+        self.replicas = {}
+        self.sessionmaker = None
+        self._round_robin = itertools.count()
+
+    def init_app(self, app):
+        from sqlalchemy import event
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+        from app import db, enable_sqlite_foreign_keys
+        from app.db_routing import REPLICA_BIND_PREFIX
+
+        with app.app_context():
+            urls = {key: engine.url for key, engine in db.engines.items()}
+
+        def create_engine(url):
+            engine = create_async_engine(
+                async_url(url), **async_engine_options(app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {}))
+            )
+            if url.get_backend_name() == 'sqlite':
+                event.listen(engine.sync_engine, 'connect', enable_sqlite_foreign_keys)
+            return engine
+
+        self.engine = create_engine(urls[None])
+        self.replicas = {
+            key: create_engine(urls[key])
+            for key in sorted(key for key in urls if key and key.startswith(REPLICA_BIND_PREFIX))
+        }
+        self.sessionmaker = async_sessionmaker(self.engine, expire_on_commit=False)
+        app.extensions['async_db'] = self
+
+    def session(self):
+        """Open an AsyncSession; use as ``async with async_db.session() as session``"""
+        return self.sessionmaker()
+
+    @contextlib.asynccontextmanager
+    async def read_session(self, session, required_version, consistency=None):
+        """Yield a session for read-only queries
+
+        That is a replica session when a replica has caught up with
+        ``required_version``, else ``session`` itself (on the primary).
+        """
+        replica = await self._caught_up_replica(required_version) if consistency != 'primary' else None
+        if replica is None:
+            yield session
+            return
+        try:
+            yield replica
+        finally:
+            await replica.close()
+
+    async def _caught_up_replica(self, required_version):
+        from sqlalchemy.exc import SQLAlchemyError
+        from app.services import AsyncReadService
+
+        if not self.replicas:
+            return None
+        keys = list(self.replicas)
+        replica = self.sessionmaker(bind=self.replicas[keys[next(self._round_robin) % len(keys)]])
+        try:
+            if await AsyncReadService.get_version(replica) >= required_version:
+                return replica
+        except SQLAlchemyError:
+            pass
+        await replica.close()
+        return None
+
+    def engines(self):
+        """The primary engine followed by the replica engines"""
+        return [self.engine, *self.replicas.values()] if self.engine is not None else []
+
+    async def dispose(self):
+        for engine in self.engines():
+            await engine.dispose()
+
+
+async_db = AsyncDatabase()
@@ -0,0 +1,359 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from flask import current_app, request
+from app.compression import compression
+from app.metrics import CallbackMetric
+
+
+class CacheStats:
+    """Hit/miss/eviction counters for a cache backend"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def incr(self, name, amount=1):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def to_dict(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+
+class TTLCache:
+    """Bounded in-process LRU whose entries also expire after ``ttl`` seconds"""
+
+    def __init__(self, max_entries=1024, ttl=60):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= now:
+                del self._entries[key]
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+        self.stats.incr('hits' if entry is not None else 'misses')
+        return entry[1] if entry is not None else None
+
+    def set(self, key, value):
+        evicted = 0
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                evicted += 1
+        if evicted:
+            self.stats.incr('evictions', evicted)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def size(self):
+        return len(self._entries)
+
+
+class LRUBackend:
+    """In-process LRU cache of encoded payloads, private to each worker"""
+
+    name = 'memory'
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.stats = CacheStats()
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+        self.stats.incr('hits' if value is not None else 'misses')
+        return value
+
+    def set(self, key, value):
+        evicted = 0
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                evicted += 1
+        if evicted:
+            self.stats.incr('evictions', evicted)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def size(self):
+        return len(self._entries)
+
+
+class FileBackend:
+    """Cache stored as files in a directory shared by all workers on a host
+
+    Writes go through a temp file and ``os.replace`` so readers in other
+    processes never see a partially written entry.
+    """
+
+    name = 'file'
+
+    def __init__(self, directory, max_entries=256):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.stats = CacheStats()
+        os.makedirs(os.path.join(directory, 'entries'), exist_ok=True)
+
+    def _path(self, key):
+        digest = hashlib.sha1(key.encode()).hexdigest()
+        return os.path.join(self.directory, 'entries', digest)
+
+    def _read(self, path):
+        try:
+            with open(path, 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def _write(self, path, value):
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(fd, 'wb') as f:
+            f.write(value)
+        os.replace(tmp_path, path)
+
+    def get(self, key):
+        value = self._read(self._path(key))
+        self.stats.incr('hits' if value is not None else 'misses')
+        return value
+
+    def set(self, key, value):
+        self._write(self._path(key), value)
+        self._prune()
+
+    def _prune(self):
+        entries_dir = os.path.join(self.directory, 'entries')
+        with os.scandir(entries_dir) as it:
+            entries = [entry for entry in it if entry.is_file()]
+        if len(entries) <= self.max_entries:
+            return
+
+        # Least recently written first; another worker may prune concurrently
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in entries[:len(entries) - self.max_entries]:
+            try:
+                os.unlink(entry.path)
+                self.stats.incr('evictions')
+            except FileNotFoundError:
+                pass
+
+    def clear(self):
+        entries_dir = os.path.join(self.directory, 'entries')
+        for name in os.listdir(entries_dir):
+            try:
+                os.unlink(os.path.join(entries_dir, name))
+            except FileNotFoundError:
+                pass
+
+    def size(self):
+        return len(os.listdir(os.path.join(self.directory, 'entries')))
+
+
+class NullBackend:
+    """Backend that never stores anything (caching disabled)"""
+
+    name = 'none'
+
+    def __init__(self):
+        self.stats = CacheStats()
+
+    def get(self, key):
+        self.stats.incr('misses')
+        return None
+
+    def set(self, key, value):
+        pass
+
+    def clear(self):
+        pass
+
+    def size(self):
+        return 0
+
+
+class ResponseCache:
+    """Cache of encoded JSON response bodies keyed on the workspace version
+
+    Each entry is stored under the resource and the workspace version the
+    request's ETag was computed from (``g.workspace_version``, set by
+    ``conditional_get``). Every write bumps that version in the database,
+    so entries built from older data become unreachable at once in every
+    worker and age out of the backend; there is nothing to invalidate.
+
+    Invalidation is therefore exact (no write can leave a stale entry
+    servable, with no window between commit and invalidation) but not per
+    resource: a write to one category also retires the cached bodies of
+    every other category, which are rebuilt on their next read. This is
+    deliberate. The tree, the expensive entry, depends on every row
+    anyway, and the ETags clients revalidate with are the same workspace
+    version, so per-resource keys would save a cheap single-category
+    rebuild but never a 304. Keying entries on per-category versions
+    would require per-category ETags as well.
+
+    A payload built concurrently with a write is stored under the version
+    read before the view ran, the same one its ETag carries, so a body can
+    never be replayed under an ETag newer than the data it was built from.
+
+    Compressed variants are stored next to the plain body under the same
+    key, so each encoding of a payload is compressed once per content
+    version rather than once per request.
+    """
+
+    SEPARATOR = b'\n'
+
+    def __init__(self, app=None):
+        self.backend = NullBackend()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        backend = app.config.get('RESPONSE_CACHE_BACKEND', 'memory')
+        max_entries = app.config.get('RESPONSE_CACHE_MAX_ENTRIES', 256)
+
+        if backend == 'memory':
+            self.backend = LRUBackend(max_entries)
+        elif backend == 'file':
+            directory = app.config.get('RESPONSE_CACHE_DIR') or os.path.join(app.instance_path, 'response-cache')
+            self.backend = FileBackend(directory, max_entries)
+        elif backend == 'none':
+            self.backend = NullBackend()
+        else:
+            raise ValueError(f'Unknown RESPONSE_CACHE_BACKEND: {backend}')
+
+        app.extensions['response_cache'] = self
+
+    def _key(self, resource, version):
+        return f'{resource}|v{version}'
+
+    def _get(self, key):
+        entry = self.backend.get(key)
+        if entry is None:
+            return None, None
+        header_bytes, body = entry.split(self.SEPARATOR, 1)
+        return json.loads(header_bytes), body
+
+    def _set(self, key, headers, body):
+        self.backend.set(key, json.dumps(headers).encode() + self.SEPARATOR + body)
+
+    def lookup(self, resource, version, encoding=None):
+        """Return ``(key, headers, body)``; headers and body are None on a miss
+
+        With ``encoding`` (see ``compression.negotiate``) the body comes back
+        compressed, with a Content-Encoding header, unless it is below the
+        size threshold. Pass ``key`` to ``store`` after building the payload
+        on a miss.
+        """
+        key = self._key(resource, version)
+        if encoding is None:
+            headers, body = self._get(key)
+            return key, headers, body
+
+        headers, body = self._get(f'{key}|{encoding}')
+        if body is None:
+            headers, body = self._get(key)
+            if body is not None:
+                headers, body = self._store_variant(key, headers, body, encoding)
+        return key, headers, body
+
+    def _store_variant(self, key, headers, body, encoding):
+        body, used = compression.compress(body, encoding)
+        if used is not None:
+            headers = {**headers, 'Content-Encoding': used}
+        self._set(f'{key}|{encoding}', headers, body)
+        return headers, body
+
+    def store(self, key, headers, body, encoding=None):
+        """Store an encoded JSON body and the headers to replay with it
+
+        Returns ``(headers, body)`` to send for ``encoding``: the cached
+        headers and the body compressed if it is large enough.
+        """
+        cached_headers = {}
+        if 'X-Next-Cursor' in headers:
+            cached_headers['X-Next-Cursor'] = headers['X-Next-Cursor']
+        self._set(key, cached_headers, body)
+        if encoding is None:
+            return cached_headers, body
+        return self._store_variant(key, cached_headers, body, encoding)
+
+    def cached_response(self, resource, version, build):
+        """Return a cached response for ``resource`` at ``version`` or build and store it
+
+        ``build`` returns anything a view may return; only 200 responses are
+        cached, together with their ``X-Next-Cursor`` header. The body is
+        sent in the encoding negotiated from the request's Accept-Encoding.
+        """
+        encoding = compression.negotiate(request.headers.get('Accept-Encoding'))
+        key, headers, body = self.lookup(resource, version, encoding)
+        if body is None:
+            response = current_app.make_response(build())
+            if response.status_code != 200:
+                return response
+            headers, body = self.store(key, response.headers, response.get_data(), encoding)
+
+        response = current_app.response_class(body, mimetype='application/json')
+        response.headers.update(headers)
+        return response
+
+    def clear(self):
+        self.backend.clear()
+
+    def stats(self):
+        return {'backend': self.backend.name, 'size': self.backend.size(), **self.backend.stats.to_dict()}
+
+
+response_cache = ResponseCache()
+
+
+def _cache_samples(field):
+    def samples():
+        stats = response_cache.stats()
+        return [((stats['backend'],), stats[field])]
+    return samples
+
+
+def register_cache_metrics(metrics):
+    """Expose response cache counters through the metrics registry"""
+    for field in ('hits', 'misses', 'evictions'):
+        metrics.register(CallbackMetric(f'response_cache_{field}_total', f'Response cache {field}',
+                                        'counter', _cache_samples(field), ('backend',)))
+    # Workers sharing the file backend all report the same entries
+    mode = 'max' if response_cache.backend.name == 'file' else 'sum'
+    metrics.register(CallbackMetric('response_cache_entries', 'Entries in the response cache',
+                                    'gauge', _cache_samples('size'), ('backend',), mode))
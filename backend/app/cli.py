@@ -0,0 +1,33 @@
+import click
+from app.services import ImportService, SyncService
+from app.services.import_service import IMPORT_BATCH_SIZE
+
+def register_commands(app):
+    """Register flask CLI commands"""
+
+    @app.cli.command('import-features')
+    @click.argument('path', type=click.Path(exists=True, dir_okay=False))
+    @click.option('--format', 'import_format', type=click.Choice(['csv', 'ndjson']),
+                  help='Input format (defaults to the file extension)')
+    @click.option('--batch-size', default=IMPORT_BATCH_SIZE, show_default=True, help='Rows per INSERT batch')
+    def import_features(path, import_format, batch_size):
+        """Bulk import features from a CSV or NDJSON file"""
+        if import_format is None:
+            import_format = 'csv' if path.endswith('.csv') else 'ndjson'
+
+        def progress(summary):
+            click.echo(f"batch {summary['batches']}: {summary['imported']} imported, "
+                       f"{summary['skipped']} skipped")
+
+        with open(path, 'rb') as stream:
+            summary = ImportService.import_features(stream, import_format, batch_size, progress)
+
+        for error in summary['errors']:
+            click.echo(f"line {error['line']}: {error['error']}", err=True)
+        click.echo(f"Imported {summary['imported']} features "
+                   f"({summary['categoriesCreated']} new categories, {summary['skipped']} rows skipped)")
+
+    @app.cli.command('prune-tombstones')
+    def prune_tombstones():
+        """Delete delta sync tombstones older than the retention period"""
+        click.echo(f'Pruned {SyncService.prune_tombstones()} tombstones')
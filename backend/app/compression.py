@@ -0,0 +1,111 @@
+"""Response compression negotiated from the request's Accept-Encoding
+
+gzip is always available; zstd and brotli are offered when the
+``zstandard`` and ``brotli`` packages are installed. Bodies smaller than
+``COMPRESS_MIN_SIZE`` and streamed responses (exports, the change feed)
+are sent as they are.
+
+Like nginx, a compressed response's ETag is made weak: the compressed
+bytes differ between encodings, but every encoding of one workspace
+version is the same content, so If-None-Match still matches it.
+"""
+import gzip
+
+from flask import request
+from werkzeug.http import parse_accept_header
+from app.metrics import Counter
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zstandard is optional
+    zstandard = None
+
+COMPRESSIBLE_MIMETYPES = {'application/json', 'text/plain', 'text/csv', 'text/html', 'application/x-ndjson'}
+
+
+def _encoders():
+    # Server preference order when the client weighs encodings equally
+    encoders = {}
+    if zstandard is not None:
+        encoders['zstd'] = lambda body: zstandard.ZstdCompressor(level=3).compress(body)
+    if brotli is not None:
+        encoders['br'] = lambda body: brotli.compress(body, quality=5)
+    encoders['gzip'] = lambda body: gzip.compress(body, compresslevel=6, mtime=0)
+    return encoders
+
+
+class Compression:
+    """Flask extension compressing responses after the view has run"""
+
+    def __init__(self):
+        self.min_size = 1024
+        self.encoders = _encoders()
+        self.compressed = None
+
+    def init_app(self, app, metrics=None):
+        self.min_size = app.config.get('COMPRESS_MIN_SIZE', 1024)
+        available = _encoders()
+        self.encoders = {name: available[name] for name in app.config.get('COMPRESS_ALGORITHMS', available)
+                         if name in available}
+
+        if metrics is not None:
+            self.compressed = metrics.register(Counter('response_compressed_total', 'Responses compressed',
+                                                       ('encoding',)))
+
+        if self.encoders:
+            app.after_request(self._after_request)
+        app.extensions['compression'] = self
+
+    def negotiate(self, accept_encoding):
+        """Pick the encoding to answer ``accept_encoding`` with; None means identity"""
+        if not accept_encoding or not self.encoders:
+            return None
+        accepted = parse_accept_header(accept_encoding)
+        best, best_quality = None, 0
+        for name in self.encoders:
+            quality = accepted[name]
+            if quality > best_quality:
+                best, best_quality = name, quality
+        return best
+
+    def compress(self, body, encoding):
+        """Compress ``body``; returns it unchanged when below the size threshold"""
+        if encoding is None or len(body) < self.min_size:
+            return body, None
+        if self.compressed is not None:
+            self.compressed.inc(encoding)
+        return self.encoders[encoding](body), encoding
+
+    def _after_request(self, response):
+        if response.mimetype not in COMPRESSIBLE_MIMETYPES:
+            return response
+        response.vary.add('Accept-Encoding')
+        if 'Content-Encoding' in response.headers:
+            # Served already compressed from the response cache
+            weaken_etag(response.headers)
+            return response
+        if (response.direct_passthrough or response.is_streamed or response.status_code not in (200, 201)
+                or 'no-transform' in response.headers.get('Cache-Control', '')):
+            return response
+
+        body, encoding = self.compress(response.get_data(), self.negotiate(request.headers.get('Accept-Encoding')))
+        if encoding is not None:
+            response.set_data(body)
+            response.headers['Content-Encoding'] = encoding
+            weaken_etag(response.headers)
+        return response
+
+
+def weaken_etag(headers):
+    """Turn a strong ETag into a weak one once the body has been compressed"""
+    etag = headers.get('ETag')
+    if etag and not etag.startswith('W/'):
+        headers['ETag'] = f'W/{etag}'
+
+
+compression = Compression()
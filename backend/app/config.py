@@ -1,5 +1,34 @@
 import os
 from datetime import timedelta
+from sqlalchemy.pool import NullPool
+from app.db_routing import replica_binds
+
+def engine_options(database_uri, pool_size=5, max_overflow=10, pool_recycle=1800,
+                   pool_timeout=30, statement_timeout_ms=None):
+    """Build SQLALCHEMY_ENGINE_OPTIONS, applied to the primary and every replica
+
+    Every value can be overridden from the environment. DB_POOL=none
+    disables client-side pooling for running behind PgBouncer or similar.
+    """
+    options = {
+        'pool_pre_ping': os.environ.get('DB_POOL_PRE_PING', 'true').lower() == 'true',
+        'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', pool_recycle)),
+    }
+    if os.environ.get('DB_POOL') == 'none':
+        options['poolclass'] = NullPool
+    elif database_uri and not database_uri.startswith('sqlite:///:memory:') and database_uri != 'sqlite://':
+        options['pool_size'] = int(os.environ.get('DB_POOL_SIZE', pool_size))
+        options['max_overflow'] = int(os.environ.get('DB_MAX_OVERFLOW', max_overflow))
+        options['pool_timeout'] = int(os.environ.get('DB_POOL_TIMEOUT', pool_timeout))
+
+    statement_timeout_ms = int(os.environ.get('DB_STATEMENT_TIMEOUT_MS', statement_timeout_ms or 0))
+    if statement_timeout_ms and database_uri and database_uri.startswith('postgresql'):
+        options['connect_args'] = {'options': f'-c statement_timeout={statement_timeout_ms}'}
+
+    return options
+
+def _replica_urls():
+    return [url for url in os.environ.get('DATABASE_REPLICA_URLS', '').split(',') if url]
 
 class Config:
     """Base configuration class"""
@@ -8,22 +37,71 @@ class Config:
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY') or 'jwt-secret-key-change-in-production'
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=24)
 
+    # Response cache: 'memory' (per worker), 'file' (shared by all workers on a host) or 'none'
+    RESPONSE_CACHE_BACKEND = os.environ.get('RESPONSE_CACHE_BACKEND', 'memory')
+    RESPONSE_CACHE_DIR = os.environ.get('RESPONSE_CACHE_DIR')
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.environ.get('RESPONSE_CACHE_MAX_ENTRIES', 256))
+
+    # Response compression: encodings offered in preference order (zstd and br need their optional
+    # packages; empty disables compression) and the smallest body worth compressing, in bytes
+    COMPRESS_ALGORITHMS = [name for name in os.environ.get('COMPRESS_ALGORITHMS', 'zstd,br,gzip').split(',') if name]
+    COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', 1024))
+
+    # JWT identity (current_user) cache, per worker
+    USER_CACHE_TTL = int(os.environ.get('USER_CACHE_TTL', 60))
+    USER_CACHE_MAX_ENTRIES = int(os.environ.get('USER_CACHE_MAX_ENTRIES', 1024))
+
+    # Password hashing, counted across all workers on the host: concurrent hashes, extra waiting
+    # requests before 503, seconds a request may wait, and where the shared slot files live
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'scrypt')
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', 0)) or None
+    PASSWORD_HASH_MAX_QUEUE = int(os.environ.get('PASSWORD_HASH_MAX_QUEUE', 4))
+    PASSWORD_HASH_SLOT_DIR = os.environ.get('PASSWORD_HASH_SLOT_DIR')
+    PASSWORD_HASH_TIMEOUT = float(os.environ.get('PASSWORD_HASH_TIMEOUT', 2))
+
+    # Change feed at /api/events. EVENTS_RELAY: 'local' (one process), 'socket' (all workers on a
+    # host, via Unix sockets in EVENTS_SOCKET_DIR) or 'postgres' (LISTEN/NOTIFY on EVENTS_CHANNEL)
+    EVENTS_RELAY = os.environ.get('EVENTS_RELAY', 'local')
+    EVENTS_SOCKET_DIR = os.environ.get('EVENTS_SOCKET_DIR')
+    EVENTS_CHANNEL = os.environ.get('EVENTS_CHANNEL', 'prd_changes')
+    EVENTS_MAX_SUBSCRIBERS = int(os.environ.get('EVENTS_MAX_SUBSCRIBERS', 1000))
+    EVENTS_QUEUE_SIZE = int(os.environ.get('EVENTS_QUEUE_SIZE', 256))
+    EVENTS_HEARTBEAT = float(os.environ.get('EVENTS_HEARTBEAT', 15))
+    # Seconds a stream ticket (POST /api/events/ticket) may be used to open the feed
+    EVENTS_TICKET_TTL = int(os.environ.get('EVENTS_TICKET_TTL', 30))
+
+    # Prometheus metrics at METRICS_PATH (unauthenticated; restrict at the proxy)
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() == 'true'
+    METRICS_PATH = '/metrics'
+    # Sum the metrics of every worker on the host through snapshots in METRICS_DIR
+    METRICS_MULTIPROCESS = os.environ.get('METRICS_MULTIPROCESS', 'false').lower() == 'true'
+    METRICS_DIR = os.environ.get('METRICS_DIR')
+    METRICS_FLUSH_INTERVAL = float(os.environ.get('METRICS_FLUSH_INTERVAL', 5))
+
 class DevelopmentConfig(Config):
     """Development configuration"""
     DEBUG = True
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///prd_manager_dev.db'
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI, pool_size=5, max_overflow=5)
+    SQLALCHEMY_BINDS = replica_binds(_replica_urls())
     CORS_ORIGINS = ['http://localhost:5173', 'http://localhost:3000', 'http://localhost']
 
 class ProductionConfig(Config):
     """Production configuration"""
     DEBUG = False
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL')
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI, pool_size=10, max_overflow=20,
+                                               statement_timeout_ms=30000)
+    SQLALCHEMY_BINDS = replica_binds(_replica_urls())
     CORS_ORIGINS = os.environ.get('CORS_ORIGINS', '').split(',')
 
 class TestingConfig(Config):
     """Testing configuration"""
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///prd_manager_test.db'
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI, pool_size=2, max_overflow=0)
+    RESPONSE_CACHE_BACKEND = 'none'
+    CORS_ORIGINS = []
 
 config = {
     'development': DevelopmentConfig,
@@ -0,0 +1,90 @@
+"""Read-replica routing for the SQLAlchemy session
+
+Replica URLs are configured as ``SQLALCHEMY_BINDS`` named ``replica_0``,
+``replica_1``... Service methods decorated with ``@read_only`` run their
+queries on a replica. Everything else, every flush, and every read in a
+request that has already written stays on the primary. So does a read
+when the client sends ``X-Consistency: primary``, or when the replica's
+workspace version is behind the one this request saw on the primary
+(read-your-writes across requests). The ASGI read API applies the same
+rules to its async engines (see app.async_db).
+"""
+import contextvars
+import itertools
+from functools import wraps
+
+from flask import g, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.exc import SQLAlchemyError
+
+REPLICA_BIND_PREFIX = 'replica_'
+
+_replica_bind = contextvars.ContextVar('replica_bind', default=None)
+_round_robin = itertools.count()
+
+
+def replica_binds(replica_urls):
+    """Build SQLALCHEMY_BINDS entries for a list of replica URLs"""
+    return {f'{REPLICA_BIND_PREFIX}{index}': url for index, url in enumerate(replica_urls)}
+
+
+class RoutingSession(Session):
+    """Session that sends reads inside a ``read_only`` scope to a replica"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        replica = _replica_bind.get()
+        if bind is None and replica is not None and not self._flushing:
+            return self._db.engines[replica]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+@event.listens_for(RoutingSession, 'after_flush')
+def _mark_request_wrote(session, flush_context):
+    if has_request_context():
+        g._db_wrote = True
+
+
+def _choose_replica():
+    from app import db
+    from app.models import WorkspaceVersion
+
+    keys = [key for key in db.engines if key and key.startswith(REPLICA_BIND_PREFIX)]
+    if not keys:
+        return None
+
+    if has_request_context():
+        if g.get('_db_wrote') or request.headers.get('X-Consistency') == 'primary':
+            return None
+
+    key = keys[next(_round_robin) % len(keys)]
+
+    required_version = g.get('workspace_version') if has_request_context() else None
+    if required_version is not None:
+        try:
+            replica_version = db.session.execute(
+                db.select(WorkspaceVersion.version).where(WorkspaceVersion.id == 1),
+                bind_arguments={'bind': db.engines[key]}
+            ).scalar() or 0
+        except SQLAlchemyError:
+            return None
+        if replica_version < required_version:
+            return None
+
+    return key
+
+
+def read_only(fn):
+    """Run a read-only service call on a replica when one can serve it"""
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        if _replica_bind.get() is not None:
+            return fn(*args, **kwargs)
+
+        token = _replica_bind.set(_choose_replica())
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _replica_bind.reset(token)
+
+    return wrapper
@@ -0,0 +1,327 @@
+"""Change feed: fan-out of committed category/feature changes to SSE clients
+
+Services call ``change_feed.publish`` after a write commits. Events travel
+through a relay so every worker sees every change, then each worker fans
+them out to its own subscribers:
+
+- ``local``: in-process only (single worker, development)
+- ``socket``: Unix datagram sockets in a shared directory, one per worker
+  process on the host; a stand-in for a broker on single-host deployments
+- ``postgres``: LISTEN/NOTIFY on the application database (psycopg2)
+
+A subscriber is a bounded deque plus a wake-up callback, so hundreds of
+idle subscribers cost a few hundred bytes each and no thread. When a slow
+client's queue overflows, its backlog is replaced by a single ``resync``
+frame telling it to refetch.
+
+EventSource cannot send an Authorization header, so clients first trade
+their access token for a stream ticket (``issue_stream_ticket``): signed,
+valid for ``EVENTS_TICKET_TTL`` seconds and good only for opening the
+stream, so the URL that proxies and access logs record does not carry a
+long-lived credential.
+"""
+import atexit
+import glob
+import json
+import os
+import select
+import socket
+import threading
+import time
+from collections import deque
+
+from flask import current_app
+from itsdangerous import BadSignature, URLSafeTimedSerializer
+from sqlalchemy import text
+from app.metrics import Counter, CallbackMetric
+
+# Events per relay message; keeps NOTIFY payloads under Postgres' 8000 byte limit
+RELAY_CHUNK_SIZE = 40
+
+HEARTBEAT_FRAME = b': keepalive\n\n'
+
+
+def change_event(entity, entity_id, op, version, category_id=None):
+    """Build a compact change event; feature events also carry their categoryId"""
+    event = {'entity': entity, 'id': entity_id, 'op': op, 'version': version}
+    if category_id is not None:
+        event['categoryId'] = category_id
+    return event
+
+
+def _ticket_serializer():
+    return URLSafeTimedSerializer(current_app.config['SECRET_KEY'], salt='event-stream')
+
+
+def issue_stream_ticket(user_id):
+    """Short-lived ticket that lets ``user_id`` open the change feed"""
+    return _ticket_serializer().dumps(str(user_id))
+
+
+def verify_stream_ticket(ticket):
+    """Return the user id a stream ticket was issued to, or None if invalid or expired"""
+    try:
+        return _ticket_serializer().loads(ticket, max_age=current_app.config.get('EVENTS_TICKET_TTL', 30))
+    except BadSignature:
+        return None
+
+
+def format_event(event):
+    """Encode a change event as an SSE frame"""
+    return f"id: {event['version']}\nevent: change\ndata: {json.dumps(event, separators=(',', ':'))}\n\n".encode()
+
+
+def format_resync(version):
+    """SSE frame telling the client its view may be stale and to refetch"""
+    return f'id: {version}\nevent: resync\ndata: {{"version":{version}}}\n\n'.encode()
+
+
+def opening_frames(version, last_event_id=None):
+    """Frames sent when a client connects
+
+    A client resuming with a Last-Event-ID older than the current version
+    missed changes while disconnected; events are not stored, so it is told
+    to resync instead of being replayed.
+    """
+    frames = [b'retry: 3000\n\n']
+    try:
+        missed = last_event_id is not None and int(last_event_id) < version
+    except ValueError:
+        missed = True
+    if missed:
+        frames.append(format_resync(version))
+    else:
+        frames.append(f'id: {version}\nevent: ready\ndata: {{"version":{version}}}\n\n'.encode())
+    return frames
+
+
+class Subscription:
+    """One client's pending events"""
+
+    def __init__(self, max_events, notify):
+        self.max_events = max_events
+        self.overflowed = False
+        self.version = 0
+        self._events = deque()
+        self._notify = notify
+
+    def deliver(self, event):
+        self.version = max(self.version, event['version'])
+        if len(self._events) >= self.max_events:
+            self._events.clear()
+            self.overflowed = True
+        else:
+            self._events.append(event)
+        self._notify()
+
+    def drain(self):
+        """Return the SSE frames for everything delivered since the last drain"""
+        if self.overflowed:
+            self.overflowed = False
+            self._events.clear()
+            return [format_resync(self.version)]
+        frames = []
+        while self._events:
+            frames.append(format_event(self._events.popleft()))
+        return frames
+
+
+class LocalRelay:
+    """Deliver events to this process only"""
+
+    name = 'local'
+
+    def start(self, dispatch):
+        self.dispatch = dispatch
+
+    def send(self, payload):
+        self.dispatch(payload)
+
+
+class SocketRelay:
+    """Deliver events to every worker on the host over Unix datagram sockets
+
+    Each worker binds ``<directory>/<pid>.sock`` and sends every payload to
+    all sockets in the directory, itself included. Sockets of workers that
+    exited are removed by whoever next fails to reach them.
+    """
+
+    name = 'socket'
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.dropped = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def start(self, dispatch):
+        self.dispatch = dispatch
+        self.path = os.path.join(self.directory, f'{os.getpid()}.sock')
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+        self.receiver = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self.receiver.bind(self.path)
+        self.sender = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self.sender.setblocking(False)
+        atexit.register(self._cleanup, self.path)
+
+        threading.Thread(target=self._receive, name='change-feed-socket', daemon=True).start()
+
+    def _receive(self):
+        while True:
+            payload = self.receiver.recv(65536)
+            self.dispatch(payload)
+
+    @staticmethod
+    def _cleanup(path):
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+    def send(self, payload):
+        for path in glob.glob(os.path.join(self.directory, '*.sock')):
+            try:
+                self.sender.sendto(payload, path)
+            except (ConnectionRefusedError, FileNotFoundError):
+                self._cleanup(path)
+            except BlockingIOError:
+                # Receiver's buffer is full; its subscribers will see a gap
+                self.dropped += 1
+
+
+class PostgresRelay:
+    """Deliver events to every worker through Postgres LISTEN/NOTIFY"""
+
+    name = 'postgres'
+
+    def __init__(self, engine, channel):
+        self.engine = engine
+        self.channel = channel
+
+    def start(self, dispatch):
+        self.dispatch = dispatch
+        threading.Thread(target=self._listen, name='change-feed-listen', daemon=True).start()
+
+    def _listen(self):
+        while True:
+            driver_connection = None
+            try:
+                connection = self.engine.raw_connection()
+                connection.detach()
+                driver_connection = connection.driver_connection
+                driver_connection.autocommit = True
+                with driver_connection.cursor() as cursor:
+                    cursor.execute(f'LISTEN "{self.channel}"')
+                while True:
+                    if select.select([driver_connection], [], [], 30) == ([], [], []):
+                        continue
+                    driver_connection.poll()
+                    while driver_connection.notifies:
+                        self.dispatch(driver_connection.notifies.pop(0).payload.encode())
+            except Exception:
+                # Lost the listening connection; reconnect after a pause
+                if driver_connection is not None:
+                    driver_connection.close()
+                time.sleep(1)
+
+    def send(self, payload):
+        with self.engine.connect() as connection:
+            connection.execute(text('SELECT pg_notify(:channel, :payload)'),
+                               {'channel': self.channel, 'payload': payload.decode()})
+            connection.commit()
+
+
+class ChangeFeed:
+    """Flask extension publishing committed changes to event stream subscribers"""
+
+    def __init__(self):
+        self.relay = LocalRelay()
+        self.max_subscribers = 1000
+        self.queue_size = 256
+        self.heartbeat = 15
+        self.published = None
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._pid = None
+
+    def init_app(self, app, metrics=None):
+        kind = app.config.get('EVENTS_RELAY', 'local')
+        if kind == 'local':
+            self.relay = LocalRelay()
+        elif kind == 'socket':
+            directory = app.config.get('EVENTS_SOCKET_DIR') or os.path.join(app.instance_path, 'events')
+            self.relay = SocketRelay(directory)
+        elif kind == 'postgres':
+            from app import db
+            with app.app_context():
+                self.relay = PostgresRelay(db.engine, app.config.get('EVENTS_CHANNEL', 'prd_changes'))
+        else:
+            raise ValueError(f'Unknown EVENTS_RELAY: {kind}')
+
+        self.max_subscribers = app.config.get('EVENTS_MAX_SUBSCRIBERS', 1000)
+        self.queue_size = app.config.get('EVENTS_QUEUE_SIZE', 256)
+        self.heartbeat = app.config.get('EVENTS_HEARTBEAT', 15)
+        self._pid = None
+
+        if metrics is not None:
+            self.published = metrics.register(Counter('change_feed_events_total', 'Change events published'))
+            metrics.register(CallbackMetric('change_feed_subscribers', 'Open event stream subscriptions',
+                                            'gauge', lambda: [((), len(self._subscribers))]))
+
+        app.extensions['change_feed'] = self
+
+    def _ensure_started(self):
+        # Relays start lazily so threads and sockets belong to the worker, not a preforking master
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self.relay.start(self._dispatch)
+                    self._pid = os.getpid()
+
+    def publish(self, events):
+        """Publish change events for a committed write"""
+        if not events:
+            return
+        self._ensure_started()
+        for start in range(0, len(events), RELAY_CHUNK_SIZE):
+            chunk = events[start:start + RELAY_CHUNK_SIZE]
+            self.relay.send(json.dumps(chunk, separators=(',', ':')).encode())
+        if self.published is not None:
+            self.published.inc(amount=len(events))
+
+    def _dispatch(self, payload):
+        events = json.loads(payload)
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            try:
+                for event in events:
+                    subscription.deliver(event)
+            except RuntimeError:
+                # The subscriber's event loop has closed
+                self.unsubscribe(subscription)
+
+    def subscribe(self, notify):
+        """Register a subscriber; returns None when this worker is at capacity
+
+        ``notify`` is called from the publishing or relay thread after each
+        delivery and must be thread-safe and non-blocking.
+        """
+        self._ensure_started()
+        with self._lock:
+            if len(self._subscribers) >= self.max_subscribers:
+                return None
+            subscription = Subscription(self.queue_size, notify)
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def subscriber_count(self):
+        return len(self._subscribers)
+
+
+change_feed = ChangeFeed()
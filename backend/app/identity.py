@@ -0,0 +1,68 @@
+"""Cached JWT identity resolution
+
+Registers flask_jwt_extended user loader callbacks so ``current_user`` is
+resolved from a bounded, TTL-limited in-process cache of serialized users
+instead of a database query on every protected request. Entries are
+dropped when the user row changes in this worker; other workers see the
+change once the TTL expires.
+"""
+from flask import jsonify
+from sqlalchemy import event
+from app.cache import TTLCache
+from app.metrics import CallbackMetric
+
+
+class IdentityCache:
+    """Flask extension caching JWT identity lookups"""
+
+    def __init__(self):
+        self.cache = TTLCache()
+
+    def init_app(self, app, jwt, metrics=None):
+        from app.models import User
+        from app.services import AuthService
+
+        self.cache.max_entries = app.config.get('USER_CACHE_MAX_ENTRIES', 1024)
+        self.cache.ttl = app.config.get('USER_CACHE_TTL', 60)
+
+        @jwt.user_lookup_loader
+        def load_user(jwt_header, jwt_data):
+            user_id = jwt_data[app.config.get('JWT_IDENTITY_CLAIM', 'sub')]
+            user = self.cache.get(user_id)
+            if user is None:
+                record = AuthService.get_user_by_id(user_id)
+                if record is None:
+                    return None
+                user = record.to_dict()
+                self.cache.set(user_id, user)
+            return user
+
+        @jwt.user_lookup_error_loader
+        def user_not_found(jwt_header, jwt_data):
+            return jsonify({'error': 'User not found'}), 401
+
+        event.listen(User, 'after_update', self._invalidate)
+        event.listen(User, 'after_delete', self._invalidate)
+
+        if metrics is not None:
+            for field in ('hits', 'misses', 'evictions'):
+                metrics.register(CallbackMetric(f'identity_cache_{field}_total', f'Identity cache {field}',
+                                                'counter', self._samples(field)))
+
+        app.extensions['identity_cache'] = self
+
+    def _invalidate(self, mapper, connection, target):
+        self.invalidate(target.id)
+
+    def _samples(self, field):
+        return lambda: [((), self.cache.stats.to_dict()[field])]
+
+    def invalidate(self, user_id):
+        """Drop a cached user, e.g. after changing its row"""
+        self.cache.delete(str(user_id))
+
+    def stats(self):
+        return {'size': self.cache.size(), **self.cache.stats.to_dict()}
+
+
+identity_cache = IdentityCache()
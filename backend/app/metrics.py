@@ -0,0 +1,373 @@
+"""Request and database instrumentation exposed in Prometheus text format
+
+Counters live in process memory and are cheap to update (a dict lookup and
+a lock per observation), so they are meant to stay on in production.
+
+Behind a preforking server a scrape reaches one arbitrary worker. With
+``METRICS_MULTIPROCESS`` each worker therefore also writes a snapshot of
+its metrics to a directory shared by the workers on the host, every
+``METRICS_FLUSH_INTERVAL`` seconds and whenever it answers a scrape, and
+the scrape reports the sum over all snapshots. Counters of workers that
+exited are folded into an archive so totals stay monotonic across worker
+restarts; their gauges are dropped.
+"""
+import atexit
+import fcntl
+import glob
+import json
+import os
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+
+from flask import Response, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+def _format_labels(names, values, extra=None):
+    pairs = list(zip(names, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+
+def _merge(a, b, mode='sum'):
+    """Combine two workers' values of a sample; histogram values are nested lists"""
+    if isinstance(a, list):
+        return [_merge(x, y, mode) for x, y in zip(a, b)]
+    return max(a, b) if mode == 'max' else a + b
+
+
+class Counter:
+    """Monotonic counter with labels"""
+
+    metric_type = 'counter'
+    multiprocess_mode = 'sum'
+
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            return list(self._values.items())
+
+    def expose(self, samples=None):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} counter']
+        for label_values, value in self.samples() if samples is None else samples:
+            lines.append(f'{self.name}{_format_labels(self.labels, label_values)} {value}')
+        return lines
+
+
+class CallbackMetric:
+    """Counter or gauge whose samples are read from a callback at scrape time
+
+    ``callback`` returns a list of ``(label_values, value)`` pairs. Across
+    workers the values are summed, or with ``multiprocess_mode='max'`` the
+    largest is reported (for state the workers share, such as a file cache).
+    """
+
+    def __init__(self, name, documentation, metric_type, callback, labels=(), multiprocess_mode='sum'):
+        self.name = name
+        self.documentation = documentation
+        self.metric_type = metric_type
+        self.labels = tuple(labels)
+        self.callback = callback
+        self.multiprocess_mode = multiprocess_mode
+
+    def samples(self):
+        return self.callback()
+
+    def expose(self, samples=None):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.metric_type}']
+        for label_values, value in self.samples() if samples is None else samples:
+            lines.append(f'{self.name}{_format_labels(self.labels, label_values)} {value}')
+        return lines
+
+
+class Histogram:
+    """Cumulative histogram with labels"""
+
+    metric_type = 'histogram'
+    multiprocess_mode = 'sum'
+
+    def __init__(self, name, documentation, labels=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def samples(self):
+        with self._lock:
+            return [(labels, [list(counts), total, count]) for labels, (counts, total, count) in self._series.items()]
+
+    def expose(self, samples=None):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        for label_values, (counts, total, count) in self.samples() if samples is None else samples:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + ('+Inf',), counts):
+                cumulative += bucket_count
+                lines.append(f'{self.name}_bucket{_format_labels(self.labels, label_values, ("le", bound))} {cumulative}')
+            lines.append(f'{self.name}_sum{_format_labels(self.labels, label_values)} {total}')
+            lines.append(f'{self.name}_count{_format_labels(self.labels, label_values)} {count}')
+        return lines
+
+
+class SharedSnapshots:
+    """Metric snapshots of every worker on a host, kept in a shared directory
+
+    Each worker writes ``<pid>.json`` (through a temp file and ``os.replace``,
+    like the file response cache) and holds an ``flock`` on ``<pid>.lock``
+    for as long as it lives. A lock that can be taken therefore belongs to
+    a worker that exited: its counters and histograms are added to
+    ``archive.json`` and its files removed.
+    """
+
+    ARCHIVE = 'archive.json'
+
+    def __init__(self, directory, interval=5):
+        self.directory = directory
+        self.interval = interval
+        self._lock_fd = None
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def _read(self, path):
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _write(self, path, snapshot):
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(snapshot, f)
+        os.replace(tmp_path, path)
+
+    def start(self, snapshot):
+        """Mark this worker alive and flush ``snapshot()`` periodically until it exits"""
+        self._lock_fd = os.open(self._path(f'{os.getpid()}.lock'), os.O_CREAT | os.O_RDWR, 0o600)
+        fcntl.flock(self._lock_fd, fcntl.LOCK_EX)
+
+        def flush():
+            while True:
+                time.sleep(self.interval)
+                self.write(snapshot())
+
+        threading.Thread(target=flush, name='metrics-flush', daemon=True).start()
+        atexit.register(lambda: self.write(snapshot()))
+
+    def write(self, snapshot):
+        self._write(self._path(f'{os.getpid()}.json'), snapshot)
+
+    def collect(self):
+        """Fold exited workers into the archive; return the archive and live snapshots"""
+        archive_lock = os.open(self._path('archive.lock'), os.O_CREAT | os.O_RDWR, 0o600)
+        try:
+            fcntl.flock(archive_lock, fcntl.LOCK_EX)
+            archive = self._read(self._path(self.ARCHIVE))
+            snapshots, folded = [], False
+            for path in glob.glob(self._path('[0-9]*.json')):
+                lock_path = path[:-len('.json')] + '.lock'
+                snapshot = self._read(path)
+                if self._alive(lock_path):
+                    snapshots.append(snapshot)
+                    continue
+                for name, metric in snapshot.items():
+                    if metric['type'] != 'gauge':
+                        archive[name] = merge_snapshot(archive.get(name), metric)
+                for stale in (path, lock_path):
+                    try:
+                        os.unlink(stale)
+                    except FileNotFoundError:
+                        pass
+                folded = True
+            if folded:
+                self._write(self._path(self.ARCHIVE), archive)
+        finally:
+            os.close(archive_lock)
+        return [archive, *snapshots]
+
+    def _alive(self, lock_path):
+        try:
+            fd = os.open(lock_path, os.O_RDWR)
+        except FileNotFoundError:
+            return False
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return False
+        except BlockingIOError:
+            return True
+        finally:
+            os.close(fd)
+
+
+def merge_snapshot(current, metric):
+    """Add one worker's snapshot of a metric into an aggregate of the same metric"""
+    if current is None:
+        return metric
+    samples = {tuple(labels): value for labels, value in current['samples']}
+    for labels, value in metric['samples']:
+        labels = tuple(labels)
+        samples[labels] = _merge(samples[labels], value, metric['mode']) if labels in samples else value
+    return {**current, 'samples': [[list(labels), value] for labels, value in samples.items()]}
+
+
+class Metrics:
+    """Flask extension wiring request and SQL instrumentation"""
+
+    def __init__(self, app=None):
+        self.registry = []
+        self.request_duration = self.register(Histogram(
+            'http_request_duration_seconds', 'Request latency by endpoint and status', ('endpoint', 'method', 'status')))
+        self.request_queries = self.register(Histogram(
+            'http_request_db_queries', 'SQL statements issued per request', ('endpoint',), QUERY_COUNT_BUCKETS))
+        self.request_db_time = self.register(Histogram(
+            'http_request_db_seconds', 'Time spent in SQL per request', ('endpoint',)))
+        self.db_queries = self.register(Counter(
+            'db_queries_total', 'SQL statements executed'))
+        self.db_time = self.register(Counter(
+            'db_query_seconds_total', 'Time spent executing SQL'))
+        self._listening = False
+        self.shared = None
+        self._pid = None
+        self._start_lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def register(self, metric):
+        """Add a metric; registering the same name twice returns the first one"""
+        for existing in self.registry:
+            if existing.name == metric.name:
+                return existing
+        self.registry.append(metric)
+        return metric
+
+    def init_app(self, app):
+        if not app.config.get('METRICS_ENABLED', True):
+            return
+
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.add_url_rule(app.config.get('METRICS_PATH', '/metrics'), 'metrics', self.expose)
+
+        # Listening on the Engine class covers every engine, replicas included
+        if not self._listening:
+            event.listen(Engine, 'before_cursor_execute', self._before_cursor_execute)
+            event.listen(Engine, 'after_cursor_execute', self._after_cursor_execute)
+            event.listen(Engine, 'handle_error', self._handle_error)
+            self._listening = True
+
+        if app.config.get('METRICS_MULTIPROCESS', False):
+            directory = app.config.get('METRICS_DIR') or os.path.join(app.instance_path, 'metrics')
+            self.shared = SharedSnapshots(directory, app.config.get('METRICS_FLUSH_INTERVAL', 5))
+
+        app.extensions['metrics'] = self
+
+    def _ensure_started(self):
+        # Like the change feed: start flushing in the worker, not in a preforking master
+        if self.shared is not None and self._pid != os.getpid():
+            with self._start_lock:
+                if self._pid != os.getpid():
+                    self.shared.start(self.snapshot)
+                    self._pid = os.getpid()
+
+    def snapshot(self):
+        """Every registered metric's samples, in the form SharedSnapshots stores"""
+        return {
+            metric.name: {
+                'type': metric.metric_type,
+                'mode': metric.multiprocess_mode,
+                'samples': [[list(labels), value] for labels, value in metric.samples()]
+            }
+            for metric in self.registry
+        }
+
+    def _before_request(self):
+        self._ensure_started()
+        g._metrics_start = time.perf_counter()
+        g._metrics_queries = 0
+        g._metrics_db_time = 0.0
+
+    def _after_request(self, response):
+        start = g.pop('_metrics_start', None)
+        if start is None or request.endpoint == 'metrics':
+            return response
+
+        endpoint = request.endpoint or 'unmatched'
+        self.request_duration.observe(time.perf_counter() - start, endpoint, request.method, str(response.status_code))
+        self.request_queries.observe(g.pop('_metrics_queries', 0), endpoint)
+        self.request_db_time.observe(g.pop('_metrics_db_time', 0.0), endpoint)
+        return response
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('_metrics_query_start', []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self._ensure_started()
+        elapsed = time.perf_counter() - conn.info['_metrics_query_start'].pop()
+        self.db_queries.inc()
+        self.db_time.inc(amount=elapsed)
+        if has_request_context() and '_metrics_queries' in g:
+            g._metrics_queries += 1
+            g._metrics_db_time += elapsed
+
+    def _handle_error(self, exception_context):
+        # after_cursor_execute does not run for a statement that raised; drop its start time
+        # so the stack stays balanced for the next statement on this connection
+        connection = exception_context.connection
+        if connection is not None and exception_context.execution_context is not None:
+            starts = connection.info.get('_metrics_query_start')
+            if starts:
+                starts.pop()
+
+    def expose(self):
+        """Render every registered metric in Prometheus text format, summed over workers if shared"""
+        lines = []
+        if self.shared is None:
+            for metric in self.registry:
+                lines.extend(metric.expose())
+        else:
+            self._ensure_started()
+            self.shared.write(self.snapshot())
+            aggregate = {}
+            for snapshot in self.shared.collect():
+                for name, metric in snapshot.items():
+                    aggregate[name] = merge_snapshot(aggregate.get(name), metric)
+            for metric in self.registry:
+                samples = aggregate.get(metric.name, {}).get('samples', [])
+                lines.extend(metric.expose([(tuple(labels), value) for labels, value in samples]))
+        return Response('\n'.join(lines) + '\n', mimetype='text/plain; version=0.0.4')
+
+
+metrics = Metrics()
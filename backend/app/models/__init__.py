@@ -1,5 +1,10 @@
 from .user import User
-from .category import Category
-from .feature import Feature, Priority, TShirtSize
+from .category import Category, CATEGORY_SERIALIZER
+from .feature import Feature, Priority, TShirtSize, release_month, format_release_month, FEATURE_SERIALIZER
+from .workspace import WorkspaceVersion
+from .id_counter import IdCounter
+from .tombstone import Tombstone
+from . import search
 
-__all__ = ['User', 'Category', 'Feature', 'Priority', 'TShirtSize']
+__all__ = ['User', 'Category', 'Feature', 'Priority', 'TShirtSize', 'WorkspaceVersion', 'IdCounter', 'Tombstone',
+           'release_month', 'format_release_month', 'FEATURE_SERIALIZER', 'CATEGORY_SERIALIZER']
@@ -1,28 +1,48 @@
 from datetime import datetime
 from app import db
+from app.serializers import RowSerializer
 
 class Category(db.Model):
     """Category model for organizing features"""
     __tablename__ = 'categories'
+    __table_args__ = (
+        db.Index('ix_categories_created_at_id', 'created_at', 'id'),
+        db.Index('ix_categories_updated_at_id', 'updated_at', 'id'),
+    )
 
     id = db.Column(db.String(50), primary_key=True)
     name = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text, nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    next_feature_seq = db.Column(db.Integer, nullable=False, default=1, server_default='1')
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')  # bumped by every update
 
     # Relationship to features
-    features = db.relationship('Feature', backref='category', lazy='dynamic', cascade='all, delete-orphan')
+    # passive_deletes: the ON DELETE CASCADE foreign key removes features, so
+    # deleting a category never loads them into the session
+    features = db.relationship('Feature', backref='category', lazy='dynamic', cascade='all, delete-orphan',
+                               passive_deletes=True)
 
-    def to_dict(self, include_features=True):
-        """Convert category to dictionary"""
-        result = {
-            'id': self.id,
-            'name': self.name,
-            'description': self.description
-        }
+    def to_dict(self, include_features=True, features=None):
+        """Convert category to dictionary
+
+        ``features`` may be passed in as already serialized dicts when the
+        caller has loaded them (see ``CategoryService.get_category_tree``),
+        which avoids a query per category on the dynamic relationship.
+        """
+        result = CATEGORY_SERIALIZER.from_object(self)
 
         if include_features:
-            result['features'] = [f.to_dict() for f in self.features.all()]
+            if features is None:
+                features = [f.to_dict() for f in self.features.all()]
+            result['features'] = features
 
         return result
+
+CATEGORY_SERIALIZER = RowSerializer([
+    ('id', Category.id),
+    ('name', Category.name),
+    ('description', Category.description),
+    ('version', Category.version),
+])
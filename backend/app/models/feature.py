@@ -1,6 +1,8 @@
 from datetime import datetime
 import enum
+from sqlalchemy.orm import validates
 from app import db
+from app.serializers import RowSerializer, enum_value
 
 class Priority(str, enum.Enum):
     """Priority levels for features"""
@@ -16,9 +18,38 @@ class TShirtSize(str, enum.Enum):
     L = 'L'
     XL = 'XL'
 
+def release_month(release_date):
+    """Convert a YYYY-MM release date to an integer month (year * 12 + month)
+
+    Returns None for empty or malformed dates.
+    """
+    if not release_date or len(release_date) != 7 or release_date[4] != '-':
+        return None
+    try:
+        year, month = int(release_date[:4]), int(release_date[5:])
+    except ValueError:
+        return None
+    if not 1 <= month <= 12:
+        return None
+    return year * 12 + month
+
+def format_release_month(value):
+    """Convert an integer month back to YYYY-MM"""
+    year, month = divmod(value - 1, 12)
+    return f'{year:04d}-{month + 1:02d}'
+
 class Feature(db.Model):
     """Feature model with full PRD metadata"""
     __tablename__ = 'features'
+    __table_args__ = (
+        db.Index('ix_features_created_at_id', 'created_at', 'id'),
+        db.Index('ix_features_category_id_created_at_id', 'category_id', 'created_at', 'id'),
+        db.Index('ix_features_category_id_priority', 'category_id', 'priority'),
+        db.Index('ix_features_signoff_complexity', 'engineering_signoff', 'engineering_complexity'),
+        db.Index('ix_features_priority', 'priority'),
+        db.Index('ix_features_customer_name', 'customer_name'),
+        db.Index('ix_features_updated_at_id', 'updated_at', 'id'),
+    )
 
     id = db.Column(db.String(50), primary_key=True)
     category_id = db.Column(db.String(50), db.ForeignKey('categories.id', ondelete='CASCADE'), nullable=False, index=True)
@@ -31,20 +62,30 @@ class Feature(db.Model):
     engineering_signoff = db.Column(db.Boolean, default=False, nullable=False)
     engineering_complexity = db.Column(db.Enum(TShirtSize), nullable=False, default=TShirtSize.M)
     release_date = db.Column(db.String(7), nullable=True)  # YYYY-MM format
+    release_month = db.Column(db.Integer, nullable=True, index=True)  # year * 12 + month, derived from release_date
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')  # bumped by every update
+
+    @validates('release_date')
+    def _sync_release_month(self, key, value):
+        self.release_month = release_month(value)
+        return value
 
     def to_dict(self):
         """Convert feature to dictionary"""
-        return {
-            'id': self.id,
-            'title': self.title,
-            'priority': self.priority.value,
-            'description': self.description,
-            'kpi': self.kpi,
-            'customerName': self.customer_name,
-            'engineeringComment': self.engineering_comment,
-            'engineeringSignoff': self.engineering_signoff,
-            'engineeringComplexity': self.engineering_complexity.value,
-            'releaseDate': self.release_date
-        }
+        return FEATURE_SERIALIZER.from_object(self)
+
+FEATURE_SERIALIZER = RowSerializer([
+    ('id', Feature.id),
+    ('title', Feature.title),
+    ('priority', Feature.priority, enum_value),
+    ('description', Feature.description),
+    ('kpi', Feature.kpi),
+    ('customerName', Feature.customer_name),
+    ('engineeringComment', Feature.engineering_comment),
+    ('engineeringSignoff', Feature.engineering_signoff),
+    ('engineeringComplexity', Feature.engineering_complexity, enum_value),
+    ('releaseDate', Feature.release_date),
+    ('version', Feature.version),
+])
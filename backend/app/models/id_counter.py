@@ -0,0 +1,20 @@
+from sqlalchemy import event
+from app import db
+
+CATEGORY_COUNTER = 'category'
+
+class IdCounter(db.Model):
+    """Named counter used to allocate sequential IDs"""
+    __tablename__ = 'id_counters'
+
+    name = db.Column(db.String(50), primary_key=True)
+    next_value = db.Column(db.Integer, nullable=False, default=1)
+
+
+@event.listens_for(IdCounter.__table__, 'after_create')
+def seed_counters(target, connection, **kw):
+    """Seed the counter rows for databases created with ``db.create_all()``
+
+    The Alembic migration seeds them from the existing IDs instead.
+    """
+    connection.execute(target.insert().values(name=CATEGORY_COUNTER, next_value=1))
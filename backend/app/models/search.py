@@ -0,0 +1,72 @@
+"""Full-text index DDL for features
+
+SQLite gets an external-content FTS5 table kept in sync by triggers;
+PostgreSQL gets a generated ``tsvector`` column with a GIN index. Both stay
+in sync with every write to ``features``, including bulk statements that
+bypass the ORM. The same statements are issued by the Alembic migration;
+the listeners below cover databases created with ``db.create_all()``.
+
+FTS5 addresses content rows by an integer key, but ``features`` has a
+string primary key and its implicit rowid may be renumbered by VACUUM.
+Each feature is therefore given a key in ``features_fts_keys`` (an
+INTEGER PRIMARY KEY, so it never changes) and the index reads its
+content through the ``features_fts_content`` view keyed on it.
+"""
+from sqlalchemy import DDL, event
+from app.models.feature import Feature
+
+SQLITE_FTS_DDL = [
+    """CREATE TABLE IF NOT EXISTS features_fts_keys (
+        key INTEGER PRIMARY KEY,
+        feature_id VARCHAR(50) NOT NULL UNIQUE
+    )""",
+    """CREATE VIEW IF NOT EXISTS features_fts_content AS
+        SELECT keys.key, features.title, features.description, features.kpi, features.engineering_comment
+        FROM features_fts_keys AS keys JOIN features ON features.id = keys.feature_id""",
+    """CREATE VIRTUAL TABLE IF NOT EXISTS features_fts USING fts5(
+        title, description, kpi, engineering_comment,
+        content='features_fts_content', content_rowid='key'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS features_fts_ai AFTER INSERT ON features BEGIN
+        INSERT INTO features_fts_keys(feature_id) VALUES (new.id);
+        INSERT INTO features_fts(rowid, title, description, kpi, engineering_comment)
+        SELECT key, new.title, new.description, new.kpi, new.engineering_comment
+        FROM features_fts_keys WHERE feature_id = new.id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS features_fts_ad AFTER DELETE ON features BEGIN
+        INSERT INTO features_fts(features_fts, rowid, title, description, kpi, engineering_comment)
+        SELECT 'delete', key, old.title, old.description, old.kpi, old.engineering_comment
+        FROM features_fts_keys WHERE feature_id = old.id;
+        DELETE FROM features_fts_keys WHERE feature_id = old.id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS features_fts_au AFTER UPDATE ON features BEGIN
+        INSERT INTO features_fts(features_fts, rowid, title, description, kpi, engineering_comment)
+        SELECT 'delete', key, old.title, old.description, old.kpi, old.engineering_comment
+        FROM features_fts_keys WHERE feature_id = old.id;
+        UPDATE features_fts_keys SET feature_id = new.id WHERE feature_id = old.id;
+        INSERT INTO features_fts(rowid, title, description, kpi, engineering_comment)
+        SELECT key, new.title, new.description, new.kpi, new.engineering_comment
+        FROM features_fts_keys WHERE feature_id = new.id;
+    END""",
+]
+
+POSTGRES_FTS_DDL = [
+    """ALTER TABLE features ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(description, '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(kpi, '')), 'C') ||
+            setweight(to_tsvector('english', coalesce(engineering_comment, '')), 'C')
+        ) STORED""",
+    "CREATE INDEX IF NOT EXISTS ix_features_search_vector ON features USING GIN (search_vector)",
+]
+
+for statement in SQLITE_FTS_DDL:
+    event.listen(Feature.__table__, 'after_create', DDL(statement).execute_if(dialect='sqlite'))
+
+for statement in POSTGRES_FTS_DDL:
+    event.listen(Feature.__table__, 'after_create', DDL(statement).execute_if(dialect='postgresql'))
+
+for statement in ['DROP TABLE IF EXISTS features_fts', 'DROP VIEW IF EXISTS features_fts_content',
+                  'DROP TABLE IF EXISTS features_fts_keys']:
+    event.listen(Feature.__table__, 'before_drop', DDL(statement).execute_if(dialect='sqlite'))
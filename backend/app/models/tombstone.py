@@ -0,0 +1,15 @@
+from datetime import datetime
+from app import db
+
+class Tombstone(db.Model):
+    """Record of a deleted category or feature, read by delta sync"""
+    __tablename__ = 'tombstones'
+    __table_args__ = (
+        db.Index('ix_tombstones_deleted_at', 'deleted_at'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    entity = db.Column(db.String(20), nullable=False)  # 'category' or 'feature'
+    entity_id = db.Column(db.String(50), nullable=False)
+    category_id = db.Column(db.String(50), nullable=True)
+    deleted_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
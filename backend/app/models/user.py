@@ -1,6 +1,6 @@
 from datetime import datetime
-from werkzeug.security import generate_password_hash, check_password_hash
 from app import db
+from app.passwords import password_hasher
 
 class User(db.Model):
     """User model for authentication"""
@@ -14,12 +14,16 @@ class User(db.Model):
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     def set_password(self, password):
-        """Hash and set password"""
-        self.password_hash = generate_password_hash(password)
+        """Hash and set password (on the bounded hashing pool)"""
+        self.password_hash = password_hasher.hash(password)
 
     def check_password(self, password):
-        """Check if password matches hash"""
-        return check_password_hash(self.password_hash, password)
+        """Check if password matches hash (on the bounded hashing pool)"""
+        return password_hasher.verify(self.password_hash, password)
+
+    def password_needs_rehash(self):
+        """Check if the stored hash uses outdated parameters"""
+        return password_hasher.needs_rehash(self.password_hash)
 
     def to_dict(self):
         """Convert user to dictionary"""
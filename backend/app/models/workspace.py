@@ -0,0 +1,8 @@
+from app import db
+
+class WorkspaceVersion(db.Model):
+    """Single-row counter bumped on every category/feature write"""
+    __tablename__ = 'workspace_version'
+
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False, default=0)
@@ -0,0 +1,191 @@
+"""Bounded, host-wide executor for password hashing
+
+werkzeug's KDFs are deliberately slow, so hashes run on a small thread
+pool instead of the request thread, and admission is counted across all
+processes on the host (gunicorn's sync workers serve one request per
+process, so a per-process limit would never trigger). Slots are
+``flock``-ed files in a shared directory; the kernel releases them when a
+process exits, so a crashed worker cannot leak one:
+
+- at most ``workers`` hashes run at once on the host;
+- at most ``max_queue`` further requests are admitted and wait, blocked on
+  a slot lock; a request gives up if its result is not ready within
+  ``timeout`` seconds;
+- anything beyond that is rejected at once with PasswordHasherBusy so the
+  route can answer 503 and the worker is free for other requests.
+"""
+import fcntl
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS, generate_password_hash, check_password_hash
+
+from app.metrics import CallbackMetric, Counter, Histogram
+
+HASH_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when every hashing slot on the host is taken or the wait is too long"""
+
+
+def hash_parameters(method):
+    """The parameter prefix werkzeug stores for a method, e.g. 'scrypt' -> 'scrypt:32768:8:1'"""
+    name, *args = method.split(':')
+    if name == 'scrypt':
+        n, r, p = args or (2 ** 15, 8, 1)
+        return f'scrypt:{n}:{r}:{p}'
+    if name == 'pbkdf2':
+        hash_name = args[0] if args else 'sha256'
+        iterations = args[1] if len(args) > 1 else DEFAULT_PBKDF2_ITERATIONS
+        return f'pbkdf2:{hash_name}:{iterations}'
+    return method
+
+
+class SlotPool:
+    """Counting semaphore shared by every process on the host"""
+
+    def __init__(self, directory, name, size):
+        os.makedirs(directory, exist_ok=True)
+        self.paths = [os.path.join(directory, f'{name}-{index}.lock') for index in range(size)]
+
+    def try_acquire(self):
+        """Take a free slot without blocking; returns (index, file descriptor) or None"""
+        # Random order spreads contention instead of every caller racing for slot 0
+        for index in random.sample(range(len(self.paths)), len(self.paths)):
+            fd = os.open(self.paths[index], os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return index, fd
+            except BlockingIOError:
+                os.close(fd)
+        return None
+
+    def acquire(self, index):
+        """Block until slot ``index`` (modulo the pool size) is free; returns its file descriptor"""
+        fd = os.open(self.paths[index % len(self.paths)], os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        except BaseException:
+            os.close(fd)
+            raise
+        return fd
+
+    def release(self, fd):
+        fcntl.flock(fd, fcntl.LOCK_UN)
+        os.close(fd)
+
+
+class PasswordHasher:
+    """Flask extension bounding concurrent password hashing across all workers"""
+
+    def __init__(self):
+        self.method = 'scrypt'
+        self.workers = min(4, os.cpu_count() or 1)
+        self.max_queue = 4
+        self.timeout = 2.0
+        self.running = None
+        self.admitted = None
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pid = None
+
+        self.latency = Histogram('password_hash_seconds', 'Password hash/verify latency including queueing',
+                                 ('operation',), HASH_BUCKETS)
+        self.rejections = Counter('password_hash_rejections_total', 'Hash requests rejected as overloaded',
+                                  ('reason',))
+
+    def init_app(self, app, metrics=None):
+        self.method = app.config.get('PASSWORD_HASH_METHOD', self.method)
+        self.workers = app.config.get('PASSWORD_HASH_WORKERS') or self.workers
+        self.max_queue = app.config.get('PASSWORD_HASH_MAX_QUEUE', self.max_queue)
+        self.timeout = app.config.get('PASSWORD_HASH_TIMEOUT', self.timeout)
+        self._pid = None
+
+        directory = app.config.get('PASSWORD_HASH_SLOT_DIR') or os.path.join(app.instance_path, 'password-slots')
+        self.running = SlotPool(directory, 'running', self.workers)
+        self.admitted = SlotPool(directory, 'admitted', self.workers + self.max_queue)
+
+        if metrics is not None:
+            self.latency = metrics.register(self.latency)
+            self.rejections = metrics.register(self.rejections)
+            metrics.register(CallbackMetric('password_hash_in_flight', 'Password hashes queued or running',
+                                            'gauge', lambda: [((), self._in_flight)]))
+
+        app.extensions['password_hasher'] = self
+
+    def _get_executor(self):
+        # Created lazily so the threads belong to the worker, not a preforking master.
+        # One thread per admission slot: admitted work never queues behind the pool.
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers + self.max_queue,
+                                                        thread_name_prefix='password-hash')
+                    self._pid = os.getpid()
+        return self._executor
+
+    def _work(self, ticket, abandoned, fn, args):
+        index, ticket_fd = ticket
+        try:
+            slot = self.running.try_acquire()
+            # Each admission slot waits on one running slot, so waiters spread across them
+            fd = slot[1] if slot is not None else self.running.acquire(index)
+            try:
+                if abandoned.is_set():
+                    return None
+                return fn(*args)
+            finally:
+                self.running.release(fd)
+        finally:
+            self.admitted.release(ticket_fd)
+
+    def _run(self, operation, fn, *args):
+        start = time.perf_counter()
+        with self._lock:
+            self._in_flight += 1
+        try:
+            ticket = self.admitted.try_acquire()
+            if ticket is None:
+                self.rejections.inc('queue_full')
+                raise PasswordHasherBusy('Too many concurrent password operations')
+
+            abandoned = threading.Event()
+            try:
+                future = self._get_executor().submit(self._work, ticket, abandoned, fn, args)
+            except BaseException:
+                self.admitted.release(ticket[1])
+                raise
+            try:
+                return future.result(timeout=self.timeout)
+            except FutureTimeout:
+                # The job still holds its admission slot until it leaves the pool, then skips the hash
+                abandoned.set()
+                self.rejections.inc('timeout')
+                raise PasswordHasherBusy('Password operation timed out') from None
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+            self.latency.observe(time.perf_counter() - start, operation)
+
+    def hash(self, password):
+        """Hash a password with the configured method"""
+        return self._run('hash', generate_password_hash, password, self.method)
+
+    def verify(self, password_hash, password):
+        """Check a password against a stored hash"""
+        return self._run('verify', check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        """True if the hash was made with a different method or parameters"""
+        return password_hash.split('$', 1)[0] != hash_parameters(self.method)
+
+    def queue_depth(self):
+        return self._in_flight
+
+
+password_hasher = PasswordHasher()
@@ -1,5 +1,11 @@
 from .auth import auth_bp
 from .categories import categories_bp
 from .features import features_bp
+from .roadmap import roadmap_bp
+from .export import export_bp
+from .imports import imports_bp
+from .system import system_bp
+from .events import events_bp
+from .sync import sync_bp
 
-__all__ = ['auth_bp', 'categories_bp', 'features_bp']
+__all__ = ['auth_bp', 'categories_bp', 'features_bp', 'roadmap_bp', 'export_bp', 'imports_bp', 'system_bp', 'events_bp', 'sync_bp']
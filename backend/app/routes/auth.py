@@ -1,7 +1,7 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
-from app.models import User
+from flask_jwt_extended import create_access_token, jwt_required, get_current_user as get_jwt_user
 from app.services import AuthService
+from app.passwords import PasswordHasherBusy
 
 auth_bp = Blueprint('auth', __name__)
 
@@ -25,6 +25,8 @@ def register():
             'message': 'User created successfully',
             'user': user.to_dict()
         }), 201
+    except PasswordHasherBusy as e:
+        return jsonify({'error': str(e)}), 503, {'Retry-After': '1'}
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -36,9 +38,12 @@ def login():
     if not data.get('username') or not data.get('password'):
         return jsonify({'error': 'Missing credentials'}), 400
 
-    user = AuthService.get_user_by_username(data['username'])
+    try:
+        user = AuthService.authenticate(data['username'], data['password'])
+    except PasswordHasherBusy as e:
+        return jsonify({'error': str(e)}), 503, {'Retry-After': '1'}
 
-    if not user or not user.check_password(data['password']):
+    if not user:
         return jsonify({'error': 'Invalid credentials'}), 401
 
     access_token = create_access_token(identity=str(user.id))
@@ -51,11 +56,9 @@ def login():
 @auth_bp.route('/me', methods=['GET'])
 @jwt_required()
 def get_current_user():
-    """Get current user information"""
-    user_id = get_jwt_identity()
-    user = AuthService.get_user_by_id(user_id)
-
-    if not user:
-        return jsonify({'error': 'User not found'}), 404
+    """Get current user information
 
-    return jsonify(user.to_dict()), 200
+    The user comes from the identity cache (see app.identity); a
+    token for a deleted user is rejected with 401 before reaching here.
+    """
+    return jsonify(get_jwt_user()), 200
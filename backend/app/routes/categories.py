@@ -1,16 +1,47 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, g
 from flask_jwt_extended import jwt_required
+from app.cache import response_cache
+from app.models import FEATURE_SERIALIZER, CATEGORY_SERIALIZER
 from app.services import CategoryService
+from app.utils import parse_page_args, parse_fields, parse_version, VersionConflict, VersionRequired
+from app.routes.decorators import conditional_get
 
 categories_bp = Blueprint('categories', __name__)
 
+def tree_resource(limit, cursor, feature_serializer, category_serializer):
+    """Response cache key for one page of the category tree"""
+    return (f'categories?limit={limit}&cursor={cursor}'
+            f'&fields={",".join(feature_serializer.keys)}&categoryFields={",".join(category_serializer.keys)}')
+
 @categories_bp.route('/categories', methods=['GET'])
 @jwt_required()
+@conditional_get
 def get_categories():
-    """Get all categories with their features"""
+    """Get all categories with their features
+
+    Pass ``limit`` (and the ``X-Next-Cursor`` value of the previous response
+    as ``cursor``) to page through large workspaces. ``fields`` and
+    ``categoryFields`` (comma-separated keys) limit what is loaded and
+    returned for each feature and category; ``id`` is always included.
+    """
     try:
-        categories = CategoryService.get_all_categories()
-        return jsonify([category.to_dict() for category in categories]), 200
+        limit, cursor = parse_page_args(request.args)
+        feature_serializer = parse_fields(request.args, FEATURE_SERIALIZER)
+        category_serializer = parse_fields(request.args, CATEGORY_SERIALIZER, 'categoryFields')
+
+        def build():
+            categories, next_cursor = CategoryService.get_category_tree(
+                limit, cursor, feature_serializer, category_serializer
+            )
+            response = jsonify(categories)
+            if next_cursor:
+                response.headers['X-Next-Cursor'] = next_cursor
+            return response
+
+        resource = tree_resource(limit, cursor, feature_serializer, category_serializer)
+        return response_cache.cached_response(resource, g.workspace_version, build), 200
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -34,39 +65,69 @@ def create_category():
 
 @categories_bp.route('/categories/<string:category_id>', methods=['GET'])
 @jwt_required()
+@conditional_get
 def get_category(category_id):
     """Get a specific category"""
     try:
-        category = CategoryService.get_category_by_id(category_id)
-        if not category:
-            return jsonify({'error': 'Category not found'}), 404
+        def build():
+            category = CategoryService.get_category_by_id(category_id)
+            if not category:
+                return jsonify({'error': 'Category not found'}), 404
+            return jsonify(category.to_dict())
 
-        return jsonify(category.to_dict()), 200
+        return response_cache.cached_response(f'category:{category_id}', g.workspace_version, build)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @categories_bp.route('/categories/<string:category_id>', methods=['PUT'])
 @jwt_required()
 def update_category(category_id):
-    """Update a category"""
+    """Update a category, overwriting concurrent changes (prefer PATCH)"""
     data = request.get_json()
 
     try:
-        category = CategoryService.update_category(
-            category_id,
-            name=data.get('name'),
-            description=data.get('description')
-        )
-        return jsonify(category.to_dict(include_features=False)), 200
+        category = CategoryService.update_category(category_id, data)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+    if category is None:
+        return jsonify({'error': 'Category not found'}), 404
+    return jsonify(category), 200
+
+@categories_bp.route('/categories/<string:category_id>', methods=['PATCH'])
+@jwt_required()
+def patch_category(category_id):
+    """Update a category's name or description if it is still at ``version``
+
+    Returns 409 with the current category when it was updated since, and
+    428 when no ``version`` is sent.
+    """
+    data = request.get_json()
+
+    try:
+        category = CategoryService.update_category(category_id, data, parse_version(data.get('version')))
+    except VersionConflict as e:
+        return jsonify({'error': str(e), 'current': e.current}), 409
+    except VersionRequired as e:
+        return jsonify({'error': str(e)}), 428
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+    if category is None:
+        return jsonify({'error': 'Category not found'}), 404
+    return jsonify(category), 200
+
 @categories_bp.route('/categories/<string:category_id>', methods=['DELETE'])
 @jwt_required()
 def delete_category(category_id):
     """Delete a category and all its features"""
     try:
-        CategoryService.delete_category(category_id)
+        if not CategoryService.delete_category(category_id):
+            return jsonify({'error': 'Category not found'}), 404
         return jsonify({'message': 'Category deleted successfully'}), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
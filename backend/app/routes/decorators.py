@@ -0,0 +1,31 @@
+from functools import wraps
+from flask import g, request, make_response
+from app.services import WorkspaceService
+
+def conditional_get(view):
+    """Answer If-None-Match with 304 using the workspace version as ETag
+
+    The version is read before the view runs, so a write racing with the
+    request can only make the ETag older than the body, never newer; the
+    client then simply re-fetches on its next request.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        version = WorkspaceService.get_version()
+        # Replica reads later in this request must be at least this fresh
+        g.workspace_version = version
+        etag = str(version)
+
+        # Weak comparison: compressed responses carry W/ ETags
+        if request.if_none_match.contains_weak(etag):
+            response = make_response('', 304)
+        else:
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response
+
+    return wrapper
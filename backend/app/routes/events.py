@@ -0,0 +1,59 @@
+import threading
+from flask import Blueprint, Response, current_app, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.events import change_feed, opening_frames, issue_stream_ticket, verify_stream_ticket, HEARTBEAT_FRAME
+from app.services import AuthService, WorkspaceService
+
+events_bp = Blueprint('events', __name__)
+
+EVENT_STREAM_HEADERS = {'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+
+@events_bp.route('/events/ticket', methods=['POST'])
+@jwt_required()
+def create_stream_ticket():
+    """Trade the access token for a short-lived ticket to open /events with"""
+    return jsonify({
+        'ticket': issue_stream_ticket(get_jwt_identity()),
+        'expiresIn': current_app.config.get('EVENTS_TICKET_TTL', 30)
+    })
+
+@events_bp.route('/events', methods=['GET'])
+def stream_events():
+    """Stream change events (entity, id, op, version) as Server-Sent Events
+
+    EventSource cannot send headers, so the stream is opened with
+    ``?ticket=`` from POST /events/ticket. Here each open stream holds a
+    worker thread; the ASGI server (asgi.py) serves the same stream without one.
+    """
+    user_id = verify_stream_ticket(request.args.get('ticket', ''))
+    if user_id is None:
+        return jsonify({'error': 'Invalid or expired stream ticket'}), 401
+    if AuthService.get_user_by_id(user_id) is None:
+        return jsonify({'error': 'User not found'}), 401
+
+    if not request.environ.get('wsgi.multithread'):
+        return jsonify({'error': 'Event streams need threaded workers or the ASGI server'}), 503
+
+    wakeup = threading.Event()
+    subscription = change_feed.subscribe(wakeup.set)
+    if subscription is None:
+        return jsonify({'error': 'Too many event stream subscribers'}), 503
+
+    # Read after subscribing so no change falls between the two
+    version = WorkspaceService.get_version()
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('lastEventId')
+    heartbeat = change_feed.heartbeat
+
+    def generate():
+        try:
+            yield b''.join(opening_frames(version, last_event_id))
+            while True:
+                if not wakeup.wait(heartbeat):
+                    yield HEARTBEAT_FRAME
+                    continue
+                wakeup.clear()
+                yield b''.join(subscription.drain())
+        finally:
+            change_feed.unsubscribe(subscription)
+
+    return Response(generate(), mimetype='text/event-stream', headers=EVENT_STREAM_HEADERS)
@@ -0,0 +1,24 @@
+from flask import Blueprint, Response, current_app, request, jsonify, stream_with_context
+from flask_jwt_extended import jwt_required
+from app.services import ExportService
+
+export_bp = Blueprint('export', __name__)
+
+@export_bp.route('/export/features', methods=['GET'])
+@jwt_required()
+def export_features():
+    """Stream every feature as NDJSON (default) or CSV"""
+    export_format = request.args.get('format', 'ndjson')
+
+    if export_format == 'ndjson':
+        chunks = ExportService.iter_ndjson(current_app.json.dumps)
+        mimetype = 'application/x-ndjson'
+    elif export_format == 'csv':
+        chunks = ExportService.iter_csv()
+        mimetype = 'text/csv'
+    else:
+        return jsonify({'error': 'format must be ndjson or csv'}), 400
+
+    response = Response(stream_with_context(chunks), mimetype=mimetype)
+    response.headers['Content-Disposition'] = f'attachment; filename=features.{export_format}'
+    return response
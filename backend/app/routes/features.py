@@ -1,16 +1,67 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required
-from app.services import FeatureService
+from app.services import FeatureService, SearchService
+from app.services.search_service import MAX_SEARCH_RESULTS
+from app.services.feature_service import FACET_COLUMNS
+from app.models import Priority, TShirtSize, FEATURE_SERIALIZER
+from app.utils import DEFAULT_PAGE_SIZE, parse_page_args, parse_fields, parse_version, VersionConflict, VersionRequired
+from app.routes.decorators import conditional_get
 
 features_bp = Blueprint('features', __name__)
 
+def parse_search_args(args):
+    """Read ``q``, ``limit`` and ``cursor`` for a search; raises ValueError"""
+    query = args.get('q', '').strip()
+    if not query:
+        raise ValueError('q is required')
+
+    try:
+        limit = min(int(args.get('limit', 20)), MAX_SEARCH_RESULTS)
+        offset = int(args.get('cursor', 0))
+        if limit < 1 or offset < 0:
+            raise ValueError
+    except ValueError:
+        raise ValueError('Invalid limit or cursor')
+
+    return query, limit, offset
+
+def parse_facet_filters(args):
+    """Read repeatable facet filters from request args; raises ValueError"""
+    filters = {}
+    for name in FACET_COLUMNS:
+        values = args.getlist(name)
+        if name == 'engineeringSignoff':
+            if any(value not in ('true', 'false') for value in values):
+                raise ValueError('engineeringSignoff must be true or false')
+            values = [value == 'true' for value in values]
+        elif name == 'priority':
+            values = [Priority(value) for value in values]
+        elif name == 'engineeringComplexity':
+            values = [TShirtSize(value) for value in values]
+        filters[name] = values
+    return filters
+
 @features_bp.route('/categories/<string:category_id>/features', methods=['GET'])
 @jwt_required()
+@conditional_get
 def get_features(category_id):
-    """Get all features for a category"""
+    """Get the features of a category, a page at a time
+
+    Supports the same ``limit``/``cursor`` pagination and ``fields`` sparse
+    fieldsets as the category listing, but always paginates: without
+    ``limit`` a page holds DEFAULT_PAGE_SIZE features.
+    """
     try:
-        features = FeatureService.get_features_by_category(category_id)
-        return jsonify([feature.to_dict() for feature in features]), 200
+        limit, cursor = parse_page_args(request.args, DEFAULT_PAGE_SIZE)
+        serializer = parse_fields(request.args, FEATURE_SERIALIZER)
+        features, next_cursor = FeatureService.get_features_page(category_id, limit, cursor, serializer)
+
+        response = jsonify([serializer.from_object(feature) for feature in features])
+        if next_cursor:
+            response.headers['X-Next-Cursor'] = next_cursor
+        return response, 200
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -43,15 +94,46 @@ def create_feature(category_id):
 @features_bp.route('/features/<string:feature_id>', methods=['PUT'])
 @jwt_required()
 def update_feature(feature_id):
-    """Update a feature"""
+    """Update a feature, overwriting concurrent changes (prefer PATCH)"""
+    data = request.get_json()
+
+    try:
+        feature = FeatureService.update_feature(feature_id, data)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+    if feature is None:
+        return jsonify({'error': 'Feature not found'}), 404
+    return jsonify(feature), 200
+
+@features_bp.route('/features/<string:feature_id>', methods=['PATCH'])
+@jwt_required()
+def patch_feature(feature_id):
+    """Update some fields of a feature if it is still at ``version``
+
+    The body holds the fields to change and the ``version`` the client last
+    read. If the feature was updated since, nothing is written and 409 is
+    returned with the current feature; without a ``version`` it is 428.
+    """
     data = request.get_json()
 
     try:
-        feature = FeatureService.update_feature(feature_id, **data)
-        return jsonify(feature.to_dict()), 200
+        feature = FeatureService.update_feature(feature_id, data, parse_version(data.get('version')))
+    except VersionConflict as e:
+        return jsonify({'error': str(e), 'current': e.current}), 409
+    except VersionRequired as e:
+        return jsonify({'error': str(e)}), 428
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+    if feature is None:
+        return jsonify({'error': 'Feature not found'}), 404
+    return jsonify(feature), 200
+
 @features_bp.route('/features/<string:feature_id>', methods=['DELETE'])
 @jwt_required()
 def delete_feature(feature_id):
@@ -61,3 +143,98 @@ def delete_feature(feature_id):
         return jsonify({'message': 'Feature deleted successfully'}), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
+
+@features_bp.route('/features', methods=['DELETE'])
+@jwt_required()
+def delete_features():
+    """Delete every feature matching the filters of ``GET /api/features``
+
+    At least one filter is required. Returns how many features were deleted.
+    """
+    try:
+        deleted = FeatureService.delete_features(parse_facet_filters(request.args))
+        return jsonify({'deleted': deleted}), 200
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@features_bp.route('/features:batch', methods=['POST'])
+@jwt_required()
+def batch_features():
+    """Apply mixed create/update/delete feature operations in one transaction
+
+    Every operation is validated first; if any is invalid nothing is written
+    and the per-item errors are returned.
+    """
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({'error': 'Request body must be a JSON object'}), 400
+
+    plan, errors = FeatureService.validate_batch(data.get('operations'))
+    if errors:
+        return jsonify({'error': 'Invalid operations', 'errors': errors}), 400
+
+    try:
+        results = FeatureService.apply_batch(plan)
+        return jsonify({'results': results}), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@features_bp.route('/features/search', methods=['GET'])
+@jwt_required()
+@conditional_get
+def search_features():
+    """Full-text search over features, most relevant first
+
+    ``q`` is free text; ``limit``, ``cursor`` and ``fields`` work like on
+    the listing endpoints.
+    """
+    try:
+        query, limit, offset = parse_search_args(request.args)
+        serializer = parse_fields(request.args, FEATURE_SERIALIZER)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    try:
+        features, has_more = SearchService.search_features(query, limit, offset, serializer)
+
+        response = jsonify([
+            {**serializer.from_object(feature), 'categoryId': feature.category_id} for feature in features
+        ])
+        if has_more:
+            response.headers['X-Next-Cursor'] = str(offset + limit)
+        return response, 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@features_bp.route('/features', methods=['GET'])
+@jwt_required()
+@conditional_get
+def query_features():
+    """Filter features across categories and return facet counts
+
+    Filters are repeatable query parameters: ``categoryId``, ``priority``,
+    ``engineeringComplexity``, ``engineeringSignoff`` and ``customerName``.
+    Supports the same ``limit``/``cursor`` pagination and ``fields`` sparse
+    fieldsets as the listings; pages hold DEFAULT_PAGE_SIZE features unless
+    ``limit`` says otherwise.
+    """
+    try:
+        limit, cursor = parse_page_args(request.args, DEFAULT_PAGE_SIZE)
+        serializer = parse_fields(request.args, FEATURE_SERIALIZER)
+
+        filters = parse_facet_filters(request.args)
+        features, next_cursor, facets = FeatureService.query_features(filters, limit, cursor, serializer)
+
+        response = jsonify({
+            'features': [{**serializer.from_object(feature), 'categoryId': feature.category_id} for feature in features],
+            'facets': facets
+        })
+        if next_cursor:
+            response.headers['X-Next-Cursor'] = next_cursor
+        return response, 200
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
@@ -0,0 +1,33 @@
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required
+from app.services import ImportService
+
+imports_bp = Blueprint('imports', __name__)
+
+@imports_bp.route('/import', methods=['POST'])
+@jwt_required()
+def import_features():
+    """Bulk import features from a CSV or NDJSON upload
+
+    Accepts either a multipart ``file`` field or a raw request body. The
+    format comes from ``?format=`` or the content type.
+    """
+    import_format = request.args.get('format')
+
+    if 'file' in request.files:
+        upload = request.files['file']
+        stream = upload.stream
+        if import_format is None and upload.filename:
+            import_format = 'csv' if upload.filename.endswith('.csv') else 'ndjson'
+    else:
+        stream = request.stream
+        if import_format is None:
+            import_format = 'csv' if request.mimetype == 'text/csv' else 'ndjson'
+
+    try:
+        summary = ImportService.import_features(stream, import_format)
+        return jsonify(summary), 200
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
@@ -0,0 +1,27 @@
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required
+from app.models import FEATURE_SERIALIZER
+from app.services import RoadmapService
+from app.utils import parse_fields
+from app.routes.decorators import conditional_get
+
+roadmap_bp = Blueprint('roadmap', __name__)
+
+@roadmap_bp.route('/roadmap', methods=['GET'])
+@jwt_required()
+@conditional_get
+def get_roadmap():
+    """Get features grouped by release month and category
+
+    Optional ``from`` and ``to`` bound the range (inclusive, YYYY-MM);
+    ``fields`` limits the feature keys like on the listing endpoints.
+    """
+    try:
+        start = RoadmapService.parse_month(request.args.get('from'))
+        end = RoadmapService.parse_month(request.args.get('to'))
+        serializer = parse_fields(request.args, FEATURE_SERIALIZER)
+        return jsonify(RoadmapService.get_roadmap(start, end, serializer)), 200
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
@@ -0,0 +1,23 @@
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required
+from app.services import SyncService
+from app.routes.decorators import conditional_get
+
+sync_bp = Blueprint('sync', __name__)
+
+@sync_bp.route('/sync', methods=['GET'])
+@jwt_required()
+@conditional_get
+def sync():
+    """Get categories and features changed since ``since``
+
+    Pass the ``cursor`` of the previous response as ``since``. Without it,
+    or when ``reset`` is true in the response, the payload is the complete
+    state rather than a delta. Deleted IDs are listed under ``deleted``.
+    """
+    try:
+        return jsonify(SyncService.get_changes(request.args.get('since') or None)), 200
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
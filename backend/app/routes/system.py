@@ -0,0 +1,15 @@
+from flask import Blueprint, jsonify
+from flask_jwt_extended import jwt_required
+from app.cache import response_cache
+from app.identity import identity_cache
+
+system_bp = Blueprint('system', __name__)
+
+@system_bp.route('/cache/stats', methods=['GET'])
+@jwt_required()
+def get_cache_stats():
+    """Get cache hit/miss/eviction counters for this worker"""
+    return jsonify({
+        'response': response_cache.stats(),
+        'identity': identity_cache.stats()
+    }), 200
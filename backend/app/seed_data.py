@@ -1,5 +1,7 @@
 from app import create_app, db
 from app.models import Category, Feature, Priority, TShirtSize
+from app.services import WorkspaceService, IdService
+from app.cache import response_cache
 
 def seed_database():
     """Seed database with initial categories and features from the original React app"""
@@ -197,7 +199,11 @@ def seed_database():
     db.session.add_all(features_6)
 
     # Commit all data
+    db.session.flush()
+    IdService.resync()
+    WorkspaceService.bump_version()
     db.session.commit()
+    response_cache.clear()
 
     print(f'Database seeded successfully!')
     print(f'- Created 6 categories')
@@ -0,0 +1,101 @@
+"""Precompiled row serializers and the fast JSON provider
+
+A ``RowSerializer`` is built once per model from a list of
+``(key, column)`` pairs. It generates two small functions at import time,
+one reading attributes from an ORM object and one reading positions from a
+row tuple, so the per-row cost is a single dict literal with no key mapping
+or attribute lookups by name.
+"""
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy.orm import load_only
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+
+def enum_value(value):
+    """Serialize an Enum column value"""
+    return value.value if value is not None else None
+
+
+class RowSerializer:
+    """Map model columns to camelCase keys once, then encode rows cheaply"""
+
+    def __init__(self, fields):
+        # fields: list of (key, column) or (key, column, converter)
+        self.fields = tuple(fields)
+        self._subsets = {}
+        self.keys = tuple(field[0] for field in fields)
+        self.columns = tuple(field[1] for field in fields)
+        converters = [field[2] if len(field) > 2 else None for field in fields]
+
+        namespace = {f'convert_{i}': convert for i, convert in enumerate(converters) if convert}
+
+        def expression(i, source):
+            return f'convert_{i}({source})' if converters[i] else source
+
+        object_items = ', '.join(
+            f'{key!r}: {expression(i, f"obj.{column.key}")}' for i, (key, column) in enumerate(zip(self.keys, self.columns))
+        )
+        row_items = ', '.join(
+            f'{key!r}: {expression(i, f"row[offset + {i}]")}' for i, key in enumerate(self.keys)
+        )
+        source = (
+            f'def from_object(obj):\n    return {{{object_items}}}\n'
+            f'def from_row(row, offset=0):\n    return {{{row_items}}}\n'
+        )
+        exec(compile(source, f'<serializer {self.keys[0]}...>', 'exec'), namespace)
+
+        self.from_object = namespace['from_object']
+        self.from_row = namespace['from_row']
+
+    def subset(self, keys):
+        """Serializer for only ``keys`` (plus the first key, the ID), in this serializer's order
+
+        Raises ValueError on unknown keys. Subsets are compiled once and cached.
+        """
+        wanted = set(keys)
+        unknown = wanted - set(self.keys)
+        if unknown:
+            raise ValueError(f"Unknown field: {', '.join(sorted(unknown))}")
+
+        wanted.add(self.keys[0])
+        selected = tuple(key for key in self.keys if key in wanted)
+        if selected == self.keys:
+            return self
+        if selected not in self._subsets:
+            self._subsets[selected] = RowSerializer([field for field in self.fields if field[0] in wanted])
+        return self._subsets[selected]
+
+    def load_only(self, *extra_columns):
+        """ORM loader option reading only this serializer's columns and ``extra_columns``"""
+        return load_only(*self.columns, *extra_columns)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson, falling back to the stdlib encoder
+
+    Output is compact and keys keep insertion order instead of being sorted.
+    """
+
+    sort_keys = False
+    compact = True
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        if orjson is None:
+            return super().response(obj)
+        body = orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS)
+        return self._app.response_class(body, mimetype=self.mimetype)
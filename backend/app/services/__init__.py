@@ -1,5 +1,15 @@
 from .auth_service import AuthService
 from .category_service import CategoryService
 from .feature_service import FeatureService
+from .workspace_service import WorkspaceService
+from .id_service import IdService
+from .search_service import SearchService
+from .roadmap_service import RoadmapService
+from .export_service import ExportService
+from .import_service import ImportService
+from .async_read_service import AsyncReadService
+from .sync_service import SyncService
 
-__all__ = ['AuthService', 'CategoryService', 'FeatureService']
+__all__ = ['AuthService', 'CategoryService', 'FeatureService', 'WorkspaceService', 'IdService', 'SearchService',
+           'RoadmapService', 'ExportService', 'ImportService', 'AsyncReadService',
+           'SyncService']
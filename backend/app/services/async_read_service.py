@@ -0,0 +1,90 @@
+from app import db
+from app.models import User, Category, Feature, WorkspaceVersion, FEATURE_SERIALIZER, CATEGORY_SERIALIZER
+from app.utils import keyset_select, split_page
+from app.services.workspace_service import WORKSPACE_ROW_ID
+from app.services.category_service import tree_features_query, assemble_tree
+from app.services.feature_service import facet_conditions, facet_count_queries, facet_counts
+from app.services.search_service import search_query, order_by_ids
+
+class AsyncReadService:
+    """Read-only service calls on an AsyncSession, for the ASGI read API
+
+    Each method mirrors the synchronous service method of the same name
+    and builds its statements with the same helpers, so both paths return
+    identical data.
+    """
+
+    @staticmethod
+    async def get_version(session):
+        """Get the current workspace version"""
+        version = await session.scalar(
+            db.select(WorkspaceVersion.version).where(WorkspaceVersion.id == WORKSPACE_ROW_ID)
+        )
+        return version or 0
+
+    @staticmethod
+    async def get_user_by_id(session, user_id):
+        """Get user by ID; the JWT identity is a string, the primary key an integer"""
+        try:
+            user_id = int(user_id)
+        except (TypeError, ValueError):
+            return None
+        return await session.get(User, user_id)
+
+    @staticmethod
+    async def get_category_tree(session, limit=None, cursor=None, feature_serializer=FEATURE_SERIALIZER,
+                                category_serializer=CATEGORY_SERIALIZER):
+        """Get categories serialized with their features; see CategoryService.get_category_tree"""
+        query = db.select(Category).options(category_serializer.load_only(Category.created_at))
+        rows = (await session.scalars(keyset_select(query, Category, limit, cursor))).all()
+        categories, next_cursor = split_page(rows, limit)
+
+        category_ids = [c.id for c in categories] if limit is not None or cursor else None
+        feature_rows = await session.execute(tree_features_query(category_ids, feature_serializer))
+        return assemble_tree(categories, feature_rows, feature_serializer, category_serializer), next_cursor
+
+    @staticmethod
+    async def get_category_by_id(session, category_id):
+        """Get a category serialized with its features, or None"""
+        category = await session.get(Category, category_id)
+        if category is None:
+            return None
+        features = await session.execute(tree_features_query([category_id]))
+        return assemble_tree([category], features)[0]
+
+    @staticmethod
+    async def get_features_page(session, category_id, limit=None, cursor=None, serializer=FEATURE_SERIALIZER):
+        """Get features for a category ordered by (created_at, id)"""
+        query = db.select(Feature).options(serializer.load_only(Feature.created_at)) \
+            .where(Feature.category_id == category_id)
+        rows = (await session.scalars(keyset_select(query, Feature, limit, cursor))).all()
+        return split_page(rows, limit)
+
+    @staticmethod
+    async def query_features(session, filters, limit=None, cursor=None, serializer=FEATURE_SERIALIZER):
+        """Filter features and count facets; see FeatureService.query_features"""
+        query = db.select(Feature).options(serializer.load_only(Feature.created_at, Feature.category_id)) \
+            .where(*facet_conditions(filters))
+        rows = (await session.scalars(keyset_select(query, Feature, limit, cursor))).all()
+        features, next_cursor = split_page(rows, limit)
+
+        facets = {}
+        for name, facet_query in facet_count_queries(filters).items():
+            facets[name] = facet_counts(await session.execute(facet_query))
+        return features, next_cursor, facets
+
+    @staticmethod
+    async def search_features(session, text, limit=20, offset=0, serializer=FEATURE_SERIALIZER):
+        """Full-text search; see SearchService.search_features"""
+        statement, query = search_query(session.bind.dialect.name, text)
+        if not query:
+            return [], False
+
+        ids = (await session.scalars(statement, {'query': query, 'limit': limit + 1, 'offset': offset})).all()
+        has_more = len(ids) > limit
+        ids = ids[:limit]
+
+        features = await session.scalars(
+            db.select(Feature).options(serializer.load_only(Feature.category_id)).where(Feature.id.in_(ids))
+        )
+        return order_by_ids(features, ids), has_more
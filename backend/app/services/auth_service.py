@@ -1,5 +1,6 @@
 from app import db
 from app.models import User
+from app.passwords import PasswordHasherBusy
 
 class AuthService:
     """Service layer for authentication operations"""
@@ -13,6 +14,23 @@ class AuthService:
         db.session.commit()
         return user
 
+    @staticmethod
+    def authenticate(username, password):
+        """Get the user if the password matches, upgrading an outdated hash"""
+        user = AuthService.get_user_by_username(username)
+        if not user or not user.check_password(password):
+            return None
+
+        if user.password_needs_rehash():
+            try:
+                user.set_password(password)
+                db.session.commit()
+            except PasswordHasherBusy:
+                # The password was correct; upgrade the hash on a later login instead of failing this one
+                pass
+
+        return user
+
     @staticmethod
     def get_user_by_username(username):
         """Get user by username"""
@@ -21,4 +39,4 @@ class AuthService:
     @staticmethod
     def get_user_by_id(user_id):
         """Get user by ID"""
-        return User.query.get(int(user_id))
+        return db.session.get(User, int(user_id))
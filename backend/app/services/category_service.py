@@ -1,5 +1,61 @@
+from collections import defaultdict
 from app import db
-from app.models import Category
+from app.db_routing import read_only
+from app.models import Category, Feature, FEATURE_SERIALIZER, CATEGORY_SERIALIZER
+from app.utils import keyset_page, versioned_update
+from app.services.workspace_service import WorkspaceService
+from app.services.id_service import IdService
+from app.services.sync_service import SyncService
+from app.events import change_feed, change_event
+
+def tree_features_query(category_ids=None, serializer=FEATURE_SERIALIZER):
+    """Select every feature of the tree as ``(category_id, *serializer.columns)`` rows
+
+    Pass ``category_ids`` to restrict the tree to one page of categories.
+    """
+    query = db.select(Feature.category_id, *serializer.columns).order_by(Feature.created_at, Feature.id)
+    if category_ids is not None:
+        query = query.where(Feature.category_id.in_(category_ids))
+    return query
+
+def assemble_tree(categories, feature_rows, feature_serializer=FEATURE_SERIALIZER,
+                  category_serializer=CATEGORY_SERIALIZER):
+    """Serialize categories with the rows selected by tree_features_query"""
+    # Features are read as plain row tuples and serialized directly,
+    # skipping ORM object construction for the bulk of the payload
+    serialize = feature_serializer.from_row
+    features_by_category = defaultdict(list)
+    for row in feature_rows:
+        features_by_category[row[0]].append(serialize(row, 1))
+
+    return [
+        {**category_serializer.from_object(category), 'features': features_by_category[category.id]}
+        for category in categories
+    ]
+
+# camelCase payload key -> column name for category updates
+CATEGORY_FIELDS = {
+    'name': 'name',
+    'description': 'description',
+}
+
+def category_values(data):
+    """Map a camelCase category payload to column values
+
+    Unknown keys and null values are ignored. Raises ValueError on invalid values.
+    """
+    values = {}
+    for key, column in CATEGORY_FIELDS.items():
+        value = data.get(key)
+        if value is None:
+            continue
+        if not isinstance(value, str):
+            raise ValueError(f'Invalid value for {key}: {value!r}')
+        values[column] = value
+
+    if 'name' in values and not values['name']:
+        raise ValueError('Name is required')
+    return values
 
 class CategoryService:
     """Service layer for category operations"""
@@ -7,42 +63,80 @@ class CategoryService:
     @staticmethod
     def create_category(name, description=''):
         """Create a new category"""
-        # Generate new ID based on existing count
-        existing_count = Category.query.count()
-        new_id = str(existing_count + 1)
-
-        category = Category(id=new_id, name=name, description=description)
+        category = Category(id=IdService.next_category_id(), name=name, description=description)
         db.session.add(category)
+        version = WorkspaceService.bump_version()
         db.session.commit()
+        change_feed.publish([change_event('category', category.id, 'create', version)])
         return category
 
     @staticmethod
+    @read_only
     def get_all_categories():
         """Get all categories with features"""
         return Category.query.all()
 
     @staticmethod
+    @read_only
+    def get_category_tree(limit=None, cursor=None, feature_serializer=FEATURE_SERIALIZER,
+                          category_serializer=CATEGORY_SERIALIZER):
+        """Get categories serialized with their features
+
+        Loads the tree in two queries (one for categories, one for features)
+        regardless of how many categories exist, instead of one feature query
+        per category. Returns ``(categories, next_cursor)``; pass ``limit`` to
+        page through categories by (created_at, id). Only the columns of the
+        given serializers are read.
+        """
+        query = Category.query.options(category_serializer.load_only(Category.created_at))
+        categories, next_cursor = keyset_page(query, Category, limit, cursor)
+
+        category_ids = [c.id for c in categories] if limit is not None or cursor else None
+        feature_rows = db.session.execute(tree_features_query(category_ids, feature_serializer))
+        tree = assemble_tree(categories, feature_rows, feature_serializer, category_serializer)
+        return tree, next_cursor
+
+    @staticmethod
+    @read_only
     def get_category_by_id(category_id):
         """Get category by ID"""
         return Category.query.get(category_id)
 
     @staticmethod
-    def update_category(category_id, name=None, description=None):
-        """Update a category"""
-        category = Category.query.get_or_404(category_id)
+    def update_category(category_id, data, expected_version=None):
+        """Update the fields in a camelCase payload with a single UPDATE ... RETURNING
 
-        if name is not None:
-            category.name = name
-        if description is not None:
-            category.description = description
+        With ``expected_version`` the update only applies if the category is
+        still at that version; otherwise VersionConflict is raised. Returns
+        the serialized category (without features), or None if it does not exist.
+        """
+        category = versioned_update(db.session, Category, category_id, category_values(data), expected_version,
+                                    CATEGORY_SERIALIZER.from_row, *CATEGORY_SERIALIZER.columns)
+        if category is None:
+            return None
 
+        version = WorkspaceService.bump_version()
         db.session.commit()
+        change_feed.publish([change_event('category', category_id, 'update', version)])
         return category
 
     @staticmethod
     def delete_category(category_id):
-        """Delete a category (cascades to features)"""
-        category = Category.query.get_or_404(category_id)
-        db.session.delete(category)
+        """Delete a category with one DELETE; ON DELETE CASCADE removes its features
+
+        Returns False if the category does not exist.
+        """
+        SyncService.record_category_delete(category_id)
+        deleted = db.session.execute(
+            db.delete(Category).where(Category.id == category_id),
+            execution_options={'synchronize_session': False}
+        ).rowcount
+        if not deleted:
+            db.session.rollback()
+            return False
+
+        version = WorkspaceService.bump_version()
         db.session.commit()
+        # Clients drop the category's features along with it
+        change_feed.publish([change_event('category', category_id, 'delete', version)])
         return True
@@ -0,0 +1,63 @@
+import csv
+import io
+from app import db
+from app.models import Feature, FEATURE_SERIALIZER
+
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_KEYS = ('categoryId',) + FEATURE_SERIALIZER.keys
+
+class ExportService:
+    """Service layer for streaming feature exports"""
+
+    @staticmethod
+    def iter_feature_batches(batch_size=EXPORT_BATCH_SIZE):
+        """Yield lists of serialized features, ``batch_size`` rows at a time
+
+        Rows are fetched through a server-side cursor (``yield_per``) as plain
+        tuples, so memory stays bounded by the batch size however many
+        features exist.
+        """
+        query = (
+            db.select(Feature.category_id, *FEATURE_SERIALIZER.columns)
+            .order_by(Feature.created_at, Feature.id)
+            .execution_options(yield_per=batch_size)
+        )
+        serialize = FEATURE_SERIALIZER.from_row
+
+        result = db.session.execute(query)
+        try:
+            for partition in result.partitions():
+                yield [{'categoryId': row[0], **serialize(row, 1)} for row in partition]
+        finally:
+            result.close()
+
+    @staticmethod
+    def iter_ndjson(dumps):
+        """Yield the export as newline-delimited JSON chunks"""
+        for batch in ExportService.iter_feature_batches():
+            yield ''.join(dumps(feature) + '\n' for feature in batch)
+
+    @staticmethod
+    def iter_csv():
+        """Yield the export as CSV chunks, header first"""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_KEYS)
+
+        for batch in ExportService.iter_feature_batches():
+            for feature in batch:
+                writer.writerow([_csv_value(feature[key]) for key in EXPORT_KEYS])
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+        if buffer.tell():
+            yield buffer.getvalue()
+
+def _csv_value(value):
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    return value
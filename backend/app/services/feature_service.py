@@ -1,5 +1,121 @@
+from datetime import datetime
 from app import db
-from app.models import Feature, Priority, TShirtSize, Category
+from app.db_routing import read_only
+from app.models import Feature, Priority, TShirtSize, Category, release_month, FEATURE_SERIALIZER
+from app.utils import keyset_page, versioned_update
+from app.services.workspace_service import WorkspaceService
+from app.services.id_service import IdService
+from app.services.sync_service import SyncService
+from app.events import change_feed, change_event
+
+MAX_BATCH_SIZE = 1000
+
+def _to_bool(value):
+    if not isinstance(value, bool):
+        raise ValueError('engineeringSignoff must be a boolean')
+    return value
+
+def _to_str(value):
+    if not isinstance(value, str):
+        raise ValueError('must be a string')
+    return value
+
+# camelCase payload key -> (column name, converter, nullable)
+FEATURE_FIELDS = {
+    'title': ('title', _to_str, False),
+    'priority': ('priority', Priority, False),
+    'description': ('description', _to_str, True),
+    'kpi': ('kpi', _to_str, True),
+    'customerName': ('customer_name', _to_str, True),
+    'engineeringComment': ('engineering_comment', _to_str, True),
+    'engineeringSignoff': ('engineering_signoff', _to_bool, False),
+    'engineeringComplexity': ('engineering_complexity', TShirtSize, False),
+    'releaseDate': ('release_date', _to_str, True),
+}
+
+# camelCase filter name -> feature column, for faceted queries
+FACET_COLUMNS = {
+    'categoryId': Feature.category_id,
+    'priority': Feature.priority,
+    'engineeringComplexity': Feature.engineering_complexity,
+    'engineeringSignoff': Feature.engineering_signoff,
+    'customerName': Feature.customer_name,
+}
+
+MAX_FACET_VALUES = 50
+
+FEATURE_DEFAULTS = {
+    'priority': 'Medium',
+    'description': '',
+    'kpi': '',
+    'customerName': '',
+    'engineeringComment': '',
+    'engineeringSignoff': False,
+    'engineeringComplexity': 'M',
+    'releaseDate': '',
+}
+
+def feature_values(data):
+    """Map a camelCase feature payload to validated column values
+
+    Unknown keys are ignored; null clears nullable fields. Raises
+    ValueError on invalid values.
+    """
+    if not isinstance(data, dict):
+        raise ValueError('Feature data must be an object')
+
+    values = {}
+    for key, value in data.items():
+        if key not in FEATURE_FIELDS:
+            continue
+        column, convert, nullable = FEATURE_FIELDS[key]
+        if value is None:
+            if not nullable:
+                raise ValueError(f'{key} cannot be null')
+            values[column] = None
+            continue
+        try:
+            values[column] = convert(value)
+        except (TypeError, ValueError):
+            raise ValueError(f'Invalid value for {key}: {value!r}')
+
+    if 'title' in values and not values['title']:
+        raise ValueError('Title is required')
+    if 'release_date' in values:
+        values['release_month'] = release_month(values['release_date'])
+    return values
+
+def feature_row_dict(row):
+    """Serialize a ``(category_id, *FEATURE_SERIALIZER.columns)`` row"""
+    return {**FEATURE_SERIALIZER.from_row(row, 1), 'categoryId': row[0]}
+
+def facet_conditions(filters, exclude=None):
+    """WHERE clauses for ``filters``, optionally leaving one dimension out"""
+    return [
+        FACET_COLUMNS[name].in_(values)
+        for name, values in filters.items()
+        if values and name != exclude
+    ]
+
+def facet_count_queries(filters):
+    """One ``(value, count)`` aggregate query per facet dimension
+
+    Facet counts for a dimension apply every filter except that
+    dimension's own, so clients can show how many results selecting
+    another value would give.
+    """
+    return {
+        name: db.select(column, db.func.count())
+        .where(*facet_conditions(filters, exclude=name))
+        .group_by(column)
+        .order_by(db.func.count().desc(), column)
+        .limit(MAX_FACET_VALUES)
+        for name, column in FACET_COLUMNS.items()
+    }
+
+def facet_counts(rows):
+    """Serialize the rows of one facet_count_queries query"""
+    return [{'value': getattr(value, 'value', value), 'count': count} for value, count in rows]
 
 class FeatureService:
     """Service layer for feature operations"""
@@ -9,13 +125,8 @@ class FeatureService:
                       customer_name='', engineering_comment='', engineering_signoff=False,
                       engineering_complexity='M', release_date=''):
         """Create a new feature in a category"""
-        # Get category to generate feature ID
-        category = Category.query.get_or_404(category_id)
-        feature_count = category.features.count()
-        new_feature_id = f"{category_id}.{feature_count + 1}"
-
         feature = Feature(
-            id=new_feature_id,
+            id=IdService.next_feature_id(category_id),
             category_id=category_id,
             title=title,
             priority=Priority(priority),
@@ -29,51 +140,259 @@ class FeatureService:
         )
 
         db.session.add(feature)
+        version = WorkspaceService.bump_version()
         db.session.commit()
+        change_feed.publish([change_event('feature', feature.id, 'create', version, category_id)])
         return feature
 
     @staticmethod
+    @read_only
     def get_features_by_category(category_id):
         """Get all features for a category"""
         return Feature.query.filter_by(category_id=category_id).all()
 
     @staticmethod
+    @read_only
+    def get_features_page(category_id, limit=None, cursor=None, serializer=FEATURE_SERIALIZER):
+        """Get features for a category ordered by (created_at, id)
+
+        Only the columns of ``serializer`` are loaded. Returns
+        ``(features, next_cursor)``.
+        """
+        query = Feature.query.options(serializer.load_only(Feature.created_at)).filter_by(category_id=category_id)
+        return keyset_page(query, Feature, limit, cursor)
+
+    @staticmethod
+    @read_only
+    def query_features(filters, limit=None, cursor=None, serializer=FEATURE_SERIALIZER):
+        """Filter features and count facets for every filterable dimension
+
+        ``filters`` maps a FACET_COLUMNS name to a list of accepted values;
+        see facet_count_queries for how facets are counted. Only the columns
+        of ``serializer`` are loaded. Returns ``(features, next_cursor, facets)``.
+        """
+        query = Feature.query.options(serializer.load_only(Feature.created_at, Feature.category_id))
+        features, next_cursor = keyset_page(
+            query.filter(*facet_conditions(filters)), Feature, limit, cursor
+        )
+
+        facets = {
+            name: facet_counts(db.session.execute(query))
+            for name, query in facet_count_queries(filters).items()
+        }
+        return features, next_cursor, facets
+
+    @staticmethod
+    @read_only
     def get_feature_by_id(feature_id):
         """Get feature by ID"""
         return Feature.query.get(feature_id)
 
     @staticmethod
-    def update_feature(feature_id, **kwargs):
-        """Update a feature"""
-        feature = Feature.query.get_or_404(feature_id)
+    def update_feature(feature_id, data, expected_version=None):
+        """Update the fields in a camelCase payload with a single UPDATE ... RETURNING
 
-        # Update fields if provided
-        if 'title' in kwargs:
-            feature.title = kwargs['title']
-        if 'priority' in kwargs:
-            feature.priority = Priority(kwargs['priority'])
-        if 'description' in kwargs:
-            feature.description = kwargs['description']
-        if 'kpi' in kwargs:
-            feature.kpi = kwargs['kpi']
-        if 'customerName' in kwargs:
-            feature.customer_name = kwargs['customerName']
-        if 'engineeringComment' in kwargs:
-            feature.engineering_comment = kwargs['engineeringComment']
-        if 'engineeringSignoff' in kwargs:
-            feature.engineering_signoff = kwargs['engineeringSignoff']
-        if 'engineeringComplexity' in kwargs:
-            feature.engineering_complexity = TShirtSize(kwargs['engineeringComplexity'])
-        if 'releaseDate' in kwargs:
-            feature.release_date = kwargs['releaseDate']
+        With ``expected_version`` the update only applies if the feature is
+        still at that version; otherwise VersionConflict is raised. Returns
+        the serialized feature with its categoryId, or None if it does not exist.
+        """
+        feature = versioned_update(db.session, Feature, feature_id, feature_values(data), expected_version,
+                                   feature_row_dict, Feature.category_id, *FEATURE_SERIALIZER.columns)
+        if feature is None:
+            return None
 
+        version = WorkspaceService.bump_version()
         db.session.commit()
+        change_feed.publish([change_event('feature', feature_id, 'update', version, feature['categoryId'])])
         return feature
 
     @staticmethod
     def delete_feature(feature_id):
         """Delete a feature"""
         feature = Feature.query.get_or_404(feature_id)
+        category_id = feature.category_id
+        SyncService.record_feature_deletes({feature_id: category_id})
         db.session.delete(feature)
+        version = WorkspaceService.bump_version()
         db.session.commit()
+        change_feed.publish([change_event('feature', feature_id, 'delete', version, category_id)])
         return True
+
+    @staticmethod
+    def delete_features(filters):
+        """Delete every feature matching facet ``filters`` with a single DELETE
+
+        At least one filter is required. Returns how many features were deleted.
+        """
+        conditions = facet_conditions(filters)
+        if not conditions:
+            raise ValueError('At least one filter is required')
+
+        SyncService.record_feature_deletes_where(*conditions)
+        category_ids = db.session.execute(
+            db.delete(Feature).where(*conditions).returning(Feature.category_id),
+            execution_options={'synchronize_session': False}
+        ).scalars().all()
+        if not category_ids:
+            db.session.rollback()
+            return 0
+
+        touched_categories = sorted(set(category_ids))
+        version = WorkspaceService.bump_version()
+        db.session.commit()
+        # One event per category rather than per feature; clients refetch the categories it names
+        change_feed.publish([
+            change_event('category', category_id, 'bulk-delete', version) for category_id in touched_categories
+        ])
+        return len(category_ids)
+
+    @staticmethod
+    def validate_batch(operations):
+        """Validate batch operations without writing anything
+
+        Returns ``(plan, errors)`` where ``plan`` groups the validated
+        operations by kind and ``errors`` is a list of ``{'index', 'error'}``.
+        """
+        if not isinstance(operations, list):
+            return None, [{'index': None, 'error': 'operations must be a list'}]
+        if len(operations) > MAX_BATCH_SIZE:
+            return None, [{'index': None, 'error': f'At most {MAX_BATCH_SIZE} operations per batch'}]
+
+        errors = []
+        creates, updates, deletes = [], [], []
+        for index, operation in enumerate(operations):
+            try:
+                if not isinstance(operation, dict):
+                    raise ValueError('Operation must be an object')
+                op = operation.get('op')
+                data = operation.get('data')
+                if data is None:
+                    data = {}
+                elif not isinstance(data, dict):
+                    raise ValueError('data must be an object')
+                if op == 'create':
+                    if not operation.get('categoryId'):
+                        raise ValueError('categoryId is required')
+                    values = feature_values({**FEATURE_DEFAULTS, **data})
+                    if 'title' not in values:
+                        raise ValueError('Title is required')
+                    creates.append((index, str(operation['categoryId']), values))
+                elif op == 'update':
+                    if not operation.get('id'):
+                        raise ValueError('id is required')
+                    updates.append((index, str(operation['id']), feature_values(data)))
+                elif op == 'delete':
+                    if not operation.get('id'):
+                        raise ValueError('id is required')
+                    deletes.append((index, str(operation['id'])))
+                else:
+                    raise ValueError(f'Unknown op: {op!r}')
+            except ValueError as e:
+                errors.append({'index': index, 'error': str(e)})
+
+        # Resolve every referenced category and feature with one query each
+        category_ids = {category_id for _, category_id, _ in creates}
+        existing_categories = set()
+        if category_ids:
+            existing_categories = set(db.session.execute(
+                db.select(Category.id).where(Category.id.in_(category_ids))
+            ).scalars())
+
+        feature_ids = [feature_id for _, feature_id, _ in updates] + [feature_id for _, feature_id in deletes]
+        feature_categories = {}
+        if feature_ids:
+            feature_categories = dict(db.session.execute(
+                db.select(Feature.id, Feature.category_id).where(Feature.id.in_(set(feature_ids)))
+            ).all())
+
+        for index, category_id, _ in creates:
+            if category_id not in existing_categories:
+                errors.append({'index': index, 'error': f'Category {category_id} not found'})
+
+        seen = set()
+        for index, feature_id in [(i, f) for i, f, _ in updates] + deletes:
+            if feature_id not in feature_categories:
+                errors.append({'index': index, 'error': f'Feature {feature_id} not found'})
+            elif feature_id in seen:
+                errors.append({'index': index, 'error': f'Feature {feature_id} appears more than once'})
+            seen.add(feature_id)
+
+        errors.sort(key=lambda error: error['index'])
+        plan = {
+            'creates': creates,
+            'updates': updates,
+            'deletes': deletes,
+            'feature_categories': feature_categories,
+        }
+        return plan, errors
+
+    @staticmethod
+    def apply_batch(plan):
+        """Apply a validated batch in a single transaction
+
+        Uses executemany-style bulk INSERT/UPDATE and a single DELETE, then
+        commits once. Returns one result per operation.
+        """
+        creates, updates, deletes = plan['creates'], plan['updates'], plan['deletes']
+        feature_categories = dict(plan['feature_categories'])
+        results = []
+        touched_categories = set()
+        now = datetime.utcnow()
+
+        if creates:
+            creates_per_category = {}
+            for _, category_id, _ in creates:
+                creates_per_category[category_id] = creates_per_category.get(category_id, 0) + 1
+            # Lock the category rows in a global order so concurrent batches cannot deadlock
+            allocated_ids = {
+                category_id: iter(IdService.next_feature_ids(category_id, creates_per_category[category_id]))
+                for category_id in sorted(creates_per_category)
+            }
+
+            rows = []
+            for index, category_id, values in creates:
+                feature_id = next(allocated_ids[category_id])
+                feature_categories[feature_id] = category_id
+                rows.append({**values, 'id': feature_id, 'category_id': category_id,
+                             'created_at': now, 'updated_at': now})
+                results.append({'index': index, 'op': 'create', 'id': feature_id})
+                touched_categories.add(category_id)
+            db.session.execute(db.insert(Feature), rows)
+
+        if updates:
+            # One executemany per distinct set of updated columns, so each
+            # row's version can be bumped in SQL
+            updates_by_columns = {}
+            for _, feature_id, values in updates:
+                updates_by_columns.setdefault(tuple(sorted(values)), []).append({**values, 'b_id': feature_id})
+            for columns, rows in updates_by_columns.items():
+                db.session.execute(
+                    db.update(Feature.__table__)
+                    .where(Feature.id == db.bindparam('b_id'))
+                    .values({**{column: db.bindparam(column) for column in columns},
+                             'version': Feature.version + 1, 'updated_at': now}),
+                    rows
+                )
+            for index, feature_id, _ in updates:
+                results.append({'index': index, 'op': 'update', 'id': feature_id})
+                touched_categories.add(feature_categories[feature_id])
+
+        if deletes:
+            SyncService.record_feature_deletes({feature_id: feature_categories[feature_id] for _, feature_id in deletes})
+            db.session.execute(
+                db.delete(Feature).where(Feature.id.in_([feature_id for _, feature_id in deletes])),
+                execution_options={'synchronize_session': False}
+            )
+            for index, feature_id in deletes:
+                results.append({'index': index, 'op': 'delete', 'id': feature_id})
+                touched_categories.add(feature_categories[feature_id])
+
+        version = WorkspaceService.bump_version()
+        db.session.commit()
+
+        results.sort(key=lambda result: result['index'])
+        # One event per category rather than per operation; clients refetch the categories it names
+        change_feed.publish([
+            change_event('category', category_id, 'batch', version) for category_id in sorted(touched_categories)
+        ])
+        return results
@@ -0,0 +1,85 @@
+from werkzeug.exceptions import NotFound
+from app import db
+from app.models import Category, Feature, IdCounter
+from app.models.id_counter import CATEGORY_COUNTER
+
+def _max_numeric(ids):
+    """Largest integer among ID suffixes, ignoring non-numeric ones"""
+    return max((int(value) for value in ids if value.isdigit()), default=0)
+
+class IdService:
+    """Allocates category ("3") and feature ("3.7") IDs
+
+    Each allocation is a single ``UPDATE ... RETURNING`` that increments a
+    counter row, so it is constant-time, never reuses an ID after a delete,
+    and concurrent writers are serialized by the row lock instead of racing
+    on a ``COUNT(*)``.
+    """
+
+    @staticmethod
+    def next_category_id():
+        """Allocate the next category ID"""
+        allocated = db.session.execute(
+            db.update(IdCounter)
+            .where(IdCounter.name == CATEGORY_COUNTER)
+            .values(next_value=IdCounter.next_value + 1)
+            .returning(IdCounter.next_value)
+        ).scalar()
+
+        if allocated is None:
+            # Seeded by the migration or db.create_all(); resync() is too slow for the request path
+            raise RuntimeError(f'ID counter {CATEGORY_COUNTER!r} is missing; run IdService.resync()')
+
+        return str(allocated - 1)
+
+    @staticmethod
+    def next_feature_ids(category_id, count=1):
+        """Allocate ``count`` consecutive feature IDs in a category
+
+        Raises NotFound if the category does not exist.
+        """
+        allocated = db.session.execute(
+            db.update(Category)
+            .where(Category.id == category_id)
+            # Keep updated_at so allocating an ID does not show the category as changed in delta sync
+            .values(next_feature_seq=Category.next_feature_seq + count, updated_at=Category.updated_at)
+            .returning(Category.next_feature_seq)
+            .execution_options(synchronize_session=False)
+        ).scalar()
+
+        if allocated is None:
+            raise NotFound(f'Category {category_id} not found')
+
+        return [f"{category_id}.{seq}" for seq in range(allocated - count, allocated)]
+
+    @staticmethod
+    def next_feature_id(category_id):
+        """Allocate a single feature ID in a category"""
+        return IdService.next_feature_ids(category_id)[0]
+
+    @staticmethod
+    def resync():
+        """Recompute every counter from the IDs already in the database
+
+        Used after seeding or importing rows with explicit IDs. Not
+        constant-time; never call it on the request path.
+        """
+        category_ids = db.session.execute(db.select(Category.id)).scalars().all()
+        next_category = _max_numeric(category_ids) + 1
+
+        counter = db.session.get(IdCounter, CATEGORY_COUNTER)
+        if counter is None:
+            db.session.add(IdCounter(name=CATEGORY_COUNTER, next_value=next_category))
+        else:
+            counter.next_value = max(counter.next_value, next_category)
+
+        suffixes = {}
+        for feature_id, category_id in db.session.execute(db.select(Feature.id, Feature.category_id)):
+            suffix = feature_id.rsplit('.', 1)[-1]
+            if suffix.isdigit():
+                suffixes[category_id] = max(suffixes.get(category_id, 0), int(suffix))
+
+        for category in Category.query:
+            category.next_feature_seq = max(category.next_feature_seq or 1, suffixes.get(category.id, 0) + 1)
+
+        db.session.flush()
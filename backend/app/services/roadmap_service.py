@@ -0,0 +1,92 @@
+from app import db
+from app.db_routing import read_only
+from app.models import Category, Feature, release_month, format_release_month, FEATURE_SERIALIZER
+
+MAX_ROADMAP_MONTHS = 120
+
+class RoadmapService:
+    """Service layer for the release roadmap"""
+
+    @staticmethod
+    def parse_month(value):
+        """Parse a YYYY-MM query parameter into an integer month"""
+        if value is None:
+            return None
+        month = release_month(value)
+        if month is None:
+            raise ValueError(f'Invalid month: {value!r}, expected YYYY-MM')
+        return month
+
+    @staticmethod
+    def _default_bounds(start, end):
+        """Fill missing bounds from the scheduled features, at most MAX_ROADMAP_MONTHS apart
+
+        Returns ``(None, None)`` when no feature is scheduled in the range.
+        """
+        query = db.select(db.func.min(Feature.release_month), db.func.max(Feature.release_month))
+        if start is not None:
+            query = query.where(Feature.release_month >= start)
+        if end is not None:
+            query = query.where(Feature.release_month <= end)
+        earliest, latest = db.session.execute(query).one()
+        if earliest is None:
+            return None, None
+
+        # An open end is clamped to the window rather than rejected
+        if start is None and end is not None:
+            return max(earliest, end - MAX_ROADMAP_MONTHS + 1), end
+        start = earliest if start is None else start
+        return start, min(latest, start + MAX_ROADMAP_MONTHS - 1) if end is None else end
+
+    @staticmethod
+    @read_only
+    def get_roadmap(start=None, end=None, serializer=FEATURE_SERIALIZER):
+        """Get features grouped by release month and category
+
+        Uses a single range scan over the indexed ``release_month`` column.
+        Every month between the bounds is present, including empty ones.
+        Missing bounds default to the earliest/latest scheduled feature,
+        clamped to MAX_ROADMAP_MONTHS from the other bound (or from the
+        earliest one); only an explicit range may be too long.
+        Features are serialized (and loaded) with ``serializer``'s columns.
+        """
+        if start is not None and end is not None:
+            if end < start:
+                raise ValueError('to must not be before from')
+            if end - start >= MAX_ROADMAP_MONTHS:
+                raise ValueError(f'At most {MAX_ROADMAP_MONTHS} months per request')
+        else:
+            start, end = RoadmapService._default_bounds(start, end)
+            if start is None:
+                return {'from': None, 'to': None, 'months': []}
+
+        query = (
+            db.select(Feature, Category.name)
+            .join(Category, Feature.category_id == Category.id)
+            .options(serializer.load_only(Feature.release_month, Feature.category_id))
+            .where(Feature.release_month.between(start, end))
+            .order_by(Feature.release_month, Category.created_at, Category.id, Feature.created_at, Feature.id)
+        )
+
+        grouped = {}
+        for feature, category_name in db.session.execute(query):
+            categories = grouped.setdefault(feature.release_month, {})
+            if feature.category_id not in categories:
+                categories[feature.category_id] = {
+                    'id': feature.category_id,
+                    'name': category_name,
+                    'features': []
+                }
+            categories[feature.category_id]['features'].append(serializer.from_object(feature))
+
+        return {
+            'from': format_release_month(start),
+            'to': format_release_month(end),
+            'months': [
+                {
+                    'month': format_release_month(month),
+                    'categories': list(grouped.get(month, {}).values())
+                }
+                for month in range(start, end + 1)
+            ]
+        }
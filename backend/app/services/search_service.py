@@ -0,0 +1,71 @@
+import re
+from app import db
+from app.db_routing import read_only
+from app.models import Feature, FEATURE_SERIALIZER
+
+MAX_SEARCH_RESULTS = 100
+
+SQLITE_SEARCH_SQL = db.text("""
+    SELECT keys.feature_id
+    FROM features_fts JOIN features_fts_keys AS keys ON keys.key = features_fts.rowid
+    WHERE features_fts MATCH :query
+    ORDER BY bm25(features_fts, 10.0, 4.0, 2.0, 2.0), keys.feature_id
+    LIMIT :limit OFFSET :offset
+""")
+
+POSTGRES_SEARCH_SQL = db.text("""
+    SELECT features.id
+    FROM features, websearch_to_tsquery('english', :query) AS query
+    WHERE features.search_vector @@ query
+    ORDER BY ts_rank_cd(features.search_vector, query) DESC, features.id
+    LIMIT :limit OFFSET :offset
+""")
+
+def _fts5_query(text):
+    """Turn free text into a safe FTS5 query: every word must match, the last as a prefix"""
+    words = re.findall(r'\w+', text)
+    if not words:
+        return None
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += '*'
+    return ' '.join(terms)
+
+def search_query(dialect, text):
+    """Return ``(statement, query)`` for full-text search on ``dialect``
+
+    ``query`` is None when ``text`` contains nothing searchable.
+    """
+    if dialect == 'sqlite':
+        return SQLITE_SEARCH_SQL, _fts5_query(text)
+    if dialect == 'postgresql':
+        return POSTGRES_SEARCH_SQL, text.strip()
+    raise NotImplementedError(f'Full-text search is not supported on {dialect}')
+
+def order_by_ids(features, ids):
+    """Order features loaded by ``id IN (...)`` like ``ids``"""
+    by_id = {feature.id: feature for feature in features}
+    return [by_id[feature_id] for feature_id in ids if feature_id in by_id]
+
+class SearchService:
+    """Service layer for full-text feature search"""
+
+    @staticmethod
+    @read_only
+    def search_features(text, limit=20, offset=0, serializer=FEATURE_SERIALIZER):
+        """Search feature title, description, KPI and engineering comment
+
+        Only the columns of ``serializer`` are loaded. Returns
+        ``(features, has_more)`` ordered by relevance.
+        """
+        statement, query = search_query(db.engine.dialect.name, text)
+        if not query:
+            return [], False
+
+        ids = db.session.execute(
+            statement, {'query': query, 'limit': limit + 1, 'offset': offset}
+        ).scalars().all()
+        has_more = len(ids) > limit
+        ids = ids[:limit]
+
+        query = Feature.query.options(serializer.load_only(Feature.category_id)).filter(Feature.id.in_(ids))
+        return order_by_ids(query, ids), has_more
@@ -0,0 +1,131 @@
+import base64
+from datetime import datetime, timedelta
+from app import db
+from app.db_routing import read_only
+from app.models import Category, Feature, Tombstone, FEATURE_SERIALIZER
+
+# A write stamps updated_at before it commits, so a row can become visible
+# with a timestamp slightly in the past. Cursors trail the clock by this much
+# and the rows inside the window are sent again on the next sync.
+SYNC_SETTLE = timedelta(seconds=10)
+
+# Tombstones older than this are pruned; older cursors get a full reset
+TOMBSTONE_RETENTION = timedelta(days=30)
+
+# Deltas larger than this are answered with a full reset instead
+MAX_SYNC_CHANGES = 5000
+
+def encode_sync_cursor(timestamp):
+    """Encode a sync position as an opaque URL-safe cursor"""
+    return base64.urlsafe_b64encode(timestamp.isoformat().encode()).decode().rstrip('=')
+
+def decode_sync_cursor(cursor):
+    """Decode a cursor produced by encode_sync_cursor"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        return datetime.fromisoformat(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (ValueError, TypeError, UnicodeDecodeError):
+        raise ValueError('Invalid cursor')
+
+def _feature_dicts(rows):
+    serialize = FEATURE_SERIALIZER.from_row
+    return [{**serialize(row, 1), 'categoryId': row[0]} for row in rows]
+
+class SyncService:
+    """Service layer for incremental (delta) sync"""
+
+    @staticmethod
+    def record_feature_deletes(feature_categories):
+        """Write tombstones for features about to be deleted, in the current transaction
+
+        ``feature_categories`` maps feature ID to category ID.
+        """
+        if feature_categories:
+            now = datetime.utcnow()
+            db.session.execute(db.insert(Tombstone), [
+                {'entity': 'feature', 'entity_id': feature_id, 'category_id': category_id, 'deleted_at': now}
+                for feature_id, category_id in feature_categories.items()
+            ])
+
+    @staticmethod
+    def record_feature_deletes_where(*conditions):
+        """Write tombstones for every feature matching ``conditions`` with one INSERT ... SELECT"""
+        db.session.execute(db.insert(Tombstone).from_select(
+            ['entity', 'entity_id', 'category_id', 'deleted_at'],
+            db.select(db.literal('feature'), Feature.id, Feature.category_id, db.literal(datetime.utcnow()))
+            .where(*conditions)
+        ))
+
+    @staticmethod
+    def record_category_delete(category_id):
+        """Write tombstones for a category and all its features, in the current transaction"""
+        SyncService.record_feature_deletes_where(Feature.category_id == category_id)
+        db.session.add(Tombstone(entity='category', entity_id=category_id, category_id=category_id,
+                                 deleted_at=datetime.utcnow()))
+
+    @staticmethod
+    @read_only
+    def get_changes(since=None):
+        """Get everything created, updated or deleted since a cursor
+
+        Without ``since``, or when the delta would be too large or the
+        cursor predates tombstone retention, returns the complete state with
+        ``reset`` set so the client replaces its copy instead of merging.
+        """
+        now = datetime.utcnow()
+        # Limitation: this assumes every write commits within SYNC_SETTLE of
+        # stamping updated_at/deleted_at, on hosts whose clocks agree to well
+        # within it. A longer transaction (e.g. a lock wait) or a host whose
+        # clock lags can make a change visible behind a cursor already issued;
+        # clients holding that cursor miss it until their next reset.
+        cursor = encode_sync_cursor(now - SYNC_SETTLE)
+        since = decode_sync_cursor(since) if since else None
+
+        if since is not None and since >= now - TOMBSTONE_RETENTION:
+            categories = Category.query.filter(Category.updated_at >= since) \
+                .order_by(Category.updated_at, Category.id).limit(MAX_SYNC_CHANGES + 1).all()
+            features = db.session.execute(
+                db.select(Feature.category_id, *FEATURE_SERIALIZER.columns)
+                .where(Feature.updated_at >= since)
+                .order_by(Feature.updated_at, Feature.id)
+                .limit(MAX_SYNC_CHANGES + 1)
+            ).all()
+            tombstones = db.session.execute(
+                db.select(Tombstone.entity, Tombstone.entity_id)
+                .where(Tombstone.deleted_at >= since)
+                .order_by(Tombstone.deleted_at, Tombstone.id)
+                .limit(MAX_SYNC_CHANGES + 1)
+            ).all()
+
+            if len(categories) + len(features) + len(tombstones) <= MAX_SYNC_CHANGES:
+                return {
+                    'cursor': cursor,
+                    'reset': False,
+                    'categories': [category.to_dict(include_features=False) for category in categories],
+                    'features': _feature_dicts(features),
+                    'deleted': {
+                        'categories': [entity_id for entity, entity_id in tombstones if entity == 'category'],
+                        'features': [entity_id for entity, entity_id in tombstones if entity == 'feature'],
+                    },
+                }
+
+        categories = Category.query.order_by(Category.created_at, Category.id).all()
+        features = db.session.execute(
+            db.select(Feature.category_id, *FEATURE_SERIALIZER.columns).order_by(Feature.created_at, Feature.id)
+        )
+        return {
+            'cursor': cursor,
+            'reset': True,
+            'categories': [category.to_dict(include_features=False) for category in categories],
+            'features': _feature_dicts(features),
+            'deleted': {'categories': [], 'features': []},
+        }
+
+    @staticmethod
+    def prune_tombstones():
+        """Delete tombstones older than the retention period; returns how many"""
+        result = db.session.execute(
+            db.delete(Tombstone).where(Tombstone.deleted_at < datetime.utcnow() - TOMBSTONE_RETENTION)
+        )
+        db.session.commit()
+        return result.rowcount
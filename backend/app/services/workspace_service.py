@@ -0,0 +1,33 @@
+from app import db
+from app.models import WorkspaceVersion
+
+WORKSPACE_ROW_ID = 1
+
+class WorkspaceService:
+    """Service layer for the workspace version counter"""
+
+    @staticmethod
+    def bump_version():
+        """Increment the workspace version in the current transaction
+
+        Call this right before committing a category/feature write so the row
+        lock is held for as short a time as possible. Returns the new version.
+        """
+        version = db.session.execute(
+            db.update(WorkspaceVersion)
+            .where(WorkspaceVersion.id == WORKSPACE_ROW_ID)
+            .values(version=WorkspaceVersion.version + 1)
+            .returning(WorkspaceVersion.version)
+        ).scalar()
+        if version is None:
+            version = 1
+            db.session.add(WorkspaceVersion(id=WORKSPACE_ROW_ID, version=version))
+        return version
+
+    @staticmethod
+    def get_version():
+        """Get the current workspace version"""
+        version = db.session.execute(
+            db.select(WorkspaceVersion.version).where(WorkspaceVersion.id == WORKSPACE_ROW_ID)
+        ).scalar()
+        return version or 0
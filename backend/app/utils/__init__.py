@@ -0,0 +1,6 @@
+from .pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, encode_cursor, decode_cursor, parse_page_args, keyset_select, split_page, keyset_page
+from .fields import parse_fields
+from .versioning import VersionConflict, VersionRequired, versioned_update, parse_version
+
+__all__ = ['DEFAULT_PAGE_SIZE', 'MAX_PAGE_SIZE', 'encode_cursor', 'decode_cursor', 'parse_page_args', 'keyset_select', 'split_page', 'keyset_page',
+           'parse_fields', 'VersionConflict', 'VersionRequired', 'versioned_update', 'parse_version']
@@ -0,0 +1,10 @@
+def parse_fields(args, serializer, name='fields'):
+    """Read a comma-separated sparse fieldset such as ``fields=id,title`` from request args
+
+    Returns ``serializer`` itself when the parameter is absent, otherwise
+    its subset for the requested keys. Raises ValueError on unknown fields.
+    """
+    value = args.get(name)
+    if value is None:
+        return serializer
+    return serializer.subset(key.strip() for key in value.split(',') if key.strip())
@@ -0,0 +1,76 @@
+import base64
+import json
+from datetime import datetime
+from sqlalchemy import tuple_
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+def encode_cursor(created_at, row_id):
+    """Encode a (created_at, id) position as an opaque URL-safe cursor"""
+    payload = json.dumps([created_at.isoformat() if created_at else None, row_id])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+def decode_cursor(cursor):
+    """Decode a cursor produced by encode_cursor into (created_at, id)"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), str(row_id)
+    except (ValueError, TypeError):
+        raise ValueError('Invalid cursor')
+
+def parse_page_args(args, default=None):
+    """Read ``limit`` and ``cursor`` from request args
+
+    Returns ``(limit, cursor)``. Without a ``limit`` the page size is
+    ``default``; None keeps returning the full list to callers that did not
+    ask for pagination (the category tree), except after a cursor. A given
+    ``limit`` is capped at MAX_PAGE_SIZE.
+    """
+    cursor = args.get('cursor') or None
+    limit = args.get('limit')
+
+    if limit is None:
+        return (default or (DEFAULT_PAGE_SIZE if cursor else None)), cursor
+
+    try:
+        limit = int(limit)
+    except ValueError:
+        raise ValueError('limit must be an integer')
+    if limit < 1:
+        raise ValueError('limit must be positive')
+
+    return min(limit, MAX_PAGE_SIZE), cursor
+
+def keyset_select(query, model, limit=None, cursor=None):
+    """Apply (created_at, id) ordering, cursor and limit to a query or select()
+
+    One row beyond ``limit`` is fetched so split_page can tell whether
+    another page follows.
+    """
+    query = query.order_by(model.created_at, model.id)
+
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.filter(tuple_(model.created_at, model.id) > tuple_(created_at, row_id))
+
+    if limit is not None:
+        query = query.limit(limit + 1)
+    return query
+
+def split_page(rows, limit=None):
+    """Trim the rows of a keyset_select query to ``(rows, next_cursor)``"""
+    if limit is None or len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1].created_at, rows[-1].id)
+
+def keyset_page(query, model, limit=None, cursor=None):
+    """Apply (created_at, id) keyset pagination to a query
+
+    Returns ``(rows, next_cursor)``. ``next_cursor`` is None on the last page
+    or when ``limit`` is None.
+    """
+    return split_page(keyset_select(query, model, limit, cursor).all(), limit)
@@ -0,0 +1,50 @@
+from datetime import datetime
+from sqlalchemy import select, update
+
+
+class VersionConflict(Exception):
+    """Raised when a row changed since the version the client last read"""
+
+    def __init__(self, current):
+        super().__init__('Modified by another request; reload and retry')
+        self.current = current
+
+
+class VersionRequired(ValueError):
+    """Raised when a conditional update is sent without the version it was based on"""
+
+
+def versioned_update(session, model, entity_id, values, expected_version, serialize, *columns):
+    """Update one row with a single ``UPDATE ... WHERE id AND version RETURNING``
+
+    Bumps the row's ``version`` and ``updated_at``; with ``expected_version``
+    None, whatever version is current is updated. Returns ``serialize`` of
+    the updated ``columns``, or None if there is no such row. Raises
+    VersionConflict carrying the serialized current row when the version
+    does not match.
+    """
+    statement = update(model).where(model.id == entity_id)
+    if expected_version is not None:
+        statement = statement.where(model.version == expected_version)
+    statement = statement.values(**values, version=model.version + 1, updated_at=datetime.utcnow()) \
+        .returning(*columns).execution_options(synchronize_session=False)
+
+    row = session.execute(statement).first()
+    if row is not None:
+        return serialize(row)
+    if expected_version is not None:
+        # Only the failure path pays for a second query, to tell 404 from 409
+        current = session.execute(select(*columns).where(model.id == entity_id)).first()
+        if current is not None:
+            session.rollback()
+            raise VersionConflict(serialize(current))
+    return None
+
+
+def parse_version(value):
+    """Validate the ``version`` a client sends back with an update"""
+    if value is None:
+        raise VersionRequired('version is required; send the version from the last read (or PUT to overwrite)')
+    if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+        raise ValueError('version must be a positive integer')
+    return value
@@ -0,0 +1,18 @@
+import os
+from dotenv import load_dotenv
+
+# Load environment variables before config reads them
+load_dotenv()
+
+# As in gunicorn.conf.py: uvicorn workers cannot see each other's in-process
+# cache, so share it on disk, relay change events between them and sum their metrics
+os.environ.setdefault('RESPONSE_CACHE_BACKEND', 'file')
+os.environ.setdefault('EVENTS_RELAY', 'socket')
+os.environ.setdefault('METRICS_MULTIPROCESS', 'true')
+
+from app.asgi import create_asgi_app
+
+# ASGI app: uvicorn asgi:application --workers N --timeout-graceful-shutdown 10
+# (event streams never finish on their own, hence the graceful shutdown timeout)
+config_name = os.environ.get('FLASK_ENV', 'development')
+application = create_asgi_app(config_name)
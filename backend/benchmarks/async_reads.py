@@ -0,0 +1,130 @@
+"""Benchmark: sync read path (gunicorn) vs the async ASGI read API (uvicorn)
+
+Generates a scratch SQLite dataset, starts each server on a free port and
+holds ``--connections`` concurrent keep-alive connections open against
+the read endpoints for ``--duration`` seconds, using a small asyncio
+HTTP/1.1 client so the load generator itself is not thread-bound. The
+response cache is disabled on both servers (pass --cache to keep it) so
+the database and serialization work is what gets measured.
+
+Usage (from backend/):
+    python -m benchmarks.async_reads [--connections 1000] [--duration 20] [--workers N]
+"""
+import argparse
+import asyncio
+import os
+import random
+import resource
+import signal
+import time
+from collections import defaultdict
+
+# Imported first: points DATABASE_URL at a scratch database before app is imported
+from benchmarks.serving import free_port, wait_until_ready, start_server
+
+from flask_jwt_extended import create_access_token
+from app import create_app, db
+from app.models import Category
+from app.services import AuthService
+from benchmarks.dataset import generate
+from benchmarks.loadtest import report
+
+PATHS = {
+    'tree': '/api/categories?limit=20',
+    'features': '/api/categories/{category_id}/features?limit=50',
+    'facets': '/api/features?priority=High&limit=50',
+}
+
+
+async def connection(host, port, token, category_ids, deadline, results, errors, seed):
+    rng = random.Random(seed)
+    reader = writer = None
+    while time.perf_counter() < deadline:
+        operation = rng.choice(list(PATHS))
+        path = PATHS[operation].format(category_id=rng.choice(category_ids))
+        request = (f'GET {path} HTTP/1.1\r\nHost: {host}\r\nAuthorization: Bearer {token}\r\n\r\n').encode()
+
+        start = time.perf_counter()
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection(host, port)
+            writer.write(request)
+            status_line = await reader.readline()
+            headers = {}
+            while (line := await reader.readline()) not in (b'\r\n', b''):
+                name, _, value = line.decode().partition(':')
+                headers[name.strip().lower()] = value.strip()
+            await reader.readexactly(int(headers.get('content-length', 0)))
+            status = int(status_line.split()[1])
+        except (OSError, asyncio.IncompleteReadError, IndexError, ValueError):
+            errors[operation] += 1
+            writer = None
+            await asyncio.sleep(0.05)
+            continue
+        elapsed = time.perf_counter() - start
+
+        if headers.get('connection', '').lower() == 'close':
+            writer.close()
+            writer = None
+        if status != 200:
+            errors[operation] += 1
+        else:
+            results[operation].append(elapsed)
+
+    if writer is not None:
+        writer.close()
+
+
+async def drive(port, token, category_ids, connections, duration):
+    results = defaultdict(list)
+    errors = defaultdict(int)
+    deadline = time.perf_counter() + duration
+    started = time.perf_counter()
+    await asyncio.gather(*[
+        connection('127.0.0.1', port, token, category_ids, deadline, results, errors, seed)
+        for seed in range(connections)
+    ])
+    return results, errors, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--connections', type=int, default=1000)
+    parser.add_argument('--duration', type=float, default=20)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() * 2 + 1)
+    parser.add_argument('--categories', type=int, default=50)
+    parser.add_argument('--features-per-category', type=int, default=50)
+    parser.add_argument('--servers', default='gunicorn,uvicorn')
+    parser.add_argument('--cache', action='store_true', help='Keep the response cache enabled')
+    args = parser.parse_args()
+
+    # Each connection needs a file descriptor in this process
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (max(soft, min(hard, args.connections + 256)), hard))
+    if not args.cache:
+        os.environ['RESPONSE_CACHE_BACKEND'] = 'none'
+
+    app = create_app('development')
+    with app.app_context():
+        db.create_all()
+        generate(args.categories, args.features_per_category)
+        user = AuthService.create_user('bench', 'bench@example.com', 'bench-password')
+        token = create_access_token(identity=str(user.id))
+        category_ids = [category.id for category in Category.query.all()]
+
+    for kind in args.servers.split(','):
+        port = free_port()
+        process = start_server(kind, port, args.workers)
+        try:
+            wait_until_ready(f'http://127.0.0.1:{port}')
+            label = 'sync (gunicorn)' if kind == 'gunicorn' else 'async (uvicorn)'
+            print(f'\n== {label}, {args.workers} workers: {args.connections} connections for {args.duration:.0f}s')
+            results, errors, elapsed = asyncio.run(drive(port, token, category_ids, args.connections, args.duration))
+            report(results, errors, elapsed)
+        finally:
+            os.killpg(process.pid, signal.SIGTERM)
+            process.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""Benchmark: category tree response size and cost per content encoding
+
+Generates a scratch SQLite dataset, then for each encoding the app offers
+requests the full tree through the Flask test client: once with the
+response cache disabled (build and compress on every request) and once
+with it enabled (compressed bytes served from the cache).
+
+Usage (from backend/):
+    python -m benchmarks.compression [--features 50000] [--categories 50] [--repeat 5]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+# Always run against a scratch database; config reads DATABASE_URL at import
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'compression.db')}"
+
+from flask_jwt_extended import create_access_token
+
+from app import create_app, db
+from app.cache import response_cache, NullBackend, LRUBackend
+from app.compression import compression
+from app.services import AuthService
+from benchmarks.dataset import generate
+
+
+def best_of(client, headers, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = client.get('/api/categories', headers=headers)
+        best = min(best, time.perf_counter() - start)
+        assert response.status_code == 200, response.status_code
+    return best, len(response.data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--features', type=int, default=50000)
+    parser.add_argument('--categories', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    app = create_app('development')
+
+    with app.app_context():
+        db.create_all()
+        generate(args.categories, args.features // args.categories)
+        user = AuthService.create_user('bench', 'bench@example.com', 'bench-password')
+        token = create_access_token(identity=str(user.id))
+        db.session.remove()
+
+    print(f'{args.categories} categories, {args.features} features (best of {args.repeat})')
+    client = app.test_client()
+    for encoding in ['identity', *compression.encoders]:
+        headers = {'Authorization': f'Bearer {token}', 'Accept-Encoding': encoding}
+
+        response_cache.backend = NullBackend()
+        uncached, size = best_of(client, headers, args.repeat)
+        response_cache.backend = LRUBackend()
+        cached, _ = best_of(client, headers, args.repeat)
+
+        print(f'{encoding:<9} {size / 1024:9.0f} KiB   uncached {uncached * 1000:8.1f} ms   '
+              f'cached {cached * 1000:6.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
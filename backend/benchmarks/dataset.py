@@ -0,0 +1,151 @@
+"""Synthetic dataset generator for production-sized workspaces
+
+Generates N categories x M features with log-normally distributed text
+lengths, a configurable release-date spread and a pool of customer names,
+and bulk-inserts them. Run as a script it writes to a new scratch SQLite
+file unless ``--database-url`` names a database.
+
+Usage (from backend/):
+    python -m benchmarks.dataset --categories 200 --features-per-category 500
+    python -m benchmarks.dataset --database-url postgresql://localhost/prd_bench --clear ...
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+from benchmarks.scratch import add_database_argument, select_database
+
+if __name__ == '__main__':
+    select_database('dataset.db')
+
+from app import create_app, db
+from app.cache import response_cache
+from app.models import Category, Feature, Priority, TShirtSize, release_month, format_release_month
+from app.services import IdService, WorkspaceService
+
+WORDS = (
+    'user account dashboard report export billing invoice payment mobile offline sync search '
+    'filter notification email integration api webhook latency cache onboarding permission role '
+    'audit security compliance analytics chart roadmap release customer enterprise workflow '
+    'approval template migration performance scale retention engagement conversion metric'
+).split()
+
+
+def sentence(rng, mean_words):
+    """Text whose word count is log-normally distributed around ``mean_words``"""
+    if mean_words <= 0:
+        return ''
+    count = max(1, int(rng.lognormvariate(0, 0.5) * mean_words))
+    return ' '.join(rng.choice(WORDS) for _ in range(count)).capitalize() + '.'
+
+
+def generate(num_categories, features_per_category, description_words=40, comment_words=12,
+             release_start='2024-01', release_months=24, unscheduled=0.1, customers=50,
+             seed=0, batch_size=5000, progress=None):
+    """Insert a synthetic workspace and return ``(categories, features)`` counts
+
+    Must run inside an app context. Categories and features get IDs in the
+    usual "3" / "3.7" format and the ID counters are resynced afterwards.
+    """
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    first_month = release_month(release_start)
+    customer_names = [f'Customer {i}' for i in range(customers)] or [None]
+    priorities, sizes = list(Priority), list(TShirtSize)
+
+    start_id = IdService.next_category_id()
+    category_ids = [str(int(start_id) + offset) for offset in range(num_categories)]
+    db.session.execute(db.insert(Category), [
+        {'id': category_id, 'name': f'Category {category_id}', 'description': sentence(rng, description_words // 2),
+         'created_at': now + timedelta(milliseconds=index), 'updated_at': now}
+        for index, category_id in enumerate(category_ids)
+    ])
+
+    rows = []
+    inserted = 0
+    for index in range(num_categories * features_per_category):
+        category_id = category_ids[index % num_categories]
+        seq = index // num_categories + 1
+        if rng.random() < unscheduled:
+            month = None
+        else:
+            month = first_month + rng.randrange(release_months)
+
+        rows.append({
+            'id': f'{category_id}.{seq}',
+            'category_id': category_id,
+            'title': sentence(rng, 5).rstrip('.'),
+            'priority': rng.choice(priorities),
+            'description': sentence(rng, description_words),
+            'kpi': sentence(rng, 8),
+            'customer_name': rng.choice(customer_names),
+            'engineering_comment': sentence(rng, comment_words),
+            'engineering_signoff': rng.random() < 0.4,
+            'engineering_complexity': rng.choice(sizes),
+            'release_date': format_release_month(month) if month else '',
+            'release_month': month,
+            'created_at': now + timedelta(microseconds=index),
+            'updated_at': now,
+        })
+
+        if len(rows) >= batch_size:
+            db.session.execute(db.insert(Feature), rows)
+            inserted += len(rows)
+            rows = []
+            if progress:
+                progress(inserted)
+
+    if rows:
+        db.session.execute(db.insert(Feature), rows)
+        inserted += len(rows)
+        if progress:
+            progress(inserted)
+
+    db.session.flush()
+    IdService.resync()
+    WorkspaceService.bump_version()
+    db.session.commit()
+    response_cache.clear()
+    return num_categories, inserted
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--categories', type=int, default=100)
+    parser.add_argument('--features-per-category', type=int, default=100)
+    parser.add_argument('--description-words', type=int, default=40, help='Mean description length in words')
+    parser.add_argument('--comment-words', type=int, default=12, help='Mean engineering comment length in words')
+    parser.add_argument('--release-start', default='2024-01', help='First release month (YYYY-MM)')
+    parser.add_argument('--release-months', type=int, default=24, help='Months the releases are spread over')
+    parser.add_argument('--unscheduled', type=float, default=0.1, help='Fraction of features without a release date')
+    parser.add_argument('--customers', type=int, default=50, help='Size of the customer name pool')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--clear', action='store_true', help='Delete existing categories and features first')
+    parser.add_argument('--config', default='development')
+    add_database_argument(parser)
+    args = parser.parse_args()
+
+    app = create_app(args.config)
+    with app.app_context():
+        print(f'database: {db.engine.url.render_as_string(hide_password=True)}')
+        db.create_all()
+        if args.clear:
+            Feature.query.delete()
+            Category.query.delete()
+            db.session.commit()
+
+        start = time.perf_counter()
+        categories, features = generate(
+            args.categories, args.features_per_category,
+            description_words=args.description_words, comment_words=args.comment_words,
+            release_start=args.release_start, release_months=args.release_months,
+            unscheduled=args.unscheduled, customers=args.customers, seed=args.seed,
+            progress=lambda count: print(f'{count} features inserted', flush=True)
+        )
+        print(f'Generated {categories} categories and {features} features '
+              f'in {time.perf_counter() - start:.1f}s')
+
+
+if __name__ == '__main__':
+    main()
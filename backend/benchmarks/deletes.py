@@ -0,0 +1,99 @@
+"""Benchmark: ORM cascade deletes vs single-statement database-side deletes
+
+Generates a scratch SQLite dataset and, for equally sized targets, times:
+
+- deleting a category: legacy loads every feature into the session and
+  deletes them one by one before the category; the service issues one
+  DELETE and lets ON DELETE CASCADE remove the features
+- deleting the features matching a filter: legacy loads and deletes each
+  one; ``FeatureService.delete_features`` issues one DELETE
+
+Both paths write the same sync tombstones.
+
+Usage (from backend/):
+    python -m benchmarks.deletes [--features 20000] [--categories 4]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+# Always run against a scratch database; config reads DATABASE_URL at import
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'deletes.db')}"
+
+from app import create_app, db
+from app.models import Category, Feature, Priority
+from app.services import CategoryService, FeatureService, SyncService, WorkspaceService
+from benchmarks.dataset import generate
+
+
+def legacy_delete_category(category_id):
+    """CategoryService.delete_category as it was before passive deletes"""
+    category = db.session.get(Category, category_id)
+    SyncService.record_category_delete(category_id)
+    for feature in category.features.all():
+        db.session.delete(feature)
+    db.session.delete(category)
+    WorkspaceService.bump_version()
+    db.session.commit()
+
+
+def legacy_delete_features(category_id, priority):
+    """Deleting the features matching a filter through the ORM, one row at a time"""
+    features = Feature.query.filter_by(category_id=category_id, priority=priority).all()
+    SyncService.record_feature_deletes({feature.id: feature.category_id for feature in features})
+    for feature in features:
+        db.session.delete(feature)
+    WorkspaceService.bump_version()
+    db.session.commit()
+    return len(features)
+
+
+def timed(label, action, count):
+    db.session.expunge_all()
+    start = time.perf_counter()
+    action()
+    elapsed = time.perf_counter() - start
+    print(f'{label:<32} {elapsed * 1000:9.1f} ms   {count} features')
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--features', type=int, default=20000)
+    parser.add_argument('--categories', type=int, default=4)
+    args = parser.parse_args()
+    if args.categories < 4:
+        parser.error('--categories must be at least 4')
+
+    app = create_app('development')
+
+    with app.app_context():
+        db.create_all()
+        per_category = args.features // args.categories
+        generate(args.categories, per_category)
+        category_ids = [category.id for category in Category.query.order_by(Category.created_at)]
+        print(f'{args.categories} categories x {per_category} features')
+
+        def priority_count(category_id):
+            return Feature.query.filter_by(category_id=category_id, priority=Priority.LOW).count()
+
+        # Filtered deletes on the first two categories, whole-category deletes on the rest
+        first, second = category_ids[0], category_ids[1]
+        legacy = timed('features by filter, ORM rows', lambda: legacy_delete_features(first, Priority.LOW),
+                       priority_count(first))
+        bulk = timed('features by filter, one DELETE',
+                     lambda: FeatureService.delete_features({'categoryId': [second], 'priority': [Priority.LOW]}),
+                     priority_count(second))
+        print(f'{"speedup":<32} {legacy / bulk:9.1f}x')
+
+        third, fourth = category_ids[2], category_ids[3]
+        legacy = timed('category, ORM cascade', lambda: legacy_delete_category(third), per_category)
+        bulk = timed('category, ON DELETE CASCADE', lambda: CategoryService.delete_category(fourth), per_category)
+        print(f'{"speedup":<32} {legacy / bulk:9.1f}x')
+
+        assert Feature.query.filter(Feature.category_id.in_([third, fourth])).count() == 0
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""Benchmark: full representations vs sparse fieldsets on the read endpoints
+
+Generates a scratch SQLite dataset and requests each endpoint through the
+Flask test client, once with every field and once with ``fields`` limited
+to what a list or board view needs. The response cache is disabled so the
+query and serialization work is what gets measured.
+
+Usage (from backend/):
+    python -m benchmarks.fieldsets [--features 50000] [--categories 50] [--repeat 5]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+# Always run against a scratch database; config reads DATABASE_URL at import
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'fieldsets.db')}"
+os.environ['RESPONSE_CACHE_BACKEND'] = 'none'
+
+from flask_jwt_extended import create_access_token
+
+from app import create_app, db
+from app.models import Category
+from app.services import AuthService
+from benchmarks.dataset import generate
+
+SPARSE_FIELDS = 'id,title,priority,releaseDate'
+
+ENDPOINTS = {
+    'tree': '/api/categories',
+    'features': '/api/categories/{category_id}/features?limit=500',
+    'facets': '/api/features?priority=High&limit=500',
+    'roadmap': '/api/roadmap',
+}
+
+
+def measure(client, headers, path, repeat):
+    best = float('inf')
+    size = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = client.get(path, headers=headers)
+        best = min(best, time.perf_counter() - start)
+        assert response.status_code == 200, (path, response.status_code)
+        size = len(response.data)
+    return best, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--features', type=int, default=50000)
+    parser.add_argument('--categories', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    app = create_app('development')
+
+    with app.app_context():
+        db.create_all()
+        generate(args.categories, args.features // args.categories)
+        user = AuthService.create_user('bench', 'bench@example.com', 'bench-password')
+        headers = {'Authorization': f'Bearer {create_access_token(identity=str(user.id))}'}
+        category_id = Category.query.first().id
+        db.session.remove()
+
+    print(f'{args.categories} categories, {args.features} features, fields={SPARSE_FIELDS} '
+          f'(best of {args.repeat})')
+    client = app.test_client()
+    for name, path in ENDPOINTS.items():
+        path = path.format(category_id=category_id)
+        full_time, full_size = measure(client, headers, path, args.repeat)
+        separator = '&' if '?' in path else '?'
+        sparse_time, sparse_size = measure(client, headers, f'{path}{separator}fields={SPARSE_FIELDS}',
+                                           args.repeat)
+        print(f'{name:<9} full {full_time * 1000:8.1f} ms {full_size / 1024:9.0f} KiB   '
+              f'sparse {sparse_time * 1000:8.1f} ms {sparse_size / 1024:9.0f} KiB   '
+              f'{full_time / sparse_time:4.1f}x faster, {full_size / sparse_size:4.1f}x smaller')
+
+
+if __name__ == '__main__':
+    main()
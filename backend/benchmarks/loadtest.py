@@ -0,0 +1,199 @@
+"""End-to-end load harness for the PRD Manager API
+
+Each virtual user logs in once and then loops over a weighted mix of tree
+reads and feature create/update/delete calls. Requests go either through
+the Flask app in-process (default; exercises the full WSGI stack and the
+database, minus the network) or over HTTP to a running server (--url).
+Reports p50/p95/p99 latency and throughput per operation. In-process runs
+use a new scratch SQLite file unless ``--database-url`` names a database.
+
+Usage (from backend/):
+    python -m benchmarks.loadtest --generate --categories 100 --features-per-category 200
+    python -m benchmarks.loadtest --database-url postgresql://localhost/prd_bench --generate --clear
+    python -m benchmarks.loadtest --url http://localhost:5000 --users 32 --duration 60
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import threading
+import time
+import uuid
+from collections import defaultdict
+from urllib import request as urllib_request
+from urllib.error import HTTPError
+
+from benchmarks.scratch import add_database_argument, select_database
+
+if __name__ == '__main__':
+    select_database('loadtest.db')
+
+from app import create_app, db
+
+DEFAULT_MIX = {'tree': 70, 'create': 10, 'update': 10, 'delete': 10}
+
+
+class InProcessClient:
+    """Minimal client over the Flask test client"""
+
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def call(self, method, path, body=None, token=None):
+        headers = {'Authorization': f'Bearer {token}'} if token else {}
+        response = self.client.open(path, method=method, json=body, headers=headers)
+        return response.status_code, response.get_json(silent=True)
+
+
+class HTTPClient:
+    """Minimal client over urllib against a running server"""
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+
+    def call(self, method, path, body=None, token=None):
+        headers = {'Content-Type': 'application/json'}
+        if token:
+            headers['Authorization'] = f'Bearer {token}'
+        data = json.dumps(body).encode() if body is not None else None
+        req = urllib_request.Request(self.base_url + path, data=data, headers=headers, method=method)
+        try:
+            with urllib_request.urlopen(req) as response:
+                payload = response.read()
+                return response.status, json.loads(payload) if payload else None
+        except HTTPError as e:
+            return e.code, None
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def virtual_user(client, mix, deadline, results, errors, seed):
+    rng = random.Random(seed)
+    username = f'load-{uuid.uuid4().hex[:12]}'
+    client.call('POST', '/api/auth/register', {'username': username, 'email': f'{username}@example.com',
+                                               'password': 'load-test-password'})
+    status, body = client.call('POST', '/api/auth/login', {'username': username, 'password': 'load-test-password'})
+    if status != 200:
+        errors['login'] += 1
+        return
+    token = body['access_token']
+
+    status, tree = client.call('GET', '/api/categories?limit=50', token=token)
+    category_ids = [category['id'] for category in tree or []] or ['1']
+    created = []
+    operations, weights = zip(*mix.items())
+
+    while time.perf_counter() < deadline:
+        operation = rng.choices(operations, weights)[0]
+        if operation in ('update', 'delete') and not created:
+            operation = 'create'
+
+        if operation == 'tree':
+            call = ('GET', '/api/categories', None)
+        elif operation == 'create':
+            call = ('POST', f'/api/categories/{rng.choice(category_ids)}/features',
+                    {'title': f'Load test {rng.random():.6f}', 'priority': 'Medium'})
+        elif operation == 'update':
+            call = ('PUT', f'/api/features/{rng.choice(created)}', {'kpi': f'Updated {rng.random():.6f}'})
+        else:
+            call = ('DELETE', f'/api/features/{created.pop(rng.randrange(len(created)))}', None)
+
+        start = time.perf_counter()
+        status, body = client.call(*call, token=token)
+        elapsed = time.perf_counter() - start
+
+        if status >= 400:
+            errors[operation] += 1
+            continue
+        results[operation].append(elapsed)
+        if operation == 'create':
+            created.append(body['id'])
+
+
+def run(client_factory, users, duration, mix):
+    results = defaultdict(list)
+    errors = defaultdict(int)
+    deadline = time.perf_counter() + duration
+    threads = [
+        threading.Thread(target=virtual_user, args=(client_factory(), mix, deadline, results, errors, seed))
+        for seed in range(users)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, errors, time.perf_counter() - started
+
+
+def report(results, errors, elapsed):
+    print(f"{'operation':<10} {'count':>8} {'errors':>7} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    total = 0
+    for operation in sorted(set(results) | set(errors)):
+        latencies = sorted(results.get(operation, []))
+        total += len(latencies)
+        print(f'{operation:<10} {len(latencies):>8} {errors.get(operation, 0):>7} {len(latencies) / elapsed:>9.1f} '
+              f'{percentile(latencies, 0.50) * 1000:>9.1f} {percentile(latencies, 0.95) * 1000:>9.1f} '
+              f'{percentile(latencies, 0.99) * 1000:>9.1f}')
+    all_latencies = sorted(value for values in results.values() for value in values)
+    print(f"{'total':<10} {total:>8} {sum(errors.values()):>7} {total / elapsed:>9.1f} "
+          f'{percentile(all_latencies, 0.50) * 1000:>9.1f} {percentile(all_latencies, 0.95) * 1000:>9.1f} '
+          f'{percentile(all_latencies, 0.99) * 1000:>9.1f}')
+    if all_latencies:
+        print(f'mean {statistics.mean(all_latencies) * 1000:.1f} ms over {elapsed:.1f}s')
+
+
+def parse_mix(value):
+    mix = dict(DEFAULT_MIX)
+    for part in value.split(','):
+        name, weight = part.split('=')
+        if name not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f'Unknown operation: {name}')
+        mix[name] = int(weight)
+    return mix
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', help='Base URL of a running server; in-process when omitted')
+    parser.add_argument('--users', type=int, default=8, help='Concurrent virtual users')
+    parser.add_argument('--duration', type=float, default=20, help='Seconds to run')
+    parser.add_argument('--mix', type=parse_mix, default=DEFAULT_MIX, help='e.g. tree=80,create=10,update=10,delete=0')
+    parser.add_argument('--generate', action='store_true', help='Generate a synthetic dataset first (in-process only)')
+    parser.add_argument('--clear', action='store_true', help='With --generate, delete existing data first')
+    parser.add_argument('--categories', type=int, default=100)
+    parser.add_argument('--features-per-category', type=int, default=100)
+    parser.add_argument('--config', default=os.environ.get('FLASK_ENV', 'development'))
+    add_database_argument(parser)
+    args = parser.parse_args()
+
+    if args.url:
+        client_factory = lambda: HTTPClient(args.url)
+    else:
+        app = create_app(args.config)
+        with app.app_context():
+            db.create_all()
+            if args.generate:
+                from app.models import Category, Feature
+                from benchmarks.dataset import generate
+                if args.clear:
+                    Feature.query.delete()
+                    Category.query.delete()
+                    db.session.commit()
+                generate(args.categories, args.features_per_category)
+            print(f'database: {db.engine.url.render_as_string(hide_password=True)}')
+        client_factory = lambda: InProcessClient(app)
+
+    print(f'{args.users} users for {args.duration:.0f}s, mix {args.mix}')
+    results, errors, elapsed = run(client_factory, args.users, args.duration, args.mix)
+    report(results, errors, elapsed)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,26 @@
+"""Database selection for benchmark entry points that can write to a real database
+
+The dataset generator and the load harness create tables, insert data and
+(with ``--clear``) delete everything, so like the other benchmarks they
+run against a throwaway SQLite file unless ``--database-url`` names the
+database explicitly; an inherited DATABASE_URL is never used.
+"""
+import argparse
+import os
+import tempfile
+
+
+def add_database_argument(parser):
+    parser.add_argument('--database-url', help='Database to use instead of a scratch SQLite file')
+
+
+def select_database(name):
+    """Point DATABASE_URL at ``--database-url`` or a new scratch file; returns the URL
+
+    Config reads DATABASE_URL when app is first imported, so call this before that.
+    """
+    parser = argparse.ArgumentParser(add_help=False)
+    add_database_argument(parser)
+    args, _ = parser.parse_known_args()
+    os.environ['DATABASE_URL'] = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), name)}"
+    return os.environ['DATABASE_URL']
@@ -0,0 +1,96 @@
+"""Microbenchmark: category tree serialization, legacy path vs fast path
+
+Legacy: ORM objects -> per-row to_dict() with a hand-written key mapping ->
+Flask's default stdlib JSON provider. Fast: row tuples -> precompiled
+FEATURE_SERIALIZER -> FastJSONProvider.
+
+Usage (from backend/):
+    python -m benchmarks.serialization [--features 50000] [--categories 50] [--repeat 5]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+# Always run against a scratch database; config reads DATABASE_URL at import
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+
+from flask.json.provider import DefaultJSONProvider
+
+from app import create_app, db
+from app.models import Category
+from app.services import CategoryService
+from benchmarks.dataset import generate
+
+
+def legacy_feature_dict(feature):
+    """Feature.to_dict() as it was before precompiled serializers"""
+    return {
+        'id': feature.id,
+        'title': feature.title,
+        'priority': feature.priority.value,
+        'description': feature.description,
+        'kpi': feature.kpi,
+        'customerName': feature.customer_name,
+        'engineeringComment': feature.engineering_comment,
+        'engineeringSignoff': feature.engineering_signoff,
+        'engineeringComplexity': feature.engineering_complexity.value,
+        'releaseDate': feature.release_date
+    }
+
+
+def legacy_tree():
+    categories = Category.query.all()
+    return [
+        {'id': c.id, 'name': c.name, 'description': c.description,
+         'features': [legacy_feature_dict(f) for f in c.features.all()]}
+        for c in categories
+    ]
+
+
+def fast_tree():
+    categories, _ = CategoryService.get_category_tree()
+    return categories
+
+
+def timed(label, build, encode, repeat):
+    best_build = best_encode = float('inf')
+    size = 0
+    for _ in range(repeat):
+        db.session.expunge_all()
+        start = time.perf_counter()
+        payload = build()
+        built = time.perf_counter()
+        body = encode(payload)
+        done = time.perf_counter()
+        best_build = min(best_build, built - start)
+        best_encode = min(best_encode, done - built)
+        size = len(body)
+    total = best_build + best_encode
+    print(f'{label:<8} build {best_build * 1000:8.1f} ms   encode {best_encode * 1000:8.1f} ms   '
+          f'total {total * 1000:8.1f} ms   {size / 1024 / 1024:.1f} MiB')
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--features', type=int, default=50000)
+    parser.add_argument('--categories', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    app = create_app('development')
+
+    with app.app_context():
+        db.create_all()
+        generate(args.categories, args.features // args.categories)
+        print(f'{args.categories} categories, {args.features} features (best of {args.repeat})')
+
+        legacy_provider = DefaultJSONProvider(app)
+        legacy = timed('legacy', legacy_tree, legacy_provider.dumps, args.repeat)
+        fast = timed('fast', fast_tree, app.json.dumps, args.repeat)
+        print(f'speedup  {legacy / fast:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
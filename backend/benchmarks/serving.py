@@ -0,0 +1,96 @@
+"""Benchmark: development server (python run.py) vs gunicorn preforked workers
+
+Generates a scratch SQLite dataset, starts each server on a free port,
+drives it over HTTP with the load harness and prints the results.
+
+Usage (from backend/):
+    python -m benchmarks.serving [--users 16] [--duration 15] [--workers N]
+"""
+import argparse
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from urllib import request as urllib_request
+from urllib.error import URLError
+
+# Always run against a scratch database; config reads DATABASE_URL at import
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'serving.db')}"
+
+from app import create_app, db
+from benchmarks.dataset import generate
+from benchmarks.loadtest import HTTPClient, run, report, parse_mix
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_ready(url, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            urllib_request.urlopen(url + '/metrics', timeout=1).read()
+            return
+        except (URLError, ConnectionError, OSError):
+            time.sleep(0.2)
+    raise RuntimeError(f'Server at {url} did not start')
+
+
+def start_server(kind, port, workers):
+    env = {**os.environ, 'PORT': str(port), 'FLASK_ENV': 'development'}
+    if kind == 'dev':
+        command = [sys.executable, 'run.py']
+    elif kind == 'uvicorn':
+        command = [sys.executable, '-m', 'uvicorn', 'asgi:application', '--host', '127.0.0.1', '--port', str(port),
+                   '--workers', str(workers), '--no-access-log', '--backlog', '4096']
+    else:
+        env['WEB_CONCURRENCY'] = str(workers)
+        env['GUNICORN_ACCESS_LOG'] = '/dev/null'
+        command = [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', '--bind', f'127.0.0.1:{port}', 'run:app']
+    return subprocess.Popen(command, cwd=BACKEND_DIR, env=env, start_new_session=True,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--users', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=15)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() * 2 + 1)
+    parser.add_argument('--categories', type=int, default=20)
+    parser.add_argument('--features-per-category', type=int, default=25)
+    parser.add_argument('--mix', type=parse_mix, default=parse_mix('tree=80,create=10,update=5,delete=5'))
+    parser.add_argument('--servers', default='dev,gunicorn')
+    args = parser.parse_args()
+
+    app = create_app('development')
+    with app.app_context():
+        db.create_all()
+        generate(args.categories, args.features_per_category)
+
+    for kind in args.servers.split(','):
+        port = free_port()
+        url = f'http://127.0.0.1:{port}'
+        process = start_server(kind, port, args.workers)
+        try:
+            wait_until_ready(url)
+            label = 'gunicorn' if kind != 'dev' else 'dev server'
+            if kind != 'dev':
+                label += f' ({args.workers} workers)'
+            print(f'\n== {label}: {args.users} users for {args.duration:.0f}s')
+            results, errors, elapsed = run(lambda: HTTPClient(url), args.users, args.duration, args.mix)
+            report(results, errors, elapsed)
+        finally:
+            os.killpg(process.pid, signal.SIGTERM)
+            process.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""Production server configuration
+
+    gunicorn -c gunicorn.conf.py run:app            # Flask app, sync/gthread workers
+    GUNICORN_WORKER_CLASS=uvicorn.workers.UvicornWorker \
+        gunicorn -c gunicorn.conf.py asgi:application   # ASGI read API (as in the Dockerfile)
+
+The app is imported once in the master (preload_app) and workers are
+forked from it. Each worker drops the connections it inherited, then warms
+its own DB pool and JWT setup in post_worker_init before it starts
+accepting requests. Send HUP to the master for a graceful reload; workers
+are also recycled after ``max_requests`` (with jitter so they do not all
+restart at once).
+"""
+import multiprocessing
+import os
+
+# Workers cannot see each other's in-process cache, so share it on disk
+os.environ.setdefault('RESPONSE_CACHE_BACKEND', 'file')
+# ...and relay change events between them
+os.environ.setdefault('EVENTS_RELAY', 'socket')
+# ...and answer a scrape with the metrics of all of them
+os.environ.setdefault('METRICS_MULTIPROCESS', 'true')
+
+bind = os.environ.get('BIND', f"0.0.0.0:{os.environ.get('PORT', '5000')}")
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+# Sync workers answer /api/events with 503; set GUNICORN_THREADS > 1 for the change
+# feed, or serve asgi:application with GUNICORN_WORKER_CLASS=uvicorn.workers.UvicornWorker
+threads = int(os.environ.get('GUNICORN_THREADS', 1))
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS') or ('gthread' if threads > 1 else 'sync')
+preload_app = True
+
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 10000))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', max_requests // 10))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-')
+errorlog = '-'
+
+
+def when_ready(server):
+    server.log.info('Preloaded app; forking %s %s workers', workers, worker_class)
+
+
+def flask_app(worker):
+    """The Flask app behind the loaded application, which may be the ASGI wrapper"""
+    app = worker.app.wsgi()
+    state = getattr(app, 'state', None)
+    return getattr(state, 'flask_app', app)
+
+
+def post_fork(server, worker):
+    # Connections opened in the master must not be shared across processes
+    from app import db
+    from app.async_db import async_db
+    with flask_app(worker).app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+    for engine in async_db.engines():
+        engine.sync_engine.dispose(close=False)
+
+
+def post_worker_init(worker):
+    """Warm the DB pool and JWT machinery before the worker takes traffic"""
+    from flask_jwt_extended import create_access_token, decode_token
+    from app import db
+    from app.services import WorkspaceService
+
+    with flask_app(worker).app_context():
+        pool_size = getattr(db.engine.pool, 'size', lambda: 1)()
+        connections = [db.engine.connect() for _ in range(max(1, pool_size))]
+        for connection in connections:
+            connection.exec_driver_sql('SELECT 1')
+        for connection in connections:
+            connection.close()
+
+        WorkspaceService.get_version()
+        db.session.remove()
+
+        decode_token(create_access_token(identity='warmup'))
+
+    worker.log.info('Worker %s warmed up', worker.pid)
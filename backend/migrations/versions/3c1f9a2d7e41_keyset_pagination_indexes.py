@@ -0,0 +1,33 @@
+"""Keyset pagination indexes
+
+Revision ID: 3c1f9a2d7e41
+Revises: 0b7587a64b37
+Create Date: 2026-10-18 09:12:40.118204
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '3c1f9a2d7e41'
+down_revision = '0b7587a64b37'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('categories', schema=None) as batch_op:
+        batch_op.create_index('ix_categories_created_at_id', ['created_at', 'id'], unique=False)
+
+    with op.batch_alter_table('features', schema=None) as batch_op:
+        batch_op.create_index('ix_features_created_at_id', ['created_at', 'id'], unique=False)
+        batch_op.create_index('ix_features_category_id_created_at_id', ['category_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('features', schema=None) as batch_op:
+        batch_op.drop_index('ix_features_category_id_created_at_id')
+        batch_op.drop_index('ix_features_created_at_id')
+
+    with op.batch_alter_table('categories', schema=None) as batch_op:
+        batch_op.drop_index('ix_categories_created_at_id')
@@ -0,0 +1,38 @@
+"""Delta sync: updated_at indexes and tombstones
+
+Revision ID: 4d7e1a9c3b60
+Revises: 9f6c3b8e1d52
+Create Date: 2026-10-18 14:52:31.208114
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4d7e1a9c3b60'
+down_revision = '9f6c3b8e1d52'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_categories_updated_at_id', 'categories', ['updated_at', 'id'], unique=False)
+    op.create_index('ix_features_updated_at_id', 'features', ['updated_at', 'id'], unique=False)
+
+    op.create_table('tombstones',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('entity', sa.String(length=20), nullable=False),
+    sa.Column('entity_id', sa.String(length=50), nullable=False),
+    sa.Column('category_id', sa.String(length=50), nullable=True),
+    sa.Column('deleted_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_tombstones_deleted_at', 'tombstones', ['deleted_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_tombstones_deleted_at', table_name='tombstones')
+    op.drop_table('tombstones')
+    op.drop_index('ix_features_updated_at_id', table_name='features')
+    op.drop_index('ix_categories_updated_at_id', table_name='categories')
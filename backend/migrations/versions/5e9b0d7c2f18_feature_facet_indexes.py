@@ -0,0 +1,31 @@
+"""Feature facet indexes
+
+Revision ID: 5e9b0d7c2f18
+Revises: d8a3f61c4e27
+Create Date: 2026-10-18 13:31:26.402871
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '5e9b0d7c2f18'
+down_revision = 'd8a3f61c4e27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Kept out of batch mode: a table rebuild on SQLite would drop the
+    # full-text triggers attached to features
+    op.create_index('ix_features_category_id_priority', 'features', ['category_id', 'priority'], unique=False)
+    op.create_index('ix_features_signoff_complexity', 'features', ['engineering_signoff', 'engineering_complexity'], unique=False)
+    op.create_index('ix_features_priority', 'features', ['priority'], unique=False)
+    op.create_index('ix_features_customer_name', 'features', ['customer_name'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_features_customer_name', table_name='features')
+    op.drop_index('ix_features_priority', table_name='features')
+    op.drop_index('ix_features_signoff_complexity', table_name='features')
+    op.drop_index('ix_features_category_id_priority', table_name='features')
@@ -0,0 +1,29 @@
+"""Workspace version counter
+
+Revision ID: 7a4e2c9b5d13
+Revises: 3c1f9a2d7e41
+Create Date: 2026-10-18 10:02:17.540913
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7a4e2c9b5d13'
+down_revision = '3c1f9a2d7e41'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    workspace_version = op.create_table('workspace_version',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.bulk_insert(workspace_version, [{'id': 1, 'version': 1}])
+
+
+def downgrade():
+    op.drop_table('workspace_version')
@@ -0,0 +1,36 @@
+"""Feature release month
+
+Revision ID: 9f6c3b8e1d52
+Revises: 5e9b0d7c2f18
+Create Date: 2026-10-18 14:18:09.651247
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9f6c3b8e1d52'
+down_revision = '5e9b0d7c2f18'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Kept out of batch mode so SQLite does not rebuild features and drop its
+    # full-text triggers
+    op.add_column('features', sa.Column('release_month', sa.Integer(), nullable=True))
+    op.create_index(op.f('ix_features_release_month'), 'features', ['release_month'], unique=False)
+
+    op.execute("""
+        UPDATE features
+        SET release_month = CAST(substr(release_date, 1, 4) AS INTEGER) * 12
+                          + CAST(substr(release_date, 6, 2) AS INTEGER)
+        WHERE release_date LIKE '____-__'
+          AND substr(release_date, 6, 2) BETWEEN '01' AND '12'
+    """)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_features_release_month'), table_name='features')
+    op.drop_column('features', 'release_month')
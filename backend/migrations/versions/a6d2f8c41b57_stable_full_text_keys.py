@@ -0,0 +1,104 @@
+"""Stable integer keys for the SQLite full-text index
+
+Revision ID: a6d2f8c41b57
+Revises: e3b7c1d9a254
+Create Date: 2026-10-18 16:05:12.417306
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'a6d2f8c41b57'
+down_revision = 'e3b7c1d9a254'
+branch_labels = None
+depends_on = None
+
+
+# The FTS5 index was keyed on features' implicit rowid, which VACUUM may
+# renumber since the primary key is a string. Key it on an INTEGER PRIMARY
+# KEY of its own instead, reading content through a view.
+DROP_INDEX = [
+    'DROP TRIGGER features_fts_au',
+    'DROP TRIGGER features_fts_ad',
+    'DROP TRIGGER features_fts_ai',
+    'DROP TABLE features_fts',
+]
+
+UPGRADE = [
+    """CREATE TABLE features_fts_keys (
+        key INTEGER PRIMARY KEY,
+        feature_id VARCHAR(50) NOT NULL UNIQUE
+    )""",
+    'INSERT INTO features_fts_keys(feature_id) SELECT id FROM features ORDER BY rowid',
+    """CREATE VIEW features_fts_content AS
+        SELECT keys.key, features.title, features.description, features.kpi, features.engineering_comment
+        FROM features_fts_keys AS keys JOIN features ON features.id = keys.feature_id""",
+    """CREATE VIRTUAL TABLE features_fts USING fts5(
+        title, description, kpi, engineering_comment,
+        content='features_fts_content', content_rowid='key'
+    )""",
+    """CREATE TRIGGER features_fts_ai AFTER INSERT ON features BEGIN
+        INSERT INTO features_fts_keys(feature_id) VALUES (new.id);
+        INSERT INTO features_fts(rowid, title, description, kpi, engineering_comment)
+        SELECT key, new.title, new.description, new.kpi, new.engineering_comment
+        FROM features_fts_keys WHERE feature_id = new.id;
+    END""",
+    """CREATE TRIGGER features_fts_ad AFTER DELETE ON features BEGIN
+        INSERT INTO features_fts(features_fts, rowid, title, description, kpi, engineering_comment)
+        SELECT 'delete', key, old.title, old.description, old.kpi, old.engineering_comment
+        FROM features_fts_keys WHERE feature_id = old.id;
+        DELETE FROM features_fts_keys WHERE feature_id = old.id;
+    END""",
+    """CREATE TRIGGER features_fts_au AFTER UPDATE ON features BEGIN
+        INSERT INTO features_fts(features_fts, rowid, title, description, kpi, engineering_comment)
+        SELECT 'delete', key, old.title, old.description, old.kpi, old.engineering_comment
+        FROM features_fts_keys WHERE feature_id = old.id;
+        UPDATE features_fts_keys SET feature_id = new.id WHERE feature_id = old.id;
+        INSERT INTO features_fts(rowid, title, description, kpi, engineering_comment)
+        SELECT key, new.title, new.description, new.kpi, new.engineering_comment
+        FROM features_fts_keys WHERE feature_id = new.id;
+    END""",
+    "INSERT INTO features_fts(features_fts) VALUES ('rebuild')",
+]
+
+DOWNGRADE = [
+    'DROP VIEW features_fts_content',
+    'DROP TABLE features_fts_keys',
+    """CREATE VIRTUAL TABLE features_fts USING fts5(
+        title, description, kpi, engineering_comment,
+        content='features', content_rowid='rowid'
+    )""",
+    """CREATE TRIGGER features_fts_ai AFTER INSERT ON features BEGIN
+        INSERT INTO features_fts(rowid, title, description, kpi, engineering_comment)
+        VALUES (new.rowid, new.title, new.description, new.kpi, new.engineering_comment);
+    END""",
+    """CREATE TRIGGER features_fts_ad AFTER DELETE ON features BEGIN
+        INSERT INTO features_fts(features_fts, rowid, title, description, kpi, engineering_comment)
+        VALUES ('delete', old.rowid, old.title, old.description, old.kpi, old.engineering_comment);
+    END""",
+    """CREATE TRIGGER features_fts_au AFTER UPDATE ON features BEGIN
+        INSERT INTO features_fts(features_fts, rowid, title, description, kpi, engineering_comment)
+        VALUES ('delete', old.rowid, old.title, old.description, old.kpi, old.engineering_comment);
+        INSERT INTO features_fts(rowid, title, description, kpi, engineering_comment)
+        VALUES (new.rowid, new.title, new.description, new.kpi, new.engineering_comment);
+    END""",
+    "INSERT INTO features_fts(features_fts) VALUES ('rebuild')",
+]
+
+
+def upgrade():
+    # PostgreSQL's tsvector column needs no key
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    for statement in DROP_INDEX + UPGRADE:
+        op.execute(statement)
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    for statement in DROP_INDEX + DOWNGRADE:
+        op.execute(statement)
@@ -0,0 +1,51 @@
+"""ID allocation counters
+
+Revision ID: b52d8e6f1a90
+Revises: 7a4e2c9b5d13
+Create Date: 2026-10-18 11:25:03.776120
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b52d8e6f1a90'
+down_revision = '7a4e2c9b5d13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    id_counters = op.create_table('id_counters',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('next_value', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+    with op.batch_alter_table('categories', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('next_feature_seq', sa.Integer(), server_default='1', nullable=False))
+
+    # Start every counter above the highest ID in use so deleted IDs are never reused
+    bind = op.get_bind()
+    category_ids = [row[0] for row in bind.execute(sa.text('SELECT id FROM categories'))]
+    next_category = max((int(value) for value in category_ids if value.isdigit()), default=0) + 1
+    op.bulk_insert(id_counters, [{'name': 'category', 'next_value': next_category}])
+
+    suffixes = {}
+    for feature_id, category_id in bind.execute(sa.text('SELECT id, category_id FROM features')):
+        suffix = feature_id.rsplit('.', 1)[-1]
+        if suffix.isdigit():
+            suffixes[category_id] = max(suffixes.get(category_id, 0), int(suffix))
+
+    for category_id, last_seq in suffixes.items():
+        bind.execute(
+            sa.text('UPDATE categories SET next_feature_seq = :seq WHERE id = :id'),
+            {'seq': last_seq + 1, 'id': category_id}
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('categories', schema=None) as batch_op:
+        batch_op.drop_column('next_feature_seq')
+
+    op.drop_table('id_counters')
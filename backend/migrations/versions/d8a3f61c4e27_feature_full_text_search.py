@@ -0,0 +1,87 @@
+"""Feature full-text search
+
+Revision ID: d8a3f61c4e27
+Revises: b52d8e6f1a90
+Create Date: 2026-10-18 12:40:51.093318
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'd8a3f61c4e27'
+down_revision = 'b52d8e6f1a90'
+branch_labels = None
+depends_on = None
+
+
+SQLITE_UPGRADE = [
+    """CREATE VIRTUAL TABLE features_fts USING fts5(
+        title, description, kpi, engineering_comment,
+        content='features', content_rowid='rowid'
+    )""",
+    """CREATE TRIGGER features_fts_ai AFTER INSERT ON features BEGIN
+        INSERT INTO features_fts(rowid, title, description, kpi, engineering_comment)
+        VALUES (new.rowid, new.title, new.description, new.kpi, new.engineering_comment);
+    END""",
+    """CREATE TRIGGER features_fts_ad AFTER DELETE ON features BEGIN
+        INSERT INTO features_fts(features_fts, rowid, title, description, kpi, engineering_comment)
+        VALUES ('delete', old.rowid, old.title, old.description, old.kpi, old.engineering_comment);
+    END""",
+    """CREATE TRIGGER features_fts_au AFTER UPDATE ON features BEGIN
+        INSERT INTO features_fts(features_fts, rowid, title, description, kpi, engineering_comment)
+        VALUES ('delete', old.rowid, old.title, old.description, old.kpi, old.engineering_comment);
+        INSERT INTO features_fts(rowid, title, description, kpi, engineering_comment)
+        VALUES (new.rowid, new.title, new.description, new.kpi, new.engineering_comment);
+    END""",
+    "INSERT INTO features_fts(features_fts) VALUES ('rebuild')",
+]
+
+SQLITE_DOWNGRADE = [
+    'DROP TRIGGER features_fts_au',
+    'DROP TRIGGER features_fts_ad',
+    'DROP TRIGGER features_fts_ai',
+    'DROP TABLE features_fts',
+]
+
+POSTGRES_UPGRADE = [
+    """ALTER TABLE features ADD COLUMN search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(description, '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(kpi, '')), 'C') ||
+            setweight(to_tsvector('english', coalesce(engineering_comment, '')), 'C')
+        ) STORED""",
+    'CREATE INDEX ix_features_search_vector ON features USING GIN (search_vector)',
+]
+
+POSTGRES_DOWNGRADE = [
+    'DROP INDEX ix_features_search_vector',
+    'ALTER TABLE features DROP COLUMN search_vector',
+]
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        statements = SQLITE_UPGRADE
+    elif dialect == 'postgresql':
+        statements = POSTGRES_UPGRADE
+    else:
+        return
+
+    for statement in statements:
+        op.execute(statement)
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        statements = SQLITE_DOWNGRADE
+    elif dialect == 'postgresql':
+        statements = POSTGRES_DOWNGRADE
+    else:
+        return
+
+    for statement in statements:
+        op.execute(statement)
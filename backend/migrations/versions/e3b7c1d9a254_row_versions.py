@@ -0,0 +1,28 @@
+"""Row versions for optimistic concurrency
+
+Revision ID: e3b7c1d9a254
+Revises: 4d7e1a9c3b60
+Create Date: 2026-10-18 15:20:41.583902
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e3b7c1d9a254'
+down_revision = '4d7e1a9c3b60'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Kept out of batch mode so SQLite does not rebuild features and drop its
+    # full-text triggers
+    op.add_column('categories', sa.Column('version', sa.Integer(), nullable=False, server_default='1'))
+    op.add_column('features', sa.Column('version', sa.Integer(), nullable=False, server_default='1'))
+
+
+def downgrade():
+    op.drop_column('features', 'version')
+    op.drop_column('categories', 'version')
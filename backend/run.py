@@ -10,4 +10,5 @@ config_name = os.environ.get('FLASK_ENV', 'development')
 app = create_app(config_name)
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5000, debug=True)
+    # Development server only; production runs gunicorn -c gunicorn.conf.py run:app
+    app.run(host='0.0.0.0', port=int(os.environ.get('PORT', 5000)), debug=True)
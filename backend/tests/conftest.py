@@ -0,0 +1,31 @@
+import pytest
+from flask_jwt_extended import create_access_token
+
+from app import create_app, db
+from app.config import TestingConfig
+from app.services import AuthService
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    # A scratch database and slot directory per test instead of the instance folder
+    monkeypatch.setattr(TestingConfig, 'SQLALCHEMY_DATABASE_URI', f"sqlite:///{tmp_path / 'test.db'}")
+    monkeypatch.setattr(TestingConfig, 'PASSWORD_HASH_SLOT_DIR', str(tmp_path / 'password-slots'))
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        for engine in db.engines.values():
+            engine.dispose()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def auth_headers(app):
+    user = AuthService.create_user('tester', 'tester@example.com', 'tester-password')
+    return {'Authorization': f'Bearer {create_access_token(identity=str(user.id))}'}
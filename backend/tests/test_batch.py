@@ -0,0 +1,107 @@
+import pytest
+
+from app import db
+from app.models import Feature
+from app.services import CategoryService, FeatureService, WorkspaceService
+from app.services.feature_service import MAX_BATCH_SIZE
+
+BATCH_URL = '/api/features:batch'
+
+
+@pytest.fixture
+def category():
+    category = CategoryService.create_category('Batch')
+    FeatureService.create_feature(category.id, 'Existing')
+    FeatureService.create_feature(category.id, 'Doomed')
+    return category
+
+
+def feature_titles(category_id):
+    return sorted(db.session.execute(
+        db.select(Feature.title).where(Feature.category_id == category_id)
+    ).scalars())
+
+
+@pytest.mark.parametrize('body', [[], {'operations': 'create'}, {'operations': {'op': 'create'}}])
+def test_batch_rejects_malformed_body(client, auth_headers, body):
+    response = client.post(BATCH_URL, json=body, headers=auth_headers)
+    assert response.status_code == 400
+
+
+def test_batch_rejects_too_many_operations(client, auth_headers, category):
+    operations = [{'op': 'delete', 'id': f'{category.id}.1'}] * (MAX_BATCH_SIZE + 1)
+    response = client.post(BATCH_URL, json={'operations': operations}, headers=auth_headers)
+    assert response.status_code == 400
+    assert response.get_json()['errors'] == [{'index': None, 'error': f'At most {MAX_BATCH_SIZE} operations per batch'}]
+
+
+def test_batch_reports_every_invalid_operation_by_index(client, auth_headers, category):
+    operations = [
+        {'op': 'create', 'categoryId': category.id, 'data': {'title': 'Fine'}},
+        {'op': 'create', 'categoryId': category.id, 'data': {}},
+        {'op': 'create', 'categoryId': 'missing', 'data': {'title': 'Orphan'}},
+        {'op': 'update', 'id': f'{category.id}.1', 'data': {'priority': 'Huge'}},
+        {'op': 'delete', 'id': 'nope'},
+        {'op': 'rename', 'id': f'{category.id}.1'},
+        'not an object',
+    ]
+    response = client.post(BATCH_URL, json={'operations': operations}, headers=auth_headers)
+
+    assert response.status_code == 400
+    errors = response.get_json()['errors']
+    assert [error['index'] for error in errors] == [1, 2, 3, 4, 5, 6]
+    assert errors[0]['error'] == 'Title is required'
+    assert errors[1]['error'] == 'Category missing not found'
+    assert errors[3]['error'] == 'Feature nope not found'
+
+
+def test_batch_with_one_invalid_operation_writes_nothing(client, auth_headers, category):
+    version = WorkspaceService.get_version()
+    operations = [
+        {'op': 'create', 'categoryId': category.id, 'data': {'title': 'New'}},
+        {'op': 'update', 'id': f'{category.id}.1', 'data': {'title': 'Renamed'}},
+        {'op': 'delete', 'id': f'{category.id}.2'},
+        {'op': 'delete', 'id': f'{category.id}.99'},
+    ]
+    response = client.post(BATCH_URL, json={'operations': operations}, headers=auth_headers)
+
+    assert response.status_code == 400
+    assert response.get_json()['errors'] == [{'index': 3, 'error': f'Feature {category.id}.99 not found'}]
+    assert feature_titles(category.id) == ['Doomed', 'Existing']
+    assert WorkspaceService.get_version() == version
+
+
+def test_batch_rolls_back_when_applying_fails(client, auth_headers, category, monkeypatch):
+    def fail():
+        raise RuntimeError('version row locked')
+
+    monkeypatch.setattr(WorkspaceService, 'bump_version', fail)
+    operations = [
+        {'op': 'create', 'categoryId': category.id, 'data': {'title': 'New'}},
+        {'op': 'update', 'id': f'{category.id}.1', 'data': {'title': 'Renamed'}},
+        {'op': 'delete', 'id': f'{category.id}.2'},
+    ]
+    response = client.post(BATCH_URL, json={'operations': operations}, headers=auth_headers)
+    assert response.status_code == 500
+    assert response.get_json() == {'error': 'version row locked'}
+
+    # What the request teardown does; the test's app context outlives the request
+    db.session.remove()
+    assert feature_titles(category.id) == ['Doomed', 'Existing']
+
+
+def test_batch_applies_mixed_operations_in_order(client, auth_headers, category):
+    operations = [
+        {'op': 'delete', 'id': f'{category.id}.2'},
+        {'op': 'create', 'categoryId': category.id, 'data': {'title': 'New'}},
+        {'op': 'update', 'id': f'{category.id}.1', 'data': {'title': 'Renamed'}},
+    ]
+    response = client.post(BATCH_URL, json={'operations': operations}, headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.get_json()['results'] == [
+        {'index': 0, 'op': 'delete', 'id': f'{category.id}.2'},
+        {'index': 1, 'op': 'create', 'id': f'{category.id}.3'},
+        {'index': 2, 'op': 'update', 'id': f'{category.id}.1'},
+    ]
+    assert feature_titles(category.id) == ['New', 'Renamed']
@@ -0,0 +1,42 @@
+from sqlalchemy import event
+
+from app import db
+from app.services import CategoryService, FeatureService
+
+
+def add_categories(count, features_per_category=3):
+    for i in range(count):
+        category = CategoryService.create_category(f'Category {i}')
+        for j in range(features_per_category):
+            FeatureService.create_feature(category.id, f'Feature {i}.{j}')
+
+
+def count_queries(client, path, headers):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        response = client.get(path, headers=headers)
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+    assert response.status_code == 200
+    return len(statements), response.get_json()
+
+
+def test_category_tree_query_count_does_not_grow_with_categories(client, auth_headers):
+    add_categories(2)
+    # Warm the identity cache so both requests do the same work
+    client.get('/api/categories', headers=auth_headers)
+
+    few, tree = count_queries(client, '/api/categories', auth_headers)
+    assert len(tree) == 2
+
+    add_categories(8)
+    many, tree = count_queries(client, '/api/categories', auth_headers)
+    assert len(tree) == 10
+    assert all(len(category['features']) == 3 for category in tree)
+
+    assert many == few
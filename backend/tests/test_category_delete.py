@@ -0,0 +1,34 @@
+from app import db
+from app.models import Feature
+from app.services import CategoryService, FeatureService
+
+
+def search(client, headers, text):
+    response = client.get('/api/features/search', query_string={'q': text}, headers=headers)
+    assert response.status_code == 200
+    return sorted(feature['id'] for feature in response.get_json())
+
+
+def test_deleting_a_category_removes_its_features_and_search_hits(client, auth_headers):
+    doomed_id = CategoryService.create_category('Doomed').id
+    doomed_features = [FeatureService.create_feature(doomed_id, f'Quasar export {i}').id for i in range(3)]
+    kept_id = CategoryService.create_category('Kept').id
+    kept_feature = FeatureService.create_feature(kept_id, 'Quasar import').id
+    assert search(client, auth_headers, 'quasar') == sorted(doomed_features + [kept_feature])
+
+    assert client.delete(f'/api/categories/{doomed_id}', headers=auth_headers).status_code == 200
+
+    assert client.get(f'/api/categories/{doomed_id}', headers=auth_headers).status_code == 404
+    assert db.session.execute(
+        db.select(db.func.count()).select_from(Feature).where(Feature.category_id == doomed_id)
+    ).scalar() == 0
+    assert search(client, auth_headers, 'quasar') == [kept_feature]
+    assert search(client, auth_headers, 'export') == []
+
+    # The cascade fires the FTS delete trigger, so no index entries are left behind
+    index_keys = db.session.execute(db.text('SELECT feature_id FROM features_fts_keys')).scalars().all()
+    assert index_keys == [kept_feature]
+    indexed = db.session.execute(
+        db.text("SELECT count(*) FROM features_fts WHERE features_fts MATCH 'quasar'")
+    ).scalar()
+    assert indexed == 1
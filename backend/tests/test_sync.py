@@ -0,0 +1,55 @@
+from app.services import CategoryService, FeatureService
+
+
+def sync(client, headers, since=None):
+    response = client.get('/api/sync', query_string={'since': since} if since else None, headers=headers)
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def test_sync_without_cursor_is_a_full_reset(client, auth_headers):
+    category = CategoryService.create_category('Roadmap')
+    feature = FeatureService.create_feature(category.id, 'Search')
+
+    changes = sync(client, auth_headers)
+
+    assert changes['reset'] is True
+    assert [c['id'] for c in changes['categories']] == [category.id]
+    assert [(f['id'], f['categoryId']) for f in changes['features']] == [(feature.id, category.id)]
+
+
+def test_deleted_feature_is_sent_as_a_tombstone_in_the_delta(client, auth_headers):
+    category = CategoryService.create_category('Roadmap')
+    kept_id = FeatureService.create_feature(category.id, 'Kept').id
+    deleted_id = FeatureService.create_feature(category.id, 'Deleted').id
+    cursor = sync(client, auth_headers)['cursor']
+
+    assert client.delete(f'/api/features/{deleted_id}', headers=auth_headers).status_code == 200
+    changes = sync(client, auth_headers, cursor)
+
+    assert changes['reset'] is False
+    assert changes['deleted'] == {'categories': [], 'features': [deleted_id]}
+    assert deleted_id not in [f['id'] for f in changes['features']]
+    # Rows written within SYNC_SETTLE of the cursor are sent again
+    assert kept_id in [f['id'] for f in changes['features']]
+
+
+def test_deleted_category_tombstones_its_features(client, auth_headers):
+    category_id = CategoryService.create_category('Doomed').id
+    feature_ids = [FeatureService.create_feature(category_id, f'Feature {i}').id for i in range(2)]
+    other_id = CategoryService.create_category('Other').id
+    cursor = sync(client, auth_headers)['cursor']
+
+    assert client.delete(f'/api/categories/{category_id}', headers=auth_headers).status_code == 200
+    changes = sync(client, auth_headers, cursor)
+
+    assert changes['reset'] is False
+    assert changes['deleted']['categories'] == [category_id]
+    assert sorted(changes['deleted']['features']) == sorted(feature_ids)
+    assert [c['id'] for c in changes['categories']] == [other_id]
+
+
+def test_sync_rejects_malformed_cursor(client, auth_headers):
+    response = client.get('/api/sync', query_string={'since': 'not a cursor'}, headers=auth_headers)
+    assert response.status_code == 400
+    assert response.get_json() == {'error': 'Invalid cursor'}
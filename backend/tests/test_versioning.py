@@ -0,0 +1,65 @@
+import pytest
+
+from app.services import CategoryService, FeatureService
+
+
+@pytest.fixture
+def feature():
+    category = CategoryService.create_category('Versioned')
+    return FeatureService.create_feature(category.id, 'Original')
+
+
+@pytest.fixture
+def urls(feature):
+    return {'feature': f'/api/features/{feature.id}', 'category': f'/api/categories/{feature.category_id}'}
+
+
+@pytest.fixture
+def read(client, auth_headers, feature):
+    """Read the feature or its category the way the client does, through the category"""
+    def read(kind):
+        category = client.get(f'/api/categories/{feature.category_id}', headers=auth_headers).get_json()
+        return category if kind == 'category' else category['features'][0]
+    return read
+
+
+@pytest.mark.parametrize('kind, field', [('feature', 'title'), ('category', 'name')])
+def test_patch_with_current_version_updates_and_bumps_it(client, auth_headers, urls, read, kind, field):
+    current = read(kind)
+
+    response = client.patch(urls[kind], json={field: 'Edited', 'version': current['version']}, headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.get_json()[field] == 'Edited'
+    assert response.get_json()['version'] == current['version'] + 1
+
+
+@pytest.mark.parametrize('kind, field', [('feature', 'title'), ('category', 'name')])
+def test_patch_with_stale_version_conflicts(client, auth_headers, urls, read, kind, field):
+    stale = read(kind)['version']
+    client.patch(urls[kind], json={field: 'First', 'version': stale}, headers=auth_headers)
+
+    response = client.patch(urls[kind], json={field: 'Second', 'version': stale}, headers=auth_headers)
+
+    assert response.status_code == 409
+    body = response.get_json()
+    assert body['current'][field] == 'First'
+    assert body['current']['version'] == stale + 1
+    assert read(kind)[field] == 'First'
+
+
+@pytest.mark.parametrize('kind, field', [('feature', 'title'), ('category', 'name')])
+def test_patch_without_version_is_refused(client, auth_headers, urls, read, kind, field):
+    response = client.patch(urls[kind], json={field: 'Blind'}, headers=auth_headers)
+
+    assert response.status_code == 428
+    assert 'version is required' in response.get_json()['error']
+    assert read(kind)[field] != 'Blind'
+
+
+@pytest.mark.parametrize('version', ['1', 0, True, 1.5])
+def test_patch_with_malformed_version_is_rejected(client, auth_headers, urls, version):
+    response = client.patch(urls['feature'], json={'title': 'Bad', 'version': version}, headers=auth_headers)
+
+    assert response.status_code == 400
+    assert response.get_json() == {'error': 'version must be a positive integer'}
@@ -14,13 +14,22 @@ export interface Feature {
   engineeringSignoff: boolean;
   engineeringComplexity: TShirtSize;
   releaseDate: string; // YYYY-MM format
+  version?: number; // bumped by every update; sent back with edits
 }
 export interface Category {
   id: string;
   name: string;
   description: string;
+  version?: number;
   features: Feature[];
 }
+export interface ChangeEvent {
+  entity: 'category' | 'feature';
+  id: string;
+  op: string;
+  version: number;
+  categoryId?: string;
+}
 interface DataContextType {
   categories: Category[];
   selectedCategoryId: string | null;
@@ -35,6 +44,12 @@ interface DataContextType {
   refreshCategories: () => Promise<void>;
 }
 const DataContext = createContext<DataContextType | undefined>(undefined);
+// How often to refetch the tree when the server refuses the change feed
+const POLL_INTERVAL_MS = 30000;
+// Change events arriving within this window refetch each named category once
+const REFRESH_DELAY_MS = 250;
+// First delay before reopening a refused change feed; doubles up to POLL_INTERVAL_MS
+const RECONNECT_DELAY_MS = 1000;
 export const useData = () => {
   const context = useContext(DataContext);
   if (context === undefined) {
@@ -63,6 +78,24 @@ export const DataProvider: React.FC<{
     }
   };
 
+  // Refetch a single category instead of the whole tree
+  const refreshCategory = async (id: string) => {
+    try {
+      const category: Category = await apiClient.getCategory(id);
+      setCategories(current =>
+        current.some(c => c.id === id)
+          ? current.map(c => (c.id === id ? category : c))
+          : [...current, category]
+      );
+    } catch (error) {
+      if ((error as { response?: { status?: number } }).response?.status === 404) {
+        setCategories(current => current.filter(c => c.id !== id));
+      } else {
+        console.error('Failed to fetch category:', error);
+      }
+    }
+  };
+
   useEffect(() => {
     // Only fetch categories if user is authenticated
     const token = localStorage.getItem('access_token');
@@ -73,10 +106,123 @@ export const DataProvider: React.FC<{
     }
   }, []);
 
+  useEffect(() => {
+    if (!localStorage.getItem('access_token')) {
+      return;
+    }
+
+    // Coalesce bursts of events (batches, other tabs' edits) into one fetch per category
+    const pending = new Set<string>();
+    let flush: ReturnType<typeof setTimeout> | undefined;
+    const scheduleRefresh = (id: string) => {
+      pending.add(id);
+      if (flush === undefined) {
+        flush = setTimeout(() => {
+          flush = undefined;
+          const ids = [...pending];
+          pending.clear();
+          ids.forEach(refreshCategory);
+        }, REFRESH_DELAY_MS);
+      }
+    };
+
+    // Keep the tree current by polling while the change feed is unavailable
+    let poll: ReturnType<typeof setInterval> | undefined;
+    const startPolling = () => {
+      if (poll === undefined) {
+        poll = setInterval(() => {
+          apiClient.getCategories()
+            .then(setCategories)
+            .catch(error => console.error('Failed to fetch categories:', error));
+        }, POLL_INTERVAL_MS);
+      }
+    };
+    const stopPolling = () => {
+      clearInterval(poll);
+      poll = undefined;
+    };
+
+    let events: EventSource | undefined;
+    let lastEventId: string | undefined;
+    let failures = 0;
+    let reconnect: ReturnType<typeof setTimeout> | undefined;
+    let closed = false;
+
+    const retry = () => {
+      failures += 1;
+      if (failures > 1) {
+        startPolling();
+      }
+      reconnect = setTimeout(connect, Math.min(RECONNECT_DELAY_MS * 2 ** failures, POLL_INTERVAL_MS));
+    };
+
+    // Apply changes made by anyone (including this tab) as they are committed
+    const connect = async () => {
+      let url: string;
+      try {
+        // Each connection needs a fresh ticket; they expire within seconds
+        url = await apiClient.eventsUrl(lastEventId);
+      } catch (error) {
+        console.error('Failed to open change feed:', error);
+        retry();
+        return;
+      }
+      if (closed) {
+        return;
+      }
+
+      const source = new EventSource(url);
+      events = source;
+      source.onopen = () => {
+        failures = 0;
+        stopPolling();
+      };
+      source.addEventListener('ready', (message) => {
+        lastEventId = (message as MessageEvent).lastEventId;
+      });
+      source.addEventListener('change', (message) => {
+        lastEventId = (message as MessageEvent).lastEventId;
+        const event: ChangeEvent = JSON.parse((message as MessageEvent).data);
+        if (event.entity === 'category' && event.op === 'delete') {
+          pending.delete(event.id);
+          setCategories(current => current.filter(c => c.id !== event.id));
+        } else {
+          scheduleRefresh(event.categoryId ?? event.id);
+        }
+      });
+      // Sent after missed or dropped events; the local copy may be stale
+      source.addEventListener('resync', (message) => {
+        lastEventId = (message as MessageEvent).lastEventId;
+        pending.clear();
+        refreshCategories();
+      });
+      // EventSource retries dropped connections itself with the same URL, but gives up
+      // for good on an error status: an expired ticket, or 503 from a server without
+      // event streams. Reconnect with a new ticket, polling meanwhile if it keeps failing
+      source.onerror = () => {
+        if (source.readyState === EventSource.CLOSED && !closed) {
+          retry();
+        }
+      };
+    };
+    connect();
+
+    return () => {
+      closed = true;
+      events?.close();
+      clearTimeout(reconnect);
+      clearTimeout(flush);
+      stopPolling();
+    };
+  }, []);
+
   const addCategory = async (category: Omit<Category, 'id' | 'features'>) => {
     try {
       const newCategory = await apiClient.createCategory(category.name, category.description);
-      setCategories([...categories, newCategory]);
+      // The change feed may have delivered it already
+      setCategories(current =>
+        current.some(c => c.id === newCategory.id) ? current : [...current, newCategory]
+      );
     } catch (error) {
       console.error('Failed to create category:', error);
       throw error;
@@ -85,9 +231,16 @@ export const DataProvider: React.FC<{
 
   const updateCategory = async (id: string, data: Partial<Omit<Category, 'id' | 'features'>>) => {
     try {
-      await apiClient.updateCategory(id, data);
-      await refreshCategories();
+      // PATCH requires the version the edit is based on; read it if this copy lacks one
+      const version = categories.find(c => c.id === id)?.version
+        ?? (await apiClient.getCategory(id)).version;
+      await apiClient.updateCategory(id, data, version);
+      await refreshCategory(id);
     } catch (error) {
+      // Edited by someone else first: show their version rather than overwrite it
+      if ((error as { response?: { status?: number } }).response?.status === 409) {
+        await refreshCategory(id);
+      }
       console.error('Failed to update category:', error);
       throw error;
     }
@@ -96,7 +249,7 @@ export const DataProvider: React.FC<{
   const deleteCategory = async (id: string) => {
     try {
       await apiClient.deleteCategory(id);
-      setCategories(categories.filter(c => c.id !== id));
+      setCategories(current => current.filter(c => c.id !== id));
       if (selectedCategoryId === id) {
         setSelectedCategoryId(categories.length > 1 ? categories[0].id : null);
       }
@@ -113,7 +266,7 @@ export const DataProvider: React.FC<{
   const addFeature = async (categoryId: string, feature: Omit<Feature, 'id'>) => {
     try {
       await apiClient.createFeature(categoryId, feature);
-      await refreshCategories();
+      await refreshCategory(categoryId);
     } catch (error) {
       console.error('Failed to create feature:', error);
       throw error;
@@ -122,9 +275,16 @@ export const DataProvider: React.FC<{
 
   const updateFeature = async (categoryId: string, featureId: string, data: Partial<Omit<Feature, 'id'>>) => {
     try {
-      await apiClient.updateFeature(featureId, data);
-      await refreshCategories();
+      const findVersion = (category?: Category) =>
+        category?.features.find(f => f.id === featureId)?.version;
+      const version = findVersion(categories.find(c => c.id === categoryId))
+        ?? findVersion(await apiClient.getCategory(categoryId));
+      await apiClient.updateFeature(featureId, data, version);
+      await refreshCategory(categoryId);
     } catch (error) {
+      if ((error as { response?: { status?: number } }).response?.status === 409) {
+        await refreshCategory(categoryId);
+      }
       console.error('Failed to update feature:', error);
       throw error;
     }
@@ -133,7 +293,7 @@ export const DataProvider: React.FC<{
   const deleteFeature = async (categoryId: string, featureId: string) => {
     try {
       await apiClient.deleteFeature(featureId);
-      await refreshCategories();
+      await refreshCategory(categoryId);
     } catch (error) {
       console.error('Failed to delete feature:', error);
       throw error;
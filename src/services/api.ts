@@ -58,13 +58,30 @@ class ApiClient {
     return response.data;
   }
 
+  async getCategory(id: string) {
+    const response = await this.client.get(`/categories/${id}`);
+    return response.data;
+  }
+
+  // Server-Sent Events change feed. EventSource cannot send headers, so the URL carries
+  // a short-lived ticket that only opens the stream, never the access token itself
+  async eventsUrl(lastEventId?: string) {
+    const response = await this.client.post('/events/ticket');
+    const params = new URLSearchParams({ ticket: response.data.ticket });
+    if (lastEventId) {
+      params.set('lastEventId', lastEventId);
+    }
+    return `${API_BASE_URL}/events?${params}`;
+  }
+
   async createCategory(name: string, description: string) {
     const response = await this.client.post('/categories', { name, description });
     return response.data;
   }
 
-  async updateCategory(id: string, data: { name?: string; description?: string }) {
-    const response = await this.client.put(`/categories/${id}`, data);
+  async updateCategory(id: string, data: { name?: string; description?: string }, version?: number) {
+    // Rejected with 409 if the category changed since `version` was read, 428 without one
+    const response = await this.client.patch(`/categories/${id}`, { ...data, version });
     return response.data;
   }
 
@@ -79,8 +96,9 @@ class ApiClient {
     return response.data;
   }
 
-  async updateFeature(featureId: string, data: any) {
-    const response = await this.client.put(`/features/${featureId}`, data);
+  async updateFeature(featureId: string, data: any, version?: number) {
+    // Rejected with 409 if the feature changed since `version` was read, 428 without one
+    const response = await this.client.patch(`/features/${featureId}`, { ...data, version });
     return response.data;
   }
 